@@ -2,6 +2,12 @@
 
 export PATH="/root/.local/bin:$PATH"
 
+# The job worker runs from the same image: `entrypoint.sh job_worker`
+if [ "$1" = "job_worker" ]; then
+  echo "Running job worker..."
+  exec python -m app.job_worker
+fi
+
 # Check the value of ENV variable
 if [ "$ENV" = "development" ]; then
   echo "Running in development mode with hot-reloading..."
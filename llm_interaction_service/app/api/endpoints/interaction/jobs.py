@@ -0,0 +1,97 @@
+import logging
+from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends
+from fastapi.responses import JSONResponse
+from app.core.constants import AIService
+from app.core.constants import OCRService
+from app.core.constants import ProcessingType
+from app.core.executors import run_io
+from app.core.job_queue import job_queue, SUCCEEDED, FAILED
+from app.core.middleware import authorize_client
+from app.core.upload_spool import spool_upload
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+def job_status(job: dict) -> dict:
+    """Public view of a job, without its parameters and result."""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "stage": job["stage"],
+        "progress": job["progress"],
+        "attempts": job["attempts"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "updated_at": job["updated_at"],
+    }
+
+async def get_job_or_404(job_id: str) -> dict:
+    job = await run_io(job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+@router.post("/jobs", status_code=202)
+async def submit_job(
+        _: bool = Depends(authorize_client),
+        model: str = Form(...),
+        file: UploadFile = File(...),
+        processing_type: str = Form(...),
+        prompt: str = Form(None),
+        ai_service: str = Form(AIService.GROQ_CLOUD),
+        ocr_technology: str = Form(OCRService.TESSERACT)
+):
+    """
+    Queue a file for processing and return its job id right away.
+
+    Takes the same form fields as /process-file. Poll /jobs/{job_id} for the
+    status and fetch /jobs/{job_id}/result once it succeeded.
+    """
+    if ai_service not in ["ollama_local", "groq_cloud"]:
+        raise HTTPException(status_code=400, detail="Invalid AI service. Use 'ollama_local' or 'groq_cloud'.")
+    if processing_type not in [ProcessingType.PARSE, ProcessingType.PROMPT]:
+        raise HTTPException(status_code=400, detail="Invalid processing type. Use 'parse' or 'prompt'.")
+    if processing_type == ProcessingType.PROMPT and not prompt:
+        raise HTTPException(status_code=400, detail="Prompt is required for 'prompt' type.")
+
+    upload = await spool_upload(file)
+    if not upload.size:
+        await run_io(upload.close)
+        raise HTTPException(status_code=400, detail="Empty file.")
+
+    params = {
+        "model": model,
+        "processing_type": processing_type,
+        "prompt": prompt,
+        "ai_service": ai_service,
+        "ocr_technology": ocr_technology,
+    }
+    try:
+        job_id = await run_io(job_queue.submit, params, upload)
+    except Exception as e:
+        await run_io(upload.close)
+        logger.error(f"Failed to queue job: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Error queueing job: {str(e)}")
+
+    return JSONResponse(status_code=202, content={"job_id": job_id, "status": "queued"})
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, _: bool = Depends(authorize_client)):
+    """Return the status and stage progress of a job."""
+    return job_status(await get_job_or_404(job_id))
+
+@router.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str, _: bool = Depends(authorize_client)):
+    """
+    Return the result of a succeeded job.
+
+    Responds 409 while the job is still queued or running, and with the
+    job's error once it failed for good.
+    """
+    job = await get_job_or_404(job_id)
+
+    if job["status"] == SUCCEEDED:
+        return JSONResponse(content=job["result"])
+    if job["status"] == FAILED:
+        raise HTTPException(status_code=500, detail=job["error"])
+    raise HTTPException(status_code=409, detail=f"Job is {job['status']}.")
@@ -1,9 +1,14 @@
 import os
+import asyncio
 import logging
 import json
+import zipfile
+from typing import List, Tuple
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Depends, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from app.core.config import config
+from app.core.executors import run_io
+from app.core.upload_spool import SpooledUpload, spool_stream, spool_upload
 from app.services.parse_file_service import ParseFileService
 from app.core.constants import ProcessingType
 from app.core.constants import AIService
@@ -59,3 +64,179 @@ async def process_invoice(
     except Exception as e:
         logger.error(f"File processing error: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Error processing file: {str(e)}")
+
+def format_sse(event: dict) -> str:
+    """Serialize a processing event as a server-sent event."""
+    return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+
+@router.post("/process-file/stream")
+async def process_invoice_stream(
+        _: bool = Depends(authorize_client),
+        model: str = Form(...),
+        file: UploadFile = File(...),
+        processing_type: str = Form(...),
+        prompt: str = Form(None),
+        ai_service: str = Form(AIService.GROQ_CLOUD),
+        ocr_technology: str = Form(OCRService.TESSERACT),
+        parse_file_service: ParseFileService = Depends(get_llm_interaction_service)
+):
+    """
+    Process invoice PDF like /process-file, streaming the progress as server-sent events.
+
+    Events:
+        - "stage": a pipeline stage finished ("started", "page_ocr", "text_extracted", "retrieval_done", ...)
+        - "token": a piece of the LLM completion
+        - "result": the parsed JSON result, sent last
+        - "error": processing failed, with "status_code" and "detail"
+    """
+    if ai_service not in ["ollama_local", "groq_cloud"]:
+        raise HTTPException(status_code=400, detail="Invalid AI service. Use 'ollama_local' or 'groq_cloud'.")
+
+    # The upload is closed once the endpoint returns, before the response is streamed
+    upload = await spool_upload(file)
+
+    async def event_stream():
+        try:
+            async for event in parse_file_service.process_stream(
+                model=model,
+                pdf=upload,
+                processing_type=processing_type,
+                prompt=prompt,
+                ai_service=ai_service,
+                ocr_technology=ocr_technology
+            ):
+                yield format_sse(event)
+        finally:
+            await run_io(upload.close)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+def expand_batch_files(uploads: List[Tuple[str, SpooledUpload]]) -> List[Tuple[str, SpooledUpload]]:
+    """
+    Replace uploaded zip archives by the PDF files they contain, each spooled to its own temp file.
+
+    Archives are closed once extracted; on error, every spooled file is.
+
+    Args:
+        uploads (List[Tuple[str, SpooledUpload]]): Uploaded (filename, spooled file) pairs
+
+    Returns:
+        List[Tuple[str, SpooledUpload]]: (filename, spooled file) of every file to process
+    """
+    files = []
+    try:
+        for filename, upload in uploads:
+            if not zipfile.is_zipfile(upload.path):
+                files.append((filename, upload))
+                continue
+
+            with upload, zipfile.ZipFile(upload.path) as archive:
+                entries = [
+                    info for info in archive.infolist()
+                    if not info.is_dir()
+                    and info.filename.lower().endswith(".pdf")
+                    and not info.filename.startswith("__MACOSX/")
+                ]
+                if sum(info.file_size for info in entries) > config.batch_max_archive_bytes:
+                    raise HTTPException(status_code=413, detail=f"Archive {filename} is too large once extracted.")
+                for info in entries:
+                    entry_name = f"{filename}/{info.filename}"
+                    with archive.open(info) as entry:
+                        files.append((entry_name, spool_stream(entry, name=entry_name)))
+    except BaseException:
+        for _, upload in uploads + files:
+            upload.close()
+        raise
+
+    return files
+
+@router.post("/process-files/batch")
+async def process_invoice_batch(
+        _: bool = Depends(authorize_client),
+        model: str = Form(...),
+        files: List[UploadFile] = File(...),
+        processing_type: str = Form(...),
+        prompt: str = Form(None),
+        ai_service: str = Form(AIService.GROQ_CLOUD),
+        ocr_technology: str = Form(OCRService.TESSERACT)
+):
+    """
+    Process many invoice PDFs, or zip archives of them, with shared settings.
+
+    Files are processed concurrently (at most BATCH_CONCURRENCY at a time) and
+    their results are streamed as NDJSON in completion order, one line per file:
+    {"index", "filename", "status": "succeeded", "result"} or
+    {"index", "filename", "status": "failed", "status_code", "detail"}.
+    A last {"done": true, "succeeded", "failed"} line closes the batch.
+    """
+    if ai_service not in ["ollama_local", "groq_cloud"]:
+        raise HTTPException(status_code=400, detail="Invalid AI service. Use 'ollama_local' or 'groq_cloud'.")
+
+    # The uploads are closed once the endpoint returns, before the response is streamed
+    uploads = []
+    try:
+        for upload in files:
+            uploads.append((upload.filename, await spool_upload(upload)))
+    except BaseException:
+        for _, spooled in uploads:
+            await run_io(spooled.close)
+        raise
+    batch_files = await run_io(expand_batch_files, uploads)
+
+    def close_batch_files():
+        for _, spooled in batch_files:
+            spooled.close()
+
+    if not batch_files or len(batch_files) > config.batch_max_files:
+        await run_io(close_batch_files)
+        if not batch_files:
+            raise HTTPException(status_code=400, detail="No files to process.")
+        raise HTTPException(status_code=413, detail=f"Too many files, the limit is {config.batch_max_files}.")
+
+    semaphore = asyncio.Semaphore(max(config.batch_concurrency, 1))
+
+    async def process_one(index: int, filename: str, pdf: SpooledUpload) -> dict:
+        async with semaphore:
+            try:
+                result = await get_llm_interaction_service().process_pdf(
+                    model=model,
+                    pdf=pdf,
+                    processing_type=processing_type,
+                    prompt=prompt,
+                    ai_service=ai_service,
+                    ocr_technology=ocr_technology
+                )
+                return {"index": index, "filename": filename, "status": "succeeded", "result": result}
+            except HTTPException as e:
+                return {"index": index, "filename": filename, "status": "failed", "status_code": e.status_code, "detail": e.detail}
+            except Exception as e:
+                logger.error(f"File processing error for {filename}: {str(e)}")
+                return {
+                    "index": index,
+                    "filename": filename,
+                    "status": "failed",
+                    "status_code": 500,
+                    "detail": f"Error processing file: {str(e)}"
+                }
+
+    async def result_stream():
+        tasks = [asyncio.create_task(process_one(i, name, pdf)) for i, (name, pdf) in enumerate(batch_files)]
+        counts = {"succeeded": 0, "failed": 0}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                line = await next_done
+                counts[line["status"]] += 1
+                yield json.dumps(line) + "\n"
+            yield json.dumps({"done": True, **counts}) + "\n"
+        finally:
+            # The client may disconnect mid-batch; don't leave the pipeline running
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await run_io(close_batch_files)
+
+    return StreamingResponse(result_stream(), media_type="application/x-ndjson")
@@ -4,23 +4,46 @@ from app.core.middleware import setup_cors
 import logging
 from app.api.endpoints import hello
 from app.api.endpoints.interaction import process_file
-from app.factories.ocr_service_factory import OCRServiceFactory
+from app.api.endpoints.interaction import jobs
+from app.factories.ocr_service_registry import ocr_service_registry
+from app.core.executors import shutdown_executors
+from app.core.http_clients import close_http_clients
+from app.core.config import config
 from app.core.constants import OCRService
+from app.core.job_queue import job_queue
+from app.core.job_workers import JobWorkerPool
 
 
 def create_api():
     api = FastAPI()
+    job_workers = JobWorkerPool(
+        job_queue,
+        concurrency=config.job_worker_concurrency,
+        retention_seconds=config.job_retention_seconds
+    )
 
     @api.on_event("startup")
     async def startup_event():
-        # Initialize PaddleOCR service to download the model
+        # Load PaddleOCR into the worker's registry so requests reuse the models
         try:
             logging.info("Initializing PaddleOCR service...")
-            OCRServiceFactory.create_ocr_service(OCRService.PADDLE)
+            ocr_service_registry.warm_up(OCRService.PADDLE)
             logging.info("PaddleOCR service initialized successfully.")
         except Exception as e:
             logging.error(f"Failed to initialize PaddleOCR service: {e}")
 
+        # Jobs normally run in the standalone `python -m app.job_worker` process;
+        # JOB_WORKERS_IN_API runs them in every API worker instead
+        if config.job_workers_in_api:
+            job_workers.start()
+
+    @api.on_event("shutdown")
+    async def shutdown_event():
+        await job_workers.stop()
+        await close_http_clients()
+        shutdown_executors()
+        ocr_service_registry.close()
+
     # Apply middleware
     setup_cors(api)
 
@@ -32,5 +55,6 @@ def create_api():
     # llm interaction endpoints
     llmInteractionPrefix = '/llm-interaction-api/v1'
     api.include_router(process_file.router, prefix=llmInteractionPrefix, tags=['LLmInteractionApi', 'LlmProcessFile'])
+    api.include_router(jobs.router, prefix=llmInteractionPrefix, tags=['LLmInteractionApi', 'LlmJobs'])
 
     return api
@@ -10,6 +10,94 @@ class Config(BaseSettings):
     ollama_base_url: str = Field(..., alias='OLLAMA_BASE_URL')
     groq_api_key: str = Field(..., alias='GROQ_API_KEY')
 
+    io_thread_pool_size: int = Field(16, alias='IO_THREAD_POOL_SIZE')
+    native_thread_pool_size: int = Field(4, alias='NATIVE_THREAD_POOL_SIZE')
+    cpu_process_pool_size: int = Field(2, alias='CPU_PROCESS_POOL_SIZE')
+
+    ocr_parallel_pages: bool = Field(False, alias='OCR_PARALLEL_PAGES')
+    page_pipeline_queue_size: int = Field(2, alias='PAGE_PIPELINE_QUEUE_SIZE')
+
+    pdf_page_min_text_chars: int = Field(50, alias='PDF_PAGE_MIN_TEXT_CHARS')
+    pdf_page_min_image_coverage: float = Field(0.25, alias='PDF_PAGE_MIN_IMAGE_COVERAGE')
+    page_skip_blank: bool = Field(True, alias='PAGE_SKIP_BLANK')
+    page_blank_max_ink_ratio: float = Field(0.0001, alias='PAGE_BLANK_MAX_INK_RATIO')
+    page_blank_min_mark_area: int = Field(6, alias='PAGE_BLANK_MIN_MARK_AREA')
+    page_crop_margins: bool = Field(True, alias='PAGE_CROP_MARGINS')
+    page_crop_padding_pt: float = Field(12, alias='PAGE_CROP_PADDING_PT')
+
+    pdf_render_dpi_mode: str = Field('fixed', alias='PDF_RENDER_DPI_MODE')
+    pdf_render_dpi: int = Field(300, alias='PDF_RENDER_DPI')
+    pdf_min_render_dpi: int = Field(150, alias='PDF_MIN_RENDER_DPI')
+    pdf_max_render_dpi: int = Field(400, alias='PDF_MAX_RENDER_DPI')
+    pdf_target_glyph_height_px: int = Field(28, alias='PDF_TARGET_GLYPH_HEIGHT_PX')
+    tesseract_batch_pages: int = Field(16, alias='TESSERACT_BATCH_PAGES')
+    tesseract_preprocessing_profile: str = Field('binarize', alias='TESSERACT_PREPROCESSING_PROFILE')
+    paddle_preprocessing_profile: str = Field('binarize', alias='PADDLE_PREPROCESSING_PROFILE')
+    paddle_batch_pages: int = Field(8, alias='PADDLE_BATCH_PAGES')
+    paddle_rec_batch_num: int = Field(32, alias='PADDLE_REC_BATCH_NUM')
+    paddle_cls_batch_num: int = Field(32, alias='PADDLE_CLS_BATCH_NUM')
+    paddle_page_orientation: bool = Field(True, alias='PADDLE_PAGE_ORIENTATION')
+    paddle_orientation_min_confidence: float = Field(0.5, alias='PADDLE_ORIENTATION_MIN_CONFIDENCE')
+    paddle_onnx_model_dir: str = Field('paddle_onnx_models', alias='PADDLE_ONNX_MODEL_DIR')
+    onnx_intra_op_threads: int = Field(0, alias='ONNX_INTRA_OP_THREADS')
+    onnx_inter_op_threads: int = Field(0, alias='ONNX_INTER_OP_THREADS')
+    onnx_execution_providers: List[str] = Field(['CPUExecutionProvider'], alias='ONNX_EXECUTION_PROVIDERS')
+    ocr_cascade_min_confidence: float = Field(0.8, alias='OCR_CASCADE_MIN_CONFIDENCE')
+    ocr_cascade_max_unsure_ratio: float = Field(0.5, alias='OCR_CASCADE_MAX_UNSURE_RATIO')
+    ocr_cascade_region_padding_px: int = Field(6, alias='OCR_CASCADE_REGION_PADDING_PX')
+
+    extraction_cache_enabled: bool = Field(True, alias='EXTRACTION_CACHE_ENABLED')
+    extraction_cache_memory_entries: int = Field(256, alias='EXTRACTION_CACHE_MEMORY_ENTRIES')
+    extraction_cache_dir: str = Field('', alias='EXTRACTION_CACHE_DIR')
+    extraction_cache_disk_max_bytes: int = Field(1 << 30, alias='EXTRACTION_CACHE_DISK_MAX_BYTES')
+
+    llm_timeout_seconds: float = Field(120, alias='LLM_TIMEOUT_SECONDS')
+    http_connect_timeout_seconds: float = Field(10, alias='HTTP_CONNECT_TIMEOUT_SECONDS')
+    http_max_connections: int = Field(100, alias='HTTP_MAX_CONNECTIONS')
+    http_max_keepalive_connections: int = Field(20, alias='HTTP_MAX_KEEPALIVE_CONNECTIONS')
+    http_keepalive_expiry_seconds: float = Field(30, alias='HTTP_KEEPALIVE_EXPIRY_SECONDS')
+
+    map_reduce_enabled: bool = Field(True, alias='MAP_REDUCE_ENABLED')
+    llm_context_max_tokens: int = Field(6000, alias='LLM_CONTEXT_MAX_TOKENS')
+    map_reduce_chunk_tokens: int = Field(3000, alias='MAP_REDUCE_CHUNK_TOKENS')
+    map_reduce_concurrency: int = Field(4, alias='MAP_REDUCE_CONCURRENCY')
+
+    llm_cache_enabled: bool = Field(True, alias='LLM_CACHE_ENABLED')
+    llm_cache_backend: str = Field('memory', alias='LLM_CACHE_BACKEND')
+    llm_cache_ttl_seconds: int = Field(7 * 24 * 3600, alias='LLM_CACHE_TTL_SECONDS')
+    llm_cache_max_entries: int = Field(1024, alias='LLM_CACHE_MAX_ENTRIES')
+    llm_cache_sqlite_path: str = Field('llm_completion_cache.sqlite3', alias='LLM_CACHE_SQLITE_PATH')
+
+    embedding_model_name: str = Field('all-MiniLM-L6-v2', alias='EMBEDDING_MODEL_NAME')
+    embedding_cache_max_entries: int = Field(50000, alias='EMBEDDING_CACHE_MAX_ENTRIES')
+    embedding_cache_sqlite_path: str = Field('', alias='EMBEDDING_CACHE_SQLITE_PATH')
+    embedding_cache_sqlite_max_entries: int = Field(200000, alias='EMBEDDING_CACHE_SQLITE_MAX_ENTRIES')
+    embedding_cache_sqlite_ttl_seconds: int = Field(30 * 24 * 3600, alias='EMBEDDING_CACHE_SQLITE_TTL_SECONDS')
+
+    document_index_dir: str = Field('document_indexes', alias='DOCUMENT_INDEX_DIR')
+    document_index_ttl_seconds: int = Field(7 * 24 * 3600, alias='DOCUMENT_INDEX_TTL_SECONDS')
+    document_index_max_collections: int = Field(200, alias='DOCUMENT_INDEX_MAX_COLLECTIONS')
+    document_index_gc_interval_seconds: int = Field(600, alias='DOCUMENT_INDEX_GC_INTERVAL_SECONDS')
+    document_index_chroma_host: str = Field('', alias='DOCUMENT_INDEX_CHROMA_HOST')
+    document_index_chroma_port: int = Field(8000, alias='DOCUMENT_INDEX_CHROMA_PORT')
+
+    retriever_backend: str = Field('auto', alias='RETRIEVER_BACKEND')
+    numpy_retriever_max_chunks: int = Field(100, alias='NUMPY_RETRIEVER_MAX_CHUNKS')
+
+    batch_concurrency: int = Field(4, alias='BATCH_CONCURRENCY')
+    batch_max_files: int = Field(500, alias='BATCH_MAX_FILES')
+    batch_max_archive_bytes: int = Field(1 << 30, alias='BATCH_MAX_ARCHIVE_BYTES')
+
+    job_queue_dir: str = Field('jobs', alias='JOB_QUEUE_DIR')
+    job_max_attempts: int = Field(3, alias='JOB_MAX_ATTEMPTS')
+    job_lease_seconds: int = Field(900, alias='JOB_LEASE_SECONDS')
+    job_worker_concurrency: int = Field(2, alias='JOB_WORKER_CONCURRENCY')
+    job_retention_seconds: int = Field(7 * 24 * 3600, alias='JOB_RETENTION_SECONDS')
+    job_workers_in_api: bool = Field(False, alias='JOB_WORKERS_IN_API')
+
+    upload_max_bytes: int = Field(256 * 1024 * 1024, alias='UPLOAD_MAX_BYTES')
+    upload_spool_dir: str = Field('', alias='UPLOAD_SPOOL_DIR')
+
     client_ids: List[int] = Field(..., alias='CLIENT_IDS')
     api_access_tokens: List[str] = Field(..., alias='API_ACCESS_TOKENS')
 
@@ -14,11 +14,29 @@ class OCRService(str, Enum):
     """Enum for OCR service providers"""
     TESSERACT = "tesseract"
     PADDLE = "paddle"
+    CASCADE = "cascade"
+    PADDLE_ONNX = "paddle_onnx"
 
 class PDFToImageService(str, Enum):
     """Enum for PDF to image conversion services"""
     PYMUPDF_OPENCV_PILLOW = "pymupdf_opencv_pillow"
 
+class CompletionCacheBackend(str, Enum):
+    """Enum for LLM completion cache backends"""
+    MEMORY = "memory"
+    SQLITE = "sqlite"
+
+class RetrieverBackend(str, Enum):
+    """Enum for RAG retriever backends"""
+    AUTO = "auto"
+    NUMPY = "numpy"
+    CHROMA = "chroma"
+
+class RenderDpiMode(str, Enum):
+    """Enum for how PDF pages pick their render resolution"""
+    FIXED = "fixed"
+    ADAPTIVE = "adaptive"
+
 class ModelName(str, Enum):
     """Enum for supported model names"""
     # Ollama models
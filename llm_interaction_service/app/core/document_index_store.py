@@ -0,0 +1,206 @@
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import List, Optional
+
+import chromadb
+from langchain_chroma import Chroma
+from langchain_core.embeddings import Embeddings
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class DocumentIndexStore:
+    """
+    Persistent Chroma indexes of document chunks, one collection per document.
+
+    Collections are keyed by the document text, the chunking settings and
+    the embedding model, so follow-up prompts on a document reopen its index
+    and only embed the query. Collections unused for longer than the TTL, or
+    beyond the maximum count (least recently used first), are deleted, at
+    most once per GC interval.
+
+    Chroma's embedded client doesn't support several processes writing to
+    one directory, so with a Chroma server host configured every process
+    shares the server's indexes; otherwise each process keeps its own
+    directory under persist_dir, and directories of processes that are gone
+    are removed.
+    """
+
+    COLLECTION_PREFIX = "doc-"
+    PROCESS_DIR_PREFIX = "worker-"
+
+    def __init__(
+            self,
+            persist_dir: str,
+            ttl_seconds: int = 7 * 24 * 3600,
+            max_indexes: int = 200,
+            chunk_size: int = 1000,
+            chunk_overlap: int = 200,
+            host: Optional[str] = None,
+            port: int = 8000,
+            gc_interval_seconds: int = 600
+    ):
+        self.persist_dir = persist_dir
+        self.ttl_seconds = ttl_seconds
+        self.max_indexes = max_indexes
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.host = host
+        self.port = port
+        self.gc_interval_seconds = gc_interval_seconds
+        self._lock = threading.Lock()
+        self._client: Optional[chromadb.ClientAPI] = None
+        self._client_pid: Optional[int] = None
+        self._last_gc = 0.0
+
+    @property
+    def client(self) -> chromadb.ClientAPI:
+        # A forked worker must not reuse its parent's client
+        if self._client is None or self._client_pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._client_pid != os.getpid():
+                    self._client = self._open_client()
+                    self._client_pid = os.getpid()
+        return self._client
+
+    def _open_client(self) -> chromadb.ClientAPI:
+        if self.host:
+            logger.info(f"Connecting to document index server at {self.host}:{self.port}")
+            return chromadb.HttpClient(host=self.host, port=self.port)
+
+        self._remove_stale_process_dirs()
+        path = self.process_dir()
+        logger.info(f"Opening document index store at {path}")
+        return chromadb.PersistentClient(path=path)
+
+    def process_dir(self, pid: Optional[int] = None) -> str:
+        """Return the directory holding the embedded indexes of a process, by default this one."""
+        return os.path.join(self.persist_dir, f"{self.PROCESS_DIR_PREFIX}{pid or os.getpid()}")
+
+    def _remove_stale_process_dirs(self) -> None:
+        """Delete the index directories of processes that no longer run."""
+        if not os.path.isdir(self.persist_dir):
+            return
+
+        for name in os.listdir(self.persist_dir):
+            pid = name[len(self.PROCESS_DIR_PREFIX):]
+            if not name.startswith(self.PROCESS_DIR_PREFIX) or not pid.isdigit() or int(pid) == os.getpid():
+                continue
+            try:
+                os.kill(int(pid), 0)
+                continue
+            except ProcessLookupError:
+                pass
+            except PermissionError:
+                # Alive, but owned by another user
+                continue
+            logger.info(f"Removing document indexes of stopped process {pid}")
+            shutil.rmtree(os.path.join(self.persist_dir, name), ignore_errors=True)
+
+    def split_text(self, text: str) -> List[str]:
+        """Split a document into the chunks that get indexed."""
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=self.chunk_size, chunk_overlap=self.chunk_overlap)
+        return text_splitter.split_text(text)
+
+    def make_collection_name(self, text: str, model_name: str) -> str:
+        """
+        Build the collection name of a document.
+
+        Args:
+            text (str): The extracted document text
+            model_name (str): Name of the embedding model
+
+        Returns:
+            str: Chroma collection name
+        """
+        key = f"{model_name}\0{self.chunk_size}\0{self.chunk_overlap}\0{text}"
+        return self.COLLECTION_PREFIX + hashlib.sha256(key.encode("utf-8")).hexdigest()[:56]
+
+    def get_or_create(self, text: str, embeddings: Embeddings, model_name: str) -> Chroma:
+        """
+        Open the index of a document, building it on first use.
+
+        Blocking; run it on the native thread pool.
+
+        Args:
+            text (str): The extracted document text
+            embeddings (Embeddings): The embedding model
+            model_name (str): Name of the embedding model
+
+        Returns:
+            Chroma: Vector store over the document's chunks
+        """
+        name = self.make_collection_name(text, model_name)
+        now = time.time()
+
+        collection = self.client.get_or_create_collection(name, metadata={"created_at": now, "last_used": now})
+        vectorstore = Chroma(client=self.client, collection_name=name, embedding_function=embeddings)
+
+        if collection.metadata and collection.metadata.get("complete"):
+            logger.info(f"Reusing document index {name}")
+            collection.modify(metadata={**collection.metadata, "last_used": now})
+            return vectorstore
+
+        logger.info(f"Building document index {name}")
+        chunks = self.split_text(text)
+        # Stable ids make a concurrent or interrupted build idempotent
+        vectorstore.add_texts(chunks, ids=[str(i) for i in range(len(chunks))])
+        collection.modify(metadata={"created_at": now, "last_used": now, "complete": True})
+
+        if now - self._last_gc >= self.gc_interval_seconds:
+            self._last_gc = now
+            self.collect_garbage()
+        return vectorstore
+
+    def collect_garbage(self) -> int:
+        """
+        Delete expired and least recently used document indexes.
+
+        Returns:
+            int: Number of indexes deleted
+        """
+        now = time.time()
+        indexes = []
+        for collection in self.client.list_collections():
+            name = collection if isinstance(collection, str) else collection.name
+            if not name.startswith(self.COLLECTION_PREFIX):
+                continue
+            # Chroma versions that list collections by name need a lookup for their metadata
+            if isinstance(collection, str):
+                collection = self.client.get_collection(name)
+            metadata = collection.metadata or {}
+            indexes.append((metadata.get("last_used", 0), name))
+
+        indexes.sort(reverse=True)
+        expired = [
+            name for position, (last_used, name) in enumerate(indexes)
+            if position >= self.max_indexes or now - last_used > self.ttl_seconds
+        ]
+
+        for name in expired:
+            try:
+                self.client.delete_collection(name)
+            except Exception as e:
+                # Another worker may have collected it already
+                logger.warning(f"Failed to delete document index {name}: {str(e)}")
+
+        if expired:
+            logger.info(f"Deleted {len(expired)} document indexes")
+        return len(expired)
+
+
+document_index_store = DocumentIndexStore(
+    persist_dir=config.document_index_dir,
+    ttl_seconds=config.document_index_ttl_seconds,
+    max_indexes=config.document_index_max_collections,
+    host=config.document_index_chroma_host or None,
+    port=config.document_index_chroma_port,
+    gc_interval_seconds=config.document_index_gc_interval_seconds
+)
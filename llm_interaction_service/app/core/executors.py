@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+IO_POOL = "io"
+NATIVE_POOL = "native"
+PDF_POOL = "pdf"
+CPU_POOL = "cpu"
+
+_executors: Dict[str, Executor] = {}
+_executors_lock = threading.Lock()
+
+
+def _create_executor(name: str) -> Executor:
+    if name == IO_POOL:
+        logger.info(f"Starting I/O thread pool with {config.io_thread_pool_size} threads")
+        return ThreadPoolExecutor(max_workers=config.io_thread_pool_size, thread_name_prefix="io")
+    if name == NATIVE_POOL:
+        logger.info(f"Starting native thread pool with {config.native_thread_pool_size} threads")
+        return ThreadPoolExecutor(max_workers=config.native_thread_pool_size, thread_name_prefix="native")
+    if name == PDF_POOL:
+        # MuPDF must not be used from several threads at once, so it gets exactly one
+        logger.info("Starting PDF thread")
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+    if name == CPU_POOL:
+        # "spawn" keeps workers from inheriting the parent's OCR engines and threads
+        logger.info(f"Starting CPU process pool with {config.cpu_process_pool_size} workers")
+        return ProcessPoolExecutor(
+            max_workers=config.cpu_process_pool_size,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    raise ValueError(f"Unsupported executor: {name}")
+
+
+def get_executor(name: str) -> Executor:
+    """
+    Return one of the worker's shared executors, creating it on first use.
+
+    - "io": threads for blocking network/disk calls (LLM clients, ...)
+    - "native": threads for native code that releases the GIL (OpenCV, OCR engines)
+    - "pdf": the single thread every PyMuPDF call runs on
+    - "cpu": processes for CPU-bound Python work
+
+    Args:
+        name (str): Name of the executor
+
+    Returns:
+        Executor: The shared executor
+    """
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                executor = _create_executor(name)
+                _executors[name] = executor
+    return executor
+
+
+async def _run_in(name: str, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(name), partial(func, *args, **kwargs))
+
+
+async def run_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run a blocking I/O call on the I/O thread pool."""
+    return await _run_in(IO_POOL, func, *args, **kwargs)
+
+
+async def run_native(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run GIL-releasing native work on the native thread pool."""
+    return await _run_in(NATIVE_POOL, func, *args, **kwargs)
+
+
+async def run_pdf(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run PyMuPDF work on the worker's single PDF thread."""
+    return await _run_in(PDF_POOL, func, *args, **kwargs)
+
+
+async def run_cpu(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound Python work on the process pool. func and its arguments must be picklable."""
+    return await _run_in(CPU_POOL, func, *args, **kwargs)
+
+
+def shutdown_executors(name: Optional[str] = None) -> None:
+    """
+    Stop the shared executors that were started.
+
+    Args:
+        name (Optional[str]): Only stop this executor. Defaults to all of them.
+    """
+    with _executors_lock:
+        names = [name] if name else list(_executors.keys())
+        executors = [_executors.pop(n) for n in names if n in _executors]
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,195 @@
+import copy
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """
+    Cache of per-page extraction results, keyed by the PDF content and the extraction settings.
+
+    An entry holds the "page_texts" of a document and the "pages" metadata
+    recording how each page was extracted (text layer, OCR, skipped, crop).
+
+    Entries live in a bounded in-memory LRU and, when a directory is
+    configured, in an on-disk tier that every worker process of the host
+    shares. The disk tier is evicted least recently used first once it
+    grows past its size limit.
+    """
+
+    def __init__(self, memory_entries: int = 256, disk_dir: Optional[str] = None, disk_max_bytes: int = 1 << 30):
+        self._memory_entries = memory_entries
+        self._disk_dir = disk_dir
+        self._disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+        if self._disk_dir:
+            os.makedirs(self._disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(pdf_bytes: bytes, **settings: Any) -> str:
+        """
+        Build the cache key of a document.
+
+        Args:
+            pdf_bytes (bytes): The PDF file as bytes
+            **settings: Everything else the extracted text depends on (OCR engine, DPI, enhancement, ...)
+
+        Returns:
+            str: Hex digest identifying the document and settings
+        """
+        return ExtractionCache.make_key_from_digest(hashlib.sha256(pdf_bytes).hexdigest(), **settings)
+
+    @staticmethod
+    def make_key_from_digest(digest: str, **settings: Any) -> str:
+        """
+        Build the cache key of a document whose SHA-256 is already known.
+
+        Args:
+            digest (str): Hex SHA-256 of the PDF file
+            **settings: Everything else the extracted text depends on
+
+        Returns:
+            str: Hex digest identifying the document and settings
+        """
+        settings_json = json.dumps(settings, sort_keys=True, default=str)
+        return hashlib.sha256(f"{digest}:{settings_json}".encode("utf-8")).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self._disk_dir, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the extraction results of a document.
+
+        Args:
+            key (str): Key built by make_key
+
+        Returns:
+            Optional[Dict[str, Any]]: The "page_texts" and "pages" metadata, or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return copy.deepcopy(entry)
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["disk_hits"] += 1
+            self._remember(key, entry)
+        return copy.deepcopy(entry)
+
+    def put(self, key: str, page_texts: List[str], pages: List[Dict[str, Any]]) -> None:
+        """
+        Store the extraction results of a document in both tiers.
+
+        Args:
+            key (str): Key built by make_key
+            page_texts (List[str]): Text of each page
+            pages (List[Dict[str, Any]]): How each page was extracted
+        """
+        entry = copy.deepcopy({"page_texts": page_texts, "pages": pages})
+        with self._lock:
+            self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        if self._memory_entries <= 0:
+            return
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._memory_entries:
+            self._memory.popitem(last=False)
+
+    def _read_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self._disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            # Entries written before page metadata was cached hold only the texts
+            if not isinstance(entry, dict):
+                return None
+            # Mark the entry as recently used for eviction
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to read extraction cache entry {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key: str, entry: Dict[str, Any]) -> None:
+        if not self._disk_dir:
+            return
+        tmp_path = None
+        try:
+            # Write to a temp file and rename, so other workers never read a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=self._disk_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._disk_path(key))
+        except OSError as e:
+            logger.error(f"Failed to write extraction cache entry {key}: {str(e)}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = []
+        total = 0
+        for entry in os.scandir(self._disk_dir):
+            if not entry.name.endswith(".json"):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self._disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Already evicted by another worker
+                pass
+            total -= size
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit/miss counters of this worker."""
+        with self._lock:
+            return dict(self._stats, memory_entries=len(self._memory))
+
+    def clear(self) -> None:
+        """Drop the in-memory entries and reset the counters."""
+        with self._lock:
+            self._memory.clear()
+            self._stats = dict.fromkeys(self._stats, 0)
+
+
+extraction_cache = ExtractionCache(
+    memory_entries=config.extraction_cache_memory_entries,
+    disk_dir=config.extraction_cache_dir or None,
+    disk_max_bytes=config.extraction_cache_disk_max_bytes
+)
@@ -0,0 +1,47 @@
+import logging
+from typing import Dict
+
+import httpx
+
+from app.core.config import config
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_async_http_client(name: str) -> httpx.AsyncClient:
+    """
+    Return one of the worker's shared keep-alive HTTP clients, creating it on first use.
+
+    Each upstream (e.g. "ollama", "groq") gets its own connection pool,
+    sized by HTTP_MAX_CONNECTIONS / HTTP_MAX_KEEPALIVE_CONNECTIONS.
+    Clients belong to the worker's event loop and are closed on shutdown.
+
+    Args:
+        name (str): Name of the upstream
+
+    Returns:
+        httpx.AsyncClient: The shared client
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        logger.info(f"Creating HTTP connection pool for {name}")
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=config.http_max_connections,
+                max_keepalive_connections=config.http_max_keepalive_connections,
+                keepalive_expiry=config.http_keepalive_expiry_seconds
+            ),
+            timeout=httpx.Timeout(config.llm_timeout_seconds, connect=config.http_connect_timeout_seconds)
+        )
+        _clients[name] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared HTTP client."""
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
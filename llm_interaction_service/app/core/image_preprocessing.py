@@ -0,0 +1,122 @@
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+from app.core.page_image import PageImage, to_array
+
+logger = logging.getLogger(__name__)
+
+# A preprocessing step is a stage name and its parameters
+PreprocessingStep = Tuple[str, Dict[str, Any]]
+
+# Preprocessing applied to a page before OCR, by profile name. Each OCR engine
+# picks its profile in the config, so every operation runs once per page.
+PREPROCESSING_PROFILES: Dict[str, List[PreprocessingStep]] = {
+    "none": [],
+    "denoise": [
+        ("gaussian_blur", {"ksize": 5}),
+    ],
+    "binarize": [
+        ("gaussian_blur", {"ksize": 5}),
+        ("adaptive_threshold", {"block_size": 11, "c": 2}),
+    ],
+    "contrast": [
+        ("clahe", {"clip_limit": 2.0, "tile_grid_size": 8}),
+    ],
+}
+
+
+def _gaussian_blur(img: np.ndarray, ksize: int) -> None:
+    cv2.GaussianBlur(img, (ksize, ksize), 0, dst=img)
+
+
+def _adaptive_threshold(img: np.ndarray, block_size: int, c: int) -> None:
+    cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, block_size, c, dst=img)
+
+
+def _clahe(img: np.ndarray, clip_limit: float, tile_grid_size: int) -> None:
+    cv2.createCLAHE(clipLimit=clip_limit, tileGridSize=(tile_grid_size, tile_grid_size)).apply(img, dst=img)
+
+
+def _median_blur(img: np.ndarray, ksize: int) -> None:
+    cv2.medianBlur(img, ksize, dst=img)
+
+
+def _open(img: np.ndarray, kernel_size: int) -> None:
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
+    cv2.morphologyEx(img, cv2.MORPH_OPEN, kernel, dst=img)
+
+
+# Stages write their result back into the page buffer
+STAGES: Dict[str, Callable[..., None]] = {
+    "gaussian_blur": _gaussian_blur,
+    "adaptive_threshold": _adaptive_threshold,
+    "clahe": _clahe,
+    "median_blur": _median_blur,
+    "open": _open,
+}
+
+
+def is_noop(step: PreprocessingStep) -> bool:
+    """Whether a step leaves the page unchanged, e.g. a 1x1 blur or morphological open."""
+    name, params = step
+    if name in ("gaussian_blur", "median_blur"):
+        return params["ksize"] <= 1
+    if name == "open":
+        return params["kernel_size"] <= 1
+    return False
+
+
+def get_profile(name: str) -> List[PreprocessingStep]:
+    """
+    Return the steps of a preprocessing profile, without its no-op steps.
+
+    Args:
+        name (str): Profile name, a key of PREPROCESSING_PROFILES
+
+    Returns:
+        List[PreprocessingStep]: The steps to run, in order
+    """
+    if name not in PREPROCESSING_PROFILES:
+        raise ValueError(f"Unknown preprocessing profile: {name}")
+    for step_name, _ in PREPROCESSING_PROFILES[name]:
+        if step_name not in STAGES:
+            raise ValueError(f"Unknown preprocessing stage {step_name} in profile {name}")
+    return [step for step in PREPROCESSING_PROFILES[name] if not is_noop(step)]
+
+
+def apply_step(img: np.ndarray, step: PreprocessingStep) -> None:
+    """Run one preprocessing step on a grayscale uint8 page, in place."""
+    name, params = step
+    STAGES[name](img, **params)
+
+
+def preprocess(image: PageImage, profile: str, inplace: bool = False) -> np.ndarray:
+    """
+    Run a preprocessing profile over a page.
+
+    The page is converted to grayscale once, then every step writes into the
+    same uint8 buffer. Without inplace, a page the caller passed as a
+    grayscale ndarray is copied once first, so the caller's page is untouched.
+
+    Args:
+        image (PageImage): The page as an ndarray or encoded bytes
+        profile (str): Profile name, a key of PREPROCESSING_PROFILES
+        inplace (bool): Allow overwriting a grayscale ndarray page
+
+    Returns:
+        np.ndarray: The preprocessed grayscale page
+    """
+    steps = get_profile(profile)
+    img = to_array(image, gray=True)
+    if not steps:
+        return img
+
+    if (img is image and not inplace) or not img.flags.writeable or not img.flags.c_contiguous:
+        img = np.ascontiguousarray(img).copy()
+
+    for step in steps:
+        apply_step(img, step)
+    return img
@@ -0,0 +1,120 @@
+import json
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+# Rough number of characters per token, used to budget prompts without a tokenizer
+CHARS_PER_TOKEN = 4
+
+# Header fields of a parsed invoice and which occurrence wins on a tie:
+# identification is printed at the top of an invoice, totals at the bottom
+HEADER_FIELDS = {
+    "number": "first",
+    "date": "first",
+    "dueDate": "first",
+    "total": "last",
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of a text."""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_pages_by_token_budget(page_texts: List[str], max_tokens: int) -> List[str]:
+    """
+    Group consecutive pages into chunks that fit a token budget.
+
+    Pages are never split unless a single page is over budget on its own.
+
+    Args:
+        page_texts (List[str]): Text of each page, in page order
+        max_tokens (int): Token budget of a chunk
+
+    Returns:
+        List[str]: Chunk texts, in page order
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    splitter = RecursiveCharacterTextSplitter(chunk_size=max_chars, chunk_overlap=0)
+
+    chunks, current = [], []
+    for page_text in page_texts:
+        if not page_text:
+            continue
+        if len(page_text) > max_chars:
+            if current:
+                chunks.append("\n".join(current))
+                current = []
+            chunks.extend(splitter.split_text(page_text))
+            continue
+        if current and len("\n".join(current + [page_text])) > max_chars:
+            chunks.append("\n".join(current))
+            current = []
+        current.append(page_text)
+
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or (isinstance(value, str) and not value.strip()) or value in ([], {})
+
+
+def _pick_header_value(values: List[Any], tie_break: str) -> Optional[Any]:
+    values = [value for value in values if not _is_empty(value)]
+    if not values:
+        return None
+
+    counts = Counter(json.dumps(value, sort_keys=True) for value in values)
+    best = max(counts.values())
+    candidates = [value for value in values if counts[json.dumps(value, sort_keys=True)] == best]
+    return candidates[0] if tie_break == "first" else candidates[-1]
+
+
+def _is_tax_item(item: Any) -> bool:
+    return isinstance(item, dict) and str(item.get("description", "")).strip().upper() == "TAX"
+
+
+def merge_invoice_parts(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Merge invoices parsed from consecutive chunks of one document.
+
+    Items are concatenated in chunk order; TAX items repeated verbatim by
+    several chunks are kept once. Each header field takes the value most
+    chunks agree on, ties going to the first chunk (or the last one for the
+    total). Other keys keep their first non-empty value.
+
+    Args:
+        parts (List[Dict[str, Any]]): Parsed invoice of each chunk, in chunk order
+
+    Returns:
+        Dict[str, Any]: The merged invoice
+    """
+    merged: Dict[str, Any] = {}
+
+    for field, tie_break in HEADER_FIELDS.items():
+        value = _pick_header_value([part.get(field) for part in parts], tie_break)
+        if value is not None or any(field in part for part in parts):
+            merged[field] = value
+
+    items, seen_tax_items = [], set()
+    for part in parts:
+        for item in part.get("items") or []:
+            if _is_tax_item(item):
+                key = json.dumps(item, sort_keys=True)
+                if key in seen_tax_items:
+                    continue
+                seen_tax_items.add(key)
+            items.append(item)
+    merged["items"] = items
+
+    for part in parts:
+        for key, value in part.items():
+            if key in merged or key == "items":
+                continue
+            if not _is_empty(value):
+                merged[key] = value
+
+    return merged
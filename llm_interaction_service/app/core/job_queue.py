@@ -0,0 +1,281 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+
+from app.core.config import config
+from app.core.upload_spool import PDFInput, SpooledUpload, move_upload
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+class JobQueue:
+    """
+    Durable queue of file processing jobs, stored in SQLite.
+
+    Uploaded files are kept next to the database until their job finishes.
+    Workers claim jobs with a lease; a job whose worker died is claimed
+    again once its lease expires. Updates carry the attempt number the job
+    was claimed with, so a worker whose lease expired can't overwrite the
+    attempt that replaced it. Failed attempts are retried with
+    exponential backoff until max_attempts is reached.
+    """
+
+    def __init__(self, directory: str, max_attempts: int = 3, lease_seconds: int = 900, retry_backoff_seconds: float = 5):
+        self.directory = directory
+        self.db_path = os.path.join(directory, "jobs.sqlite3")
+        self.files_dir = os.path.join(directory, "files")
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(self.files_dir, exist_ok=True)
+            with closing(sqlite3.connect(self.db_path, timeout=30)) as conn, conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        status TEXT NOT NULL,
+                        params TEXT NOT NULL,
+                        file_path TEXT,
+                        stage TEXT,
+                        progress TEXT,
+                        result TEXT,
+                        error TEXT,
+                        attempts INTEGER NOT NULL DEFAULT 0,
+                        available_at REAL NOT NULL,
+                        lease_until REAL,
+                        created_at REAL NOT NULL,
+                        updated_at REAL NOT NULL
+                    )
+                    """
+                )
+                conn.execute("CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at)")
+            self._initialized = True
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        job = dict(row)
+        for key in ("params", "progress", "result"):
+            job[key] = json.loads(job[key]) if job[key] is not None else None
+        return job
+
+    def submit(self, params: Dict[str, Any], file: PDFInput) -> str:
+        """
+        Enqueue a job.
+
+        Args:
+            params (Dict[str, Any]): Processing parameters, JSON serializable
+            file (PDFInput): The uploaded file. A spooled upload is moved into the queue, not copied.
+
+        Returns:
+            str: The job id
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+
+        with closing(self._connect()) as conn:
+            file_path = os.path.join(self.files_dir, f"{job_id}.bin")
+            if isinstance(file, SpooledUpload):
+                move_upload(file, file_path)
+            else:
+                with open(file_path, "wb") as f:
+                    f.write(file)
+
+            with conn:
+                conn.execute(
+                    """
+                    INSERT INTO jobs (id, status, params, file_path, available_at, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (job_id, QUEUED, json.dumps(params), file_path, now, now, now)
+                )
+        return job_id
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Claim the oldest runnable job, including jobs whose lease expired.
+
+        Returns:
+            Optional[Dict[str, Any]]: The claimed job, or None if there is none
+        """
+        now = time.time()
+        with closing(self._connect()) as conn:
+            # BEGIN IMMEDIATE takes the write lock, so two workers never claim the same job
+            conn.isolation_level = None
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    """
+                    SELECT id FROM jobs
+                    WHERE (status = ? AND available_at <= ?) OR (status = ? AND lease_until < ?)
+                    ORDER BY created_at LIMIT 1
+                    """,
+                    (QUEUED, now, RUNNING, now)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (RUNNING, now + self.lease_seconds, now, row["id"])
+                )
+                job = conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self._to_dict(job)
+
+    def update_progress(self, job_id: str, attempt: int, stage: str, progress: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Record the last pipeline stage a job finished and extend its lease.
+
+        Returns:
+            bool: False if the attempt lost its lease to another worker
+        """
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET stage = ?, progress = ?, lease_until = ?, updated_at = ?
+                WHERE id = ? AND status = ? AND attempts = ?
+                """,
+                (stage, json.dumps(progress or {}), now + self.lease_seconds, now, job_id, RUNNING, attempt)
+            )
+            return cursor.rowcount > 0
+
+    def complete(self, job_id: str, attempt: int, result: Any) -> bool:
+        """
+        Store the result of a job.
+
+        Returns:
+            bool: False if the attempt lost its lease to another worker
+        """
+        return self._finish(job_id, attempt, SUCCEEDED, result=json.dumps(result))
+
+    def fail(self, job_id: str, attempt: int, error: str, retryable: bool = True) -> bool:
+        """
+        Record a failed attempt, re-queueing the job if it has attempts left.
+
+        Only the worker holding the lease may fail a job: an attempt whose
+        lease expired and was claimed again is ignored.
+
+        Args:
+            job_id (str): The job id
+            attempt (int): The attempt number the job was claimed with
+            error (str): What went wrong
+            retryable (bool): Whether another attempt could succeed
+
+        Returns:
+            bool: True if the job will be retried
+        """
+        if retryable and attempt < self.max_attempts:
+            now = time.time()
+            backoff = self.retry_backoff_seconds * 2 ** (attempt - 1)
+            with closing(self._connect()) as conn, conn:
+                cursor = conn.execute(
+                    """
+                    UPDATE jobs SET status = ?, error = ?, available_at = ?, lease_until = NULL, updated_at = ?
+                    WHERE id = ? AND status = ? AND attempts = ?
+                    """,
+                    (QUEUED, error, now + backoff, now, job_id, RUNNING, attempt)
+                )
+            if cursor.rowcount == 0:
+                logger.warning(f"Job {job_id} attempt {attempt} lost its lease, ignoring its failure: {error}")
+                return False
+            logger.warning(f"Job {job_id} failed (attempt {attempt}), retrying in {backoff:.0f}s: {error}")
+            return True
+
+        if self._finish(job_id, attempt, FAILED, error=error):
+            logger.error(f"Job {job_id} failed: {error}")
+        return False
+
+    def _finish(
+            self,
+            job_id: str,
+            attempt: int,
+            status: str,
+            result: Optional[str] = None,
+            error: Optional[str] = None
+    ) -> bool:
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT file_path FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            cursor = conn.execute(
+                """
+                UPDATE jobs SET status = ?, result = ?, error = ?, file_path = NULL, lease_until = NULL, updated_at = ?
+                WHERE id = ? AND status = ? AND attempts = ?
+                """,
+                (status, result, error, time.time(), job_id, RUNNING, attempt)
+            )
+
+        if cursor.rowcount == 0:
+            logger.warning(f"Job {job_id} attempt {attempt} lost its lease, discarding its outcome")
+            return False
+
+        # The upload is no longer needed once the job can't run again
+        if row is not None and row["file_path"] and os.path.exists(row["file_path"]):
+            os.remove(row["file_path"])
+        return True
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a job, or None if it doesn't exist."""
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def read_file(self, job: Dict[str, Any]) -> bytes:
+        """Return the uploaded file of a job."""
+        with open(job["file_path"], "rb") as f:
+            return f.read()
+
+    def open_file(self, job: Dict[str, Any]) -> SpooledUpload:
+        """Return the uploaded file of a job by path. It stays owned by the queue until the job finishes."""
+        return SpooledUpload(job["file_path"], os.path.getsize(job["file_path"]), owned=False)
+
+    def purge(self, older_than_seconds: float) -> int:
+        """
+        Delete finished jobs last updated before the given age.
+
+        Returns:
+            int: Number of jobs deleted
+        """
+        with closing(self._connect()) as conn, conn:
+            cursor = conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (SUCCEEDED, FAILED, time.time() - older_than_seconds)
+            )
+            return cursor.rowcount
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of jobs per status."""
+        with closing(self._connect()) as conn:
+            rows: List[sqlite3.Row] = conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["count"] for row in rows}
+
+
+job_queue = JobQueue(
+    directory=config.job_queue_dir,
+    max_attempts=config.job_max_attempts,
+    lease_seconds=config.job_lease_seconds
+)
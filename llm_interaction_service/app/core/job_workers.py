@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from typing import Any, Dict, List
+
+from app.core.config import config
+from app.core.executors import run_io
+from app.core.job_queue import JobQueue
+from app.services.parse_file_service import ParseFileService
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorkerPool:
+    """
+    Pipeline workers that take jobs off the durable job queue.
+
+    Each worker runs one job at a time through ParseFileService.process_stream,
+    recording its stage progress in the queue. Server errors are retried by
+    the queue; client errors (4xx) fail the job right away. Finished jobs
+    older than the retention period are purged from the queue periodically.
+    """
+
+    PURGE_INTERVAL_SECONDS = 3600
+
+    def __init__(
+            self,
+            queue: JobQueue,
+            concurrency: int = 1,
+            poll_interval: float = 1.0,
+            retention_seconds: float = 7 * 24 * 3600
+    ):
+        self.queue = queue
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._last_purge = 0.0
+
+    def start(self) -> None:
+        """Start the workers on the running event loop."""
+        logger.info(f"Starting {self.concurrency} job workers")
+        self._tasks = [asyncio.create_task(self._run(i)) for i in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Stop the workers. Jobs they were running are picked up again once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def purge_if_due(self) -> None:
+        """Delete finished jobs past the retention period, at most once per purge interval."""
+        now = time.monotonic()
+        if self._last_purge and now - self._last_purge < self.PURGE_INTERVAL_SECONDS:
+            return
+
+        # Workers share one event loop, so only one of them purges
+        self._last_purge = now
+        try:
+            purged = await run_io(self.queue.purge, self.retention_seconds)
+        except Exception as e:
+            logger.error(f"Failed to purge finished jobs: {str(e)}")
+            return
+        if purged:
+            logger.info(f"Purged {purged} finished jobs")
+
+    async def _run(self, worker_index: int) -> None:
+        while True:
+            await self.purge_if_due()
+            try:
+                job = await run_io(self.queue.claim)
+            except Exception as e:
+                logger.error(f"Job worker {worker_index} failed to claim a job: {str(e)}")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+
+            logger.info(f"Job worker {worker_index} running job {job['id']} (attempt {job['attempts']})")
+            try:
+                await self.process_job(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await run_io(self.queue.fail, job["id"], job["attempts"], f"Error processing file: {str(e)}")
+
+    async def process_job(self, job: Dict[str, Any]) -> None:
+        """
+        Run one job through the file processing pipeline.
+
+        Args:
+            job (Dict[str, Any]): A job claimed from the queue
+        """
+        if job["attempts"] > self.queue.max_attempts:
+            # Its worker died on the last attempt
+            await run_io(self.queue.fail, job["id"], job["attempts"], "Job worker stopped while processing the job", False)
+            return
+
+        pdf = await run_io(self.queue.open_file, job)
+        service = ParseFileService(ollama_base_url=config.ollama_base_url, groq_api_key=config.groq_api_key)
+
+        # The stream is closed before the job is finalized, so its cleanup never
+        # runs after the attempt has been completed or failed
+        outcome = None
+        async with aclosing(service.process_stream(pdf=pdf, **job["params"])) as events:
+            async for event in events:
+                if event["event"] == "stage":
+                    progress = dict(event["data"])
+                    stage = progress.pop("stage")
+                    if not await run_io(self.queue.update_progress, job["id"], job["attempts"], stage, progress):
+                        logger.warning(f"Job {job['id']} was claimed again by another worker, abandoning it")
+                        return
+                elif event["event"] in ("result", "error"):
+                    outcome = event
+                    break
+
+        if outcome is None:
+            await run_io(self.queue.fail, job["id"], job["attempts"], "Processing finished without a result")
+        elif outcome["event"] == "result":
+            if await run_io(self.queue.complete, job["id"], job["attempts"], outcome["data"]):
+                logger.info(f"Job {job['id']} succeeded")
+        else:
+            retryable = outcome["data"]["status_code"] >= 500
+            await run_io(self.queue.fail, job["id"], job["attempts"], outcome["data"]["detail"], retryable)
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.executors import run_cpu
+from app.core.page_image import PageImage
+
+logger = logging.getLogger(__name__)
+
+
+class SharedPageBuffer:
+    """
+    Packs page images into a single shared memory block.
+
+    Workers attach to the block by name and read their page through a
+    memoryview, so page pixels are never pickled across the process boundary.
+    ndarray pages are stored as raw pixels together with their shape and
+    dtype; encoded pages are stored as-is with neither.
+    """
+
+    def __init__(self, pages: List[PageImage]):
+        self.spans: List[Tuple[int, int, Optional[Tuple[int, ...]], Optional[str]]] = []
+        offset = 0
+        for page in pages:
+            if isinstance(page, np.ndarray):
+                self.spans.append((offset, page.nbytes, page.shape, page.dtype.str))
+                offset += page.nbytes
+            else:
+                self.spans.append((offset, len(page), None, None))
+                offset += len(page)
+
+        self._shm = SharedMemory(create=True, size=max(offset, 1))
+        for page, (start, length, shape, dtype) in zip(pages, self.spans):
+            if shape is not None:
+                np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=start)[...] = page
+            else:
+                self._shm.buf[start:start + length] = page
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def close(self) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self) -> "SharedPageBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def _ocr_shared_page(
+        service_name: str,
+        engine_lang: str,
+        engine_options: Tuple[Tuple[str, Any], ...],
+        shm_name: str,
+        offset: int,
+        length: int,
+        shape: Optional[Tuple[int, ...]],
+        dtype: Optional[str],
+        lang: str
+) -> str:
+    """Run OCR on one page of a SharedPageBuffer inside a pool worker."""
+    # Imported here to keep the OCR services out of the parent's import cycle
+    from app.factories.ocr_service_registry import ocr_service_registry
+
+    # Spawned workers share the parent's resource tracker, so attaching here
+    # doesn't take ownership of the block away from the parent
+    shm = SharedMemory(name=shm_name)
+
+    text, error = None, None
+    page = shm.buf[offset:offset + length]
+    image = np.ndarray(shape, dtype=dtype, buffer=page) if shape is not None else page
+    try:
+        with ocr_service_registry.checkout(service_name, engine_lang, **dict(engine_options)) as service:
+            text = service.extract_text_from_image_sync(image, lang)
+    except Exception as e:
+        # HTTPException can't be pickled back to the parent, and the traceback
+        # must be dropped before the shared buffer can be released
+        error = getattr(e, "detail", None) or str(e)
+
+    del image
+    page.release()
+    shm.close()
+
+    if error is not None:
+        raise RuntimeError(error)
+    return text
+
+
+async def ocr_pages_in_process_pool(
+        service_name: str,
+        engine_lang: str,
+        engine_options: Dict[str, Any],
+        image_bytes_list: List[PageImage],
+        lang: str
+) -> List[str]:
+    """
+    OCR pages concurrently on the CPU process pool.
+
+    Each pool worker keeps its own warm engine in its OCR service registry.
+
+    Args:
+        service_name (str): Name of the OCR service the workers should use
+        engine_lang (str): Language the worker engines are loaded for
+        engine_options (Dict[str, Any]): Options passed to the OCR service factory
+        image_bytes_list (List[PageImage]): List of images as ndarrays or encoded bytes
+        lang (str): Language code for OCR
+
+    Returns:
+        List[str]: Extracted text for each page, in page order
+    """
+    options = tuple(sorted(engine_options.items()))
+
+    with SharedPageBuffer(image_bytes_list) as buffer:
+        futures = [
+            run_cpu(
+                _ocr_shared_page, service_name, engine_lang, options, buffer.name, offset, length, shape, dtype, lang
+            )
+            for offset, length, shape, dtype in buffer.spans
+        ]
+        # Wait for every page before the buffer is unlinked
+        results = await asyncio.gather(*futures, return_exceptions=True)
+
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
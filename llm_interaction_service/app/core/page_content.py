@@ -0,0 +1,39 @@
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+# Preview pixels darker than this count as ink
+INK_THRESHOLD = 192
+# Connected ink smaller than this (in preview pixels) is scanner dust, not content
+MIN_SPECK_AREA = 3
+
+
+def find_content(preview: np.ndarray) -> Tuple[float, int, Optional[Tuple[int, int, int, int]]]:
+    """
+    Measure the ink of a downsampled grayscale page and the box around it.
+
+    Args:
+        preview (np.ndarray): Grayscale page, e.g. rendered at 72 DPI
+
+    Returns:
+        Tuple[float, int, Optional[Tuple[int, int, int, int]]]: Share of the page covered by ink,
+            the area of its largest connected mark in preview pixels, and the (x0, y0, x1, y1)
+            box around it in preview pixels, or None without ink
+    """
+    ink = (preview < INK_THRESHOLD).astype(np.uint8)
+    count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+
+    # Component 0 is the background
+    stats = stats[1:]
+    stats = stats[stats[:, cv2.CC_STAT_AREA] >= MIN_SPECK_AREA]
+    if not len(stats):
+        return 0.0, 0, None
+
+    x0 = stats[:, cv2.CC_STAT_LEFT]
+    y0 = stats[:, cv2.CC_STAT_TOP]
+    x1 = x0 + stats[:, cv2.CC_STAT_WIDTH]
+    y1 = y0 + stats[:, cv2.CC_STAT_HEIGHT]
+    ink_ratio = float(stats[:, cv2.CC_STAT_AREA].sum()) / preview.size
+    largest_mark = int(stats[:, cv2.CC_STAT_AREA].max())
+    return ink_ratio, largest_mark, (int(x0.min()), int(y0.min()), int(x1.max()), int(y1.max()))
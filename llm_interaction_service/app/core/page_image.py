@@ -0,0 +1,79 @@
+import io
+from typing import Union
+
+import cv2
+import fitz
+import numpy as np
+from PIL import Image
+
+# A page travels through the pipeline as a uint8 ndarray (grayscale HxW or
+# BGR HxWx3). Encoded image bytes are still accepted wherever a page is.
+PageImage = Union[np.ndarray, bytes, bytearray, memoryview]
+
+
+class PixmapArray(np.ndarray):
+    """ndarray view over a PyMuPDF pixmap's samples that keeps the pixmap alive."""
+
+    def __array_finalize__(self, obj) -> None:
+        self.pixmap = getattr(obj, "pixmap", None)
+
+
+def pixmap_to_array(pix: fitz.Pixmap) -> np.ndarray:
+    """
+    Wrap a pixmap's samples as an ndarray without copying them.
+
+    Args:
+        pix (fitz.Pixmap): A pixmap without alpha channel
+
+    Returns:
+        np.ndarray: HxW for grayscale pixmaps, HxWxN (in the pixmap's RGB order) otherwise
+    """
+    shape = (pix.height, pix.width) if pix.n == 1 else (pix.height, pix.width, pix.n)
+    strides = (pix.stride, 1) if pix.n == 1 else (pix.stride, pix.n, 1)
+
+    array = np.ndarray(shape, dtype=np.uint8, buffer=pix.samples_mv, strides=strides).view(PixmapArray)
+    # samples_mv doesn't reference the pixmap, so the array has to
+    array.pixmap = pix
+    return array
+
+
+def to_array(image: PageImage, gray: bool = False) -> np.ndarray:
+    """
+    Return a page as an ndarray, decoding it only if it arrived encoded.
+
+    Args:
+        image (PageImage): The page as an ndarray or as encoded image bytes
+        gray (bool): Convert the page to single-channel grayscale
+
+    Returns:
+        np.ndarray: The page pixels
+    """
+    if not isinstance(image, np.ndarray):
+        nparr = np.frombuffer(image, np.uint8)
+        image = cv2.imdecode(nparr, cv2.IMREAD_GRAYSCALE if gray else cv2.IMREAD_UNCHANGED)
+        if image is None:
+            raise ValueError("Could not decode page image")
+
+    if gray and image.ndim == 3:
+        code = cv2.COLOR_BGRA2GRAY if image.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+        image = cv2.cvtColor(image, code)
+    return image
+
+
+def to_pil_image(image: PageImage) -> Image.Image:
+    """Return a page as a PIL image for engines that expect one."""
+    if isinstance(image, np.ndarray):
+        if image.ndim == 3:
+            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        return Image.fromarray(image)
+    return Image.open(io.BytesIO(image))
+
+
+def to_png_bytes(image: PageImage) -> bytes:
+    """Encode a page as PNG. Only needed when a page has to be persisted."""
+    if not isinstance(image, np.ndarray):
+        return bytes(image)
+    ok, buffer = cv2.imencode(".png", image)
+    if not ok:
+        raise ValueError("Could not encode page image")
+    return buffer.tobytes()
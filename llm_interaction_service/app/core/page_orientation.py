@@ -0,0 +1,174 @@
+import logging
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Long side of the downsampled page the orientation is estimated on
+ANALYSIS_SIZE = 800
+# Skew angles tried, in degrees
+MAX_SKEW_DEGREES = 5.0
+SKEW_STEP_DEGREES = 0.25
+
+_ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE,
+}
+
+
+class PageOrientation:
+    """
+    How a page has to be turned to be upright.
+
+    Attributes:
+        rotation (int): Clockwise rotation to apply, one of 0, 90, 180, 270
+        skew (float): Counter-clockwise deskew angle to apply after the rotation, in degrees
+        confidence (float): Between 0 and 1, how sure the estimate is of the rotation
+    """
+
+    def __init__(self, rotation: int = 0, skew: float = 0.0, confidence: float = 0.0):
+        self.rotation = rotation
+        self.skew = skew
+        self.confidence = confidence
+
+    def __repr__(self) -> str:
+        return f"PageOrientation(rotation={self.rotation}, skew={self.skew:.2f}, confidence={self.confidence:.2f})"
+
+
+def _ink_mask(gray: np.ndarray) -> np.ndarray:
+    """Downsample a page and return its ink as a 0/1 float32 mask."""
+    scale = ANALYSIS_SIZE / max(gray.shape[:2])
+    if scale < 1:
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    _, ink = cv2.threshold(gray, 0, 1, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+    return ink.astype(np.float32)
+
+
+def _rotate_small(mask: np.ndarray, angle: float) -> np.ndarray:
+    h, w = mask.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, 1.0)
+    return cv2.warpAffine(mask, matrix, (w, h), flags=cv2.INTER_NEAREST)
+
+
+def _line_score(ys: np.ndarray, xs: np.ndarray, angle: float) -> float:
+    """
+    Variance of the row profile of the ink once rotated by angle: high when text lines run horizontally.
+
+    Only the ink pixel coordinates are projected, which is much cheaper than
+    rotating the whole mask for every candidate angle.
+    """
+    theta = np.deg2rad(angle)
+    rows = ys * np.cos(theta) - xs * np.sin(theta)
+    profile = np.bincount((rows - rows.min()).astype(np.int32))
+    return float(np.var(profile))
+
+
+def _estimate_skew(mask: np.ndarray) -> Tuple[float, float]:
+    """Return the deskew angle with the sharpest row profile, and that profile's score."""
+    ys, xs = np.nonzero(mask)
+    ys = ys.astype(np.float32)
+    xs = xs.astype(np.float32) - mask.shape[1] / 2
+
+    # Coarse search in whole degrees, then refine around the best one
+    coarse = np.arange(-MAX_SKEW_DEGREES, MAX_SKEW_DEGREES + 0.5, 1.0)
+    best = max(coarse, key=lambda angle: _line_score(ys, xs, angle))
+    fine = np.arange(best - 0.75, best + 0.76, SKEW_STEP_DEGREES)
+    scores = [_line_score(ys, xs, angle) for angle in fine]
+    index = int(np.argmax(scores))
+    return float(fine[index]), scores[index]
+
+
+def _text_lines(mask: np.ndarray) -> List[Tuple[int, int]]:
+    """Row ranges of the text lines of an upright mask."""
+    profile = mask.sum(axis=1)
+    rows = profile > max(profile.max() * 0.05, 1)
+    lines = []
+    start = None
+    for y, has_ink in enumerate(rows):
+        if has_ink and start is None:
+            start = y
+        elif not has_ink and start is not None:
+            lines.append((start, y))
+            start = None
+    if start is not None:
+        lines.append((start, len(rows)))
+    return [(top, bottom) for top, bottom in lines if bottom - top >= 3]
+
+
+def _upright_score(mask: np.ndarray) -> float:
+    """
+    Ink above the x-height band minus ink below it, over all text lines.
+
+    Latin script has more ascenders (capitals, b, d, f, h, k, l, t) than
+    descenders (g, j, p, q, y), so the score is positive on upright pages
+    and negative on upside-down ones.
+    """
+    above = below = 0.0
+    for top, bottom in _text_lines(mask):
+        profile = mask[top:bottom].sum(axis=1)
+        core = np.nonzero(profile >= profile.max() * 0.5)[0]
+        above += profile[:core[0]].sum()
+        below += profile[core[-1] + 1:].sum()
+    total = above + below
+    return (above - below) / total if total else 0.0
+
+
+def detect_orientation(gray: np.ndarray) -> PageOrientation:
+    """
+    Estimate the page rotation and skew from a downsampled projection profile.
+
+    Text lines give the row profile of a page sharp peaks, so the rotation
+    (0/90 vs 180/270) and the skew are the ones with the highest row profile
+    variance. Upright and upside-down pages are told apart by the ascender
+    to descender ratio of their lines.
+
+    Args:
+        gray (np.ndarray): Grayscale page
+
+    Returns:
+        PageOrientation: The rotation and skew that make the page upright
+    """
+    mask = _ink_mask(gray)
+    if not mask.any():
+        return PageOrientation(confidence=1.0)
+
+    skew, horizontal = _estimate_skew(mask)
+    turned = cv2.rotate(mask, cv2.ROTATE_90_CLOCKWISE)
+    turned_skew, vertical = _estimate_skew(turned)
+
+    if vertical > horizontal:
+        rotation, skew, mask = 90, turned_skew, turned
+        line_confidence = 1 - horizontal / vertical
+    else:
+        rotation = 0
+        line_confidence = 1 - vertical / horizontal if horizontal else 0.0
+
+    upright = _upright_score(_rotate_small(mask, skew))
+    if upright < 0:
+        rotation = (rotation + 180) % 360
+
+    # Both decisions have to be clear for the page to skip per-line classification
+    return PageOrientation(rotation, skew, min(line_confidence, abs(upright) * 4, 1.0))
+
+
+def apply_orientation(img: np.ndarray, orientation: PageOrientation) -> np.ndarray:
+    """
+    Turn a page upright.
+
+    Args:
+        img (np.ndarray): The page, grayscale or BGR
+        orientation (PageOrientation): As returned by detect_orientation
+
+    Returns:
+        np.ndarray: The rotated and deskewed page, or the page itself if it is upright
+    """
+    if orientation.rotation:
+        img = cv2.rotate(img, _ROTATE_CODES[orientation.rotation])
+    if abs(orientation.skew) >= SKEW_STEP_DEGREES:
+        h, w = img.shape[:2]
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), orientation.skew, 1.0)
+        img = cv2.warpAffine(img, matrix, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+    return img
@@ -0,0 +1,66 @@
+import asyncio
+from typing import AsyncIterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+_END = object()
+
+
+async def prefetch_batches(source: AsyncIterator[T], maxsize: int, max_batch: int = 1) -> AsyncIterator[List[T]]:
+    """
+    Run an async page source ahead of its consumer through a bounded queue.
+
+    The producer keeps rendering while the consumer runs OCR, but stops once
+    `maxsize` pages are waiting, which bounds the pages held in memory. Each
+    yielded batch holds at least one item plus whatever else is already
+    queued, up to `max_batch`, so batched OCR engines never wait for a full
+    batch.
+
+    Args:
+        source (AsyncIterator[T]): The page source, e.g. a PDF page iterator
+        maxsize (int): Maximum number of pages buffered between the stages
+        max_batch (int): Maximum number of pages handed out at once
+
+    Yields:
+        List[T]: Pages in source order
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=max(maxsize, 1))
+    failure: Optional[BaseException] = None
+
+    async def produce() -> None:
+        nonlocal failure
+        try:
+            async for item in source:
+                await queue.put(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            failure = e
+        finally:
+            # Let the source release its resources (e.g. an open PDF) right away
+            aclose = getattr(source, "aclose", None)
+            if aclose is not None:
+                await aclose()
+        await queue.put(_END)
+
+    producer = asyncio.create_task(produce())
+    try:
+        finished = False
+        while not finished:
+            batch = []
+            item = await queue.get()
+            while item is not _END:
+                batch.append(item)
+                if len(batch) >= max_batch or queue.empty():
+                    break
+                item = queue.get_nowait()
+            finished = item is _END
+
+            if batch:
+                yield batch
+
+        if failure is not None:
+            raise failure
+    finally:
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
@@ -0,0 +1,118 @@
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Optional, Union
+
+from fastapi import HTTPException, UploadFile
+
+from app.core.config import config
+from app.core.executors import run_io
+
+logger = logging.getLogger(__name__)
+
+# Size of the pieces an upload is copied and hashed in
+CHUNK_SIZE = 1024 * 1024
+
+
+class SpooledUpload:
+    """
+    An uploaded file spooled to disk, opened by path instead of held in memory.
+
+    Spooled uploads are deleted on close unless they are owned by someone
+    else (e.g. a job's stored upload).
+    """
+
+    def __init__(self, path: str, size: int, sha256: Optional[str] = None, owned: bool = True):
+        self.path = path
+        self.size = size
+        self._sha256 = sha256
+        self.owned = owned
+
+    @property
+    def sha256(self) -> str:
+        """Hex SHA-256 of the content, computed while spooling or streamed from disk on first use."""
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def read_bytes(self) -> bytes:
+        """Read the whole content. Only for the few consumers that need bytes."""
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def close(self) -> None:
+        if self.owned and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> "SpooledUpload":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+PDFInput = Union[bytes, SpooledUpload]
+
+
+def spool_stream(source: BinaryIO, max_bytes: Optional[int] = None, name: str = "upload") -> SpooledUpload:
+    """
+    Copy a binary stream to a temp file, hashing it and enforcing the size limit on the way.
+
+    Args:
+        source (BinaryIO): The stream to copy
+        max_bytes (Optional[int]): Size limit. Defaults to UPLOAD_MAX_BYTES.
+        name (str): Name used in the error message
+
+    Returns:
+        SpooledUpload: The spooled file
+    """
+    max_bytes = config.upload_max_bytes if max_bytes is None else max_bytes
+    digest = hashlib.sha256()
+    size = 0
+
+    fd, path = tempfile.mkstemp(prefix="upload-", suffix=".pdf", dir=config.upload_spool_dir or None)
+    try:
+        with os.fdopen(fd, "wb") as target:
+            for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File {name} is larger than the {max_bytes // (1024 * 1024)} MB limit."
+                    )
+                digest.update(chunk)
+                target.write(chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return SpooledUpload(path, size, digest.hexdigest())
+
+
+async def spool_upload(file: UploadFile, max_bytes: Optional[int] = None) -> SpooledUpload:
+    """
+    Spool a FastAPI upload to a temp file on the I/O thread pool.
+
+    Args:
+        file (UploadFile): The uploaded file
+        max_bytes (Optional[int]): Size limit. Defaults to UPLOAD_MAX_BYTES.
+
+    Returns:
+        SpooledUpload: The spooled file
+    """
+    upload = await run_io(spool_stream, file.file, max_bytes, file.filename or "upload")
+    logger.info(f"Spooled upload {file.filename} ({upload.size} bytes) to {upload.path}")
+    return upload
+
+
+def move_upload(upload: SpooledUpload, path: str) -> SpooledUpload:
+    """Move a spooled upload to a permanent location, handing over its ownership."""
+    sha256 = upload.sha256
+    shutil.move(upload.path, path)
+    return SpooledUpload(path, upload.size, sha256, owned=False)
@@ -0,0 +1,62 @@
+import logging
+import threading
+from typing import Optional
+
+from app.core.config import config
+from app.core.constants import CompletionCacheBackend
+from app.interfaces.completion_cache_backend_interface import CompletionCacheBackendInterface
+from app.services.in_memory_completion_cache_backend import InMemoryCompletionCacheBackend
+from app.services.sqlite_completion_cache_backend import SqliteCompletionCacheBackend
+
+logger = logging.getLogger(__name__)
+
+_shared_backend: Optional[CompletionCacheBackendInterface] = None
+_shared_backend_lock = threading.Lock()
+
+class CompletionCacheBackendFactory:
+    """
+    Factory class for creating LLM completion cache backends based on configuration.
+    Allows easy addition of new backend implementations.
+    """
+
+    @staticmethod
+    def create_completion_cache_backend(
+        backend_name: str,
+        max_entries: int = 1024,
+        sqlite_path: Optional[str] = None
+    ) -> CompletionCacheBackendInterface:
+        """
+        Create a completion cache backend.
+
+        Args:
+            backend_name (str): Name of the backend to create
+            max_entries (int): Entries kept before eviction
+            sqlite_path (Optional[str]): Database file of the SQLite backend
+
+        Returns:
+            CompletionCacheBackendInterface: An instance of the specified backend
+        """
+        backend_name = backend_name.lower()
+
+        if backend_name == CompletionCacheBackend.MEMORY:
+            logger.info("Creating in-memory LLM completion cache")
+            return InMemoryCompletionCacheBackend(max_entries=max_entries)
+        elif backend_name == CompletionCacheBackend.SQLITE:
+            logger.info(f"Creating SQLite LLM completion cache at {sqlite_path}")
+            return SqliteCompletionCacheBackend(sqlite_path, max_entries=max_entries)
+
+        raise ValueError(f"Unsupported completion cache backend: {backend_name}")
+
+    @staticmethod
+    def get_shared_backend() -> CompletionCacheBackendInterface:
+        """Return the worker's completion cache backend configured by LLM_CACHE_*, creating it on first use."""
+        global _shared_backend
+        if _shared_backend is None:
+            with _shared_backend_lock:
+                if _shared_backend is None:
+                    _shared_backend = CompletionCacheBackendFactory.create_completion_cache_backend(
+                        config.llm_cache_backend,
+                        max_entries=config.llm_cache_max_entries,
+                        sqlite_path=config.llm_cache_sqlite_path
+                    )
+        return _shared_backend
@@ -0,0 +1,50 @@
+import logging
+import threading
+from typing import Dict, Optional
+
+from langchain_core.embeddings import Embeddings
+from langchain_community.embeddings import SentenceTransformerEmbeddings
+
+from app.core.config import config
+from app.services.cached_embeddings import CachedEmbeddings
+
+logger = logging.getLogger(__name__)
+
+_shared_embeddings: Dict[str, Embeddings] = {}
+_shared_embeddings_lock = threading.Lock()
+
+class EmbeddingsFactory:
+    """
+    Factory class for the embedding models used by the RAG path.
+    Models are loaded once per worker process and shared by every request.
+    """
+
+    @staticmethod
+    def get_shared_embeddings(model_name: Optional[str] = None) -> Embeddings:
+        """
+        Return the worker's embedding model, loading it on first use.
+
+        Args:
+            model_name (Optional[str]): Sentence-transformers model. Defaults to EMBEDDING_MODEL_NAME.
+
+        Returns:
+            Embeddings: The shared, cache-backed embedding model
+        """
+        model_name = model_name or config.embedding_model_name
+
+        embeddings = _shared_embeddings.get(model_name)
+        if embeddings is None:
+            with _shared_embeddings_lock:
+                embeddings = _shared_embeddings.get(model_name)
+                if embeddings is None:
+                    logger.info(f"Loading embedding model '{model_name}'")
+                    embeddings = CachedEmbeddings(
+                        SentenceTransformerEmbeddings(model_name=model_name),
+                        model_name=model_name,
+                        max_entries=config.embedding_cache_max_entries,
+                        sqlite_path=config.embedding_cache_sqlite_path or None,
+                        sqlite_max_entries=config.embedding_cache_sqlite_max_entries,
+                        sqlite_ttl_seconds=config.embedding_cache_sqlite_ttl_seconds
+                    )
+                    _shared_embeddings[model_name] = embeddings
+        return embeddings
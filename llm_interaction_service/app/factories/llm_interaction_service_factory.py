@@ -1,6 +1,10 @@
 import logging
+from typing import Any, Callable, Dict, List, Optional
 
+from app.core.config import config
+from app.factories.completion_cache_backend_factory import CompletionCacheBackendFactory
 from app.interfaces.llm_interaction_service_interface import LlmInteractionServiceInterface
+from app.services.cached_llm_interaction_service import CachedLlmInteractionService
 from app.services.ollama_service import OllamaService
 from app.services.groq_service import GroqService
 
@@ -13,11 +17,40 @@ class LlmInteractionServiceFactory:
     """
 
     @staticmethod
-    def create_llm_interaction_service(ai_service: str, ollama_base_url: str, groq_api_key: str) -> LlmInteractionServiceInterface:
+    def create_llm_interaction_service(
+        ai_service: str,
+        ollama_base_url: str,
+        groq_api_key: str,
+        validate_completion: Optional[Callable[[List[Dict[str, Any]]], bool]] = None
+    ) -> LlmInteractionServiceInterface:
+        """
+        Create an LLM interaction service, wrapped in the completion cache when LLM_CACHE_ENABLED is set.
+
+        Args:
+            ai_service (str): Name of the AI service to create
+            ollama_base_url (str): Base URL for Ollama service
+            groq_api_key (str): API key for Groq service
+            validate_completion (Optional[Callable[[List[Dict[str, Any]]], bool]]): Accepts the
+                response chunks the caller can use; rejected completions are not cached
+
+        Returns:
+            LlmInteractionServiceInterface: An instance of the specified service
+        """
         if ai_service == "ollama_local":
-            return OllamaService(base_url=ollama_base_url)
+            service = OllamaService(base_url=ollama_base_url, timeout=config.llm_timeout_seconds)
         elif ai_service == "groq_cloud":
-            return GroqService(api_key=groq_api_key)
+            service = GroqService(api_key=groq_api_key, timeout=config.llm_timeout_seconds)
         # Add other service conditions here in the future
+        else:
+            raise ValueError(f"Unsupported AI service: {ai_service}")
+
+        if not config.llm_cache_enabled:
+            return service
 
-        raise ValueError(f"Unsupported AI service: {ai_service}")
\ No newline at end of file
+        return CachedLlmInteractionService(
+            service,
+            CompletionCacheBackendFactory.get_shared_backend(),
+            provider=ai_service,
+            ttl_seconds=config.llm_cache_ttl_seconds,
+            validate=validate_completion
+        )
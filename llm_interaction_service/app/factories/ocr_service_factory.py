@@ -4,6 +4,8 @@ from typing import Optional
 from app.interfaces.ocr_service_interface import OCRServiceInterface
 from app.services.tesseract_ocr_service import TesseractOCRService
 from app.services.paddle_ocr_service import PaddleOCRService
+from app.services.cascade_ocr_service import CascadeOCRService
+from app.services.onnx_paddle_ocr_service import OnnxPaddleOCRService
 from app.core.constants import OCRService
 
 logger = logging.getLogger(__name__)
@@ -39,6 +41,12 @@ class OCRServiceFactory:
         elif service_name == OCRService.PADDLE:
             logger.info("Creating Paddle OCR Service")
             return PaddleOCRService(lang, use_gpu)
+        elif service_name == OCRService.CASCADE:
+            logger.info("Creating Cascade OCR Service")
+            return CascadeOCRService(lang, use_gpu)
+        elif service_name == OCRService.PADDLE_ONNX:
+            logger.info("Creating ONNX Runtime Paddle OCR Service")
+            return OnnxPaddleOCRService(lang, use_gpu)
         # Add other service conditions here in the future
         # elif service_name == 'azure':
         #     return AzureOCRService(config)
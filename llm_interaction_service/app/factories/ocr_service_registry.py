@@ -0,0 +1,179 @@
+import inspect
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.interfaces.ocr_service_interface import OCRServiceInterface
+from app.factories.ocr_service_factory import OCRServiceFactory
+
+logger = logging.getLogger(__name__)
+
+RegistryKey = Tuple[str, str, Tuple[Tuple[str, Any], ...]]
+
+# Options of the OCR service factory and their defaults, other than the engine and language
+_FACTORY_DEFAULTS: Dict[str, Any] = {
+    name: parameter.default
+    for name, parameter in inspect.signature(OCRServiceFactory.create_ocr_service).parameters.items()
+    if name not in ("service_name", "lang") and parameter.default is not inspect.Parameter.empty
+}
+
+
+class _RegistryEntry:
+    """Holds one OCR service together with its checkout bookkeeping."""
+
+    def __init__(self):
+        self.create_lock = threading.Lock()
+        self.service: Optional[OCRServiceInterface] = None
+        self.checkouts = 0
+        self.evicted = False
+
+
+class OCRServiceRegistry:
+    """
+    Process-wide registry of long-lived OCR services.
+
+    Services are keyed by (engine, lang, options) and created lazily on first
+    checkout, so only the first request of a worker pays for model loading.
+    Every gunicorn/uvicorn worker process holds its own registry instance.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[RegistryKey, _RegistryEntry] = {}
+
+    @staticmethod
+    def make_key(service_name: str, lang: str = "en", **options: Any) -> RegistryKey:
+        """
+        Build the registry key for an OCR service configuration.
+
+        Options left at the factory defaults are dropped, so passing them
+        explicitly checks out the same service as omitting them.
+
+        Args:
+            service_name (str): Name of the OCR service
+            lang (str): Language the engine is loaded for
+            **options: Extra options passed to the OCR service factory
+
+        Returns:
+            RegistryKey: Hashable key identifying the configuration
+        """
+        options = {
+            name: value for name, value in options.items()
+            if name not in _FACTORY_DEFAULTS or value != _FACTORY_DEFAULTS[name]
+        }
+        return service_name.lower(), lang, tuple(sorted(options.items()))
+
+    def _get_entry(self, key: RegistryKey) -> _RegistryEntry:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _RegistryEntry()
+                self._entries[key] = entry
+            entry.checkouts += 1
+            return entry
+
+    def _release_entry(self, key: RegistryKey, entry: _RegistryEntry) -> None:
+        with self._lock:
+            entry.checkouts -= 1
+            should_close = entry.evicted and entry.checkouts == 0
+        if should_close:
+            self._close_entry(key, entry)
+
+    def _ensure_service(self, key: RegistryKey, entry: _RegistryEntry) -> OCRServiceInterface:
+        if entry.service is None:
+            with entry.create_lock:
+                if entry.service is None:
+                    service_name, lang, options = key
+                    logger.info(f"Loading OCR service '{service_name}' (lang={lang}) into registry")
+                    entry.service = OCRServiceFactory.create_ocr_service(
+                        service_name=service_name,
+                        lang=lang,
+                        **dict(options)
+                    )
+        return entry.service
+
+    @staticmethod
+    def _close_entry(key: RegistryKey, entry: _RegistryEntry) -> None:
+        service, entry.service = entry.service, None
+        if service is None:
+            return
+        try:
+            service.close()
+            logger.info(f"Closed OCR service '{key[0]}' (lang={key[1]})")
+        except Exception as e:
+            logger.error(f"Failed to close OCR service '{key[0]}': {str(e)}")
+
+    @contextmanager
+    def checkout(self, service_name: str, lang: str = "en", **options: Any) -> Iterator[OCRServiceInterface]:
+        """
+        Check out a shared OCR service, creating it on first use.
+
+        The service is not closed while it is checked out, even if it is
+        evicted in the meantime; the close is deferred until the last
+        checkout is returned.
+
+        Args:
+            service_name (str): Name of the OCR service
+            lang (str): Language the engine is loaded for
+            **options: Extra options passed to the OCR service factory
+
+        Yields:
+            OCRServiceInterface: The shared OCR service instance
+        """
+        key = self.make_key(service_name, lang, **options)
+        entry = self._get_entry(key)
+        try:
+            yield self._ensure_service(key, entry)
+        finally:
+            self._release_entry(key, entry)
+
+    def warm_up(self, service_name: str, lang: str = "en", **options: Any) -> None:
+        """
+        Create an OCR service ahead of the first request.
+
+        Args:
+            service_name (str): Name of the OCR service
+            lang (str): Language the engine is loaded for
+            **options: Extra options passed to the OCR service factory
+        """
+        with self.checkout(service_name, lang, **options):
+            pass
+
+    def evict(self, service_name: str, lang: str = "en", **options: Any) -> bool:
+        """
+        Remove an OCR service from the registry and close it.
+
+        Args:
+            service_name (str): Name of the OCR service
+            lang (str): Language the engine is loaded for
+            **options: Extra options passed to the OCR service factory
+
+        Returns:
+            bool: True if a service was registered under the given key
+        """
+        key = self.make_key(service_name, lang, **options)
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return False
+            entry.evicted = True
+            should_close = entry.checkouts == 0
+        if should_close:
+            self._close_entry(key, entry)
+        return True
+
+    def close(self) -> None:
+        """Evict and close every registered OCR service."""
+        with self._lock:
+            keys = list(self._entries.keys())
+        for service_name, lang, options in keys:
+            self.evict(service_name, lang, **dict(options))
+
+    def keys(self) -> List[RegistryKey]:
+        """Return the keys of the currently registered OCR services."""
+        with self._lock:
+            return list(self._entries.keys())
+
+
+ocr_service_registry = OCRServiceRegistry()
@@ -0,0 +1,59 @@
+import logging
+from typing import Optional
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.config import config
+from app.core.constants import RetrieverBackend
+from app.core.document_index_store import DocumentIndexStore, document_index_store
+from app.interfaces.retriever_interface import RetrieverInterface
+from app.services.chroma_retriever import ChromaRetriever
+from app.services.numpy_retriever import NumpyRetriever
+
+logger = logging.getLogger(__name__)
+
+class RetrieverFactory:
+    """
+    Factory class for creating the retriever of a document.
+    Allows easy addition of new retriever backends.
+    """
+
+    @staticmethod
+    def create_retriever(
+        text: str,
+        embeddings: Embeddings,
+        model_name: str,
+        backend: Optional[str] = None,
+        index_store: DocumentIndexStore = document_index_store
+    ) -> RetrieverInterface:
+        """
+        Create a retriever over a document's chunks. Blocking; run it on the native thread pool.
+
+        With the "auto" backend, documents of at most NUMPY_RETRIEVER_MAX_CHUNKS
+        chunks are searched in-process with NumPy; larger ones get a persistent
+        Chroma index.
+
+        Args:
+            text (str): The extracted document text
+            embeddings (Embeddings): The embedding model
+            model_name (str): Name of the embedding model
+            backend (Optional[str]): Retriever backend. Defaults to RETRIEVER_BACKEND.
+            index_store (DocumentIndexStore): Store holding the Chroma indexes
+
+        Returns:
+            RetrieverInterface: A retriever over the document
+        """
+        backend = (backend or config.retriever_backend).lower()
+
+        if backend in (RetrieverBackend.AUTO, RetrieverBackend.NUMPY):
+            chunks = index_store.split_text(text)
+            if backend == RetrieverBackend.NUMPY or len(chunks) <= config.numpy_retriever_max_chunks:
+                logger.info(f"Creating NumPy retriever over {len(chunks)} chunks")
+                return NumpyRetriever(chunks, embeddings)
+            backend = RetrieverBackend.CHROMA
+
+        if backend == RetrieverBackend.CHROMA:
+            logger.info("Creating Chroma retriever")
+            return ChromaRetriever(index_store.get_or_create(text, embeddings, model_name))
+
+        raise ValueError(f"Unsupported retriever backend: {backend}")
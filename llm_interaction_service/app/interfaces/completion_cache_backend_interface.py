@@ -0,0 +1,35 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+class CompletionCacheBackendInterface(ABC):
+    """Interface for LLM completion cache storage backends (in-process, SQLite, etc.)"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up a cached completion.
+
+        Args:
+            key (str): Cache key of the completion
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: The cached response chunks, or None if missing or expired
+        """
+        pass
+
+    @abstractmethod
+    def set(self, key: str, chunks: List[Dict[str, Any]], ttl_seconds: Optional[int] = None) -> None:
+        """
+        Store a completion.
+
+        Args:
+            key (str): Cache key of the completion
+            chunks (List[Dict[str, Any]]): The response chunks, JSON serializable
+            ttl_seconds (Optional[int]): Lifetime of the entry. None keeps it until evicted.
+        """
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove every cached completion."""
+        pass
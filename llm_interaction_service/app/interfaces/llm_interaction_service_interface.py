@@ -23,3 +23,15 @@ class LlmInteractionServiceInterface(ABC):
             dict: Response from the LLM service.
         """
         pass
+
+    def generation_params(self) -> Dict[str, Any]:
+        """
+        Return the sampling parameters this service sends with every completion.
+
+        Used to key the completion cache; completions are only cached when the
+        temperature is 0. Services relying on provider defaults return an empty dict.
+
+        Returns:
+            Dict[str, Any]: Generation parameters
+        """
+        return {}
@@ -1,20 +1,39 @@
+import logging
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
-from fastapi import UploadFile
+from typing import AsyncIterator, Callable, List, Dict, Any, Optional
+from fastapi import HTTPException, UploadFile
+from app.core.config import config
+from app.core.ocr_process_pool import ocr_pages_in_process_pool
+from app.core.page_image import PageImage
+from app.core.page_pipeline import prefetch_batches
+
+logger = logging.getLogger(__name__)
 
 class OCRServiceInterface(ABC):
     """
     Abstract base class defining the interface for OCR services.
     This allows for easy swapping of OCR implementations.
+
+    Reading several pages, streamed or not, is implemented here on top of
+    _ocr_pages. Engines that can OCR several pages at once override
+    _max_batch and _ocr_pages.
     """
 
+    # Engine the CPU process pool workers load for this service, with the
+    # language it is loaded for; engine_options holds its factory options
+    SERVICE_NAME: str = ""
+    lang: str = "en"
+    engine_options: Dict[str, Any] = {}
+    # How log and error messages name the engine
+    ENGINE_NAME = "OCR"
+
     @abstractmethod
-    async def extract_text_from_image(self, image_bytes: bytes, lang: str = "eng") -> str:
+    async def extract_text_from_image(self, image_bytes: PageImage, lang: str = "eng") -> str:
         """
         Extract text from a single image.
 
         Args:
-            image_bytes (bytes): The image as bytes
+            image_bytes (PageImage): The image as an ndarray or encoded bytes
             lang (str): Language code for OCR (default: 'eng')
 
         Returns:
@@ -23,18 +42,146 @@ class OCRServiceInterface(ABC):
         pass
 
     @abstractmethod
-    async def extract_text_from_multiple_images(self, image_bytes_list: List[bytes], lang: str = "eng") -> str:
+    def extract_text_from_image_sync(self, image_bytes: PageImage, lang: str = "eng") -> str:
+        """
+        Blocking variant of extract_text_from_image, run on executor threads and OCR worker processes.
+
+        Args:
+            image_bytes (PageImage): The image as an ndarray, encoded bytes or any bytes-like buffer
+            lang (str): Language code for OCR (default: 'eng')
+
+        Returns:
+            str: Extracted text
+        """
+        pass
+
+    async def extract_text_from_multiple_images(
+            self,
+            image_bytes_list: List[PageImage],
+            lang: str = "eng",
+            parallel: Optional[bool] = None
+    ) -> str:
         """
         Extract text from multiple images and combine the results.
 
         Args:
-            image_bytes_list (List[bytes]): List of images as bytes
+            image_bytes_list (List[PageImage]): List of images as ndarrays or encoded bytes
             lang (str): Language code for OCR (default: 'eng')
+            parallel (Optional[bool]): OCR pages on the CPU process pool.
+                Defaults to the OCR_PARALLEL_PAGES setting.
 
         Returns:
             str: Combined extracted text
         """
-        pass
+        if not image_bytes_list:
+            return ""
+
+        if parallel is None:
+            parallel = config.ocr_parallel_pages
+
+        texts = await self._ocr_pages(image_bytes_list, lang, parallel)
+        return "\n\n".join(texts)
+
+    async def extract_text_from_image_stream(
+            self,
+            image_stream: AsyncIterator[PageImage],
+            lang: str = "eng",
+            parallel: Optional[bool] = None
+    ) -> str:
+        """
+        Extract text from a stream of images while the stream is still being produced.
+
+        Pages are pulled through a bounded queue (PAGE_PIPELINE_QUEUE_SIZE), so
+        producing the next pages overlaps with OCR of the current ones.
+
+        Args:
+            image_stream (AsyncIterator[PageImage]): Images as ndarrays or encoded bytes, in page order
+            lang (str): Language code for OCR (default: 'eng')
+            parallel (Optional[bool]): OCR pages on the CPU process pool.
+                Defaults to the OCR_PARALLEL_PAGES setting.
+
+        Returns:
+            str: Combined extracted text
+        """
+        texts = await self.extract_page_texts_from_image_stream(image_stream, lang, parallel)
+        return "\n\n".join(texts)
+
+    async def extract_page_texts_from_image_stream(
+            self,
+            image_stream: AsyncIterator[PageImage],
+            lang: str = "eng",
+            parallel: Optional[bool] = None,
+            on_page_done: Optional[Callable[[int, str], None]] = None
+    ) -> List[str]:
+        """
+        Like extract_text_from_image_stream, but keep the text of each page separate.
+
+        Pages that are already waiting in the queue are OCR'd together, up to
+        _max_batch pages, so the batched and parallel paths still apply
+        without waiting for a full batch.
+
+        Args:
+            image_stream (AsyncIterator[PageImage]): Images as ndarrays or encoded bytes, in page order
+            lang (str): Language code for OCR (default: 'eng')
+            parallel (Optional[bool]): OCR pages on the CPU process pool.
+                Defaults to the OCR_PARALLEL_PAGES setting.
+            on_page_done (Optional[Callable[[int, str], None]]): Called with the zero-based
+                index and text of each page as soon as it is OCR'd.
+
+        Returns:
+            List[str]: Extracted text of each page, in page order
+        """
+        if parallel is None:
+            parallel = config.ocr_parallel_pages
+
+        max_batch = self._max_batch(parallel)
+        maxsize = max(config.page_pipeline_queue_size, max_batch)
+
+        texts = []
+        async for batch in prefetch_batches(image_stream, maxsize, max_batch):
+            batch_texts = await self._ocr_pages(batch, lang, parallel, first_page=len(texts))
+            if on_page_done is not None:
+                for i, text in enumerate(batch_texts, start=len(texts)):
+                    on_page_done(i, text)
+            texts.extend(batch_texts)
+
+        return texts
+
+    def _max_batch(self, parallel: bool) -> int:
+        """Number of streamed pages handed to _ocr_pages at once."""
+        return config.cpu_process_pool_size if parallel else 1
+
+    async def _ocr_pages(self, image_bytes_list: List[PageImage], lang: str, parallel: bool, first_page: int = 0) -> List[str]:
+        """
+        OCR a list of pages, on the CPU process pool when parallel is set, otherwise one by one.
+
+        Args:
+            image_bytes_list (List[PageImage]): The pages as ndarrays or encoded bytes
+            lang (str): Language code for OCR
+            parallel (bool): OCR the pages on the CPU process pool
+            first_page (int): Zero-based index of the first page, for logging
+
+        Returns:
+            List[str]: Extracted text of each page, in page order
+        """
+        if parallel and len(image_bytes_list) > 1:
+            logger.info(f"Processing {len(image_bytes_list)} images on the CPU process pool with {self.ENGINE_NAME}")
+            try:
+                return await ocr_pages_in_process_pool(
+                    self.SERVICE_NAME, self.lang, self.engine_options, image_bytes_list, lang
+                )
+            except Exception as e:
+                logger.error(f"Failed to extract text from images in parallel: {str(e)}")
+                raise HTTPException(status_code=500, detail=f"Error extracting text with {self.ENGINE_NAME}: {str(e)}")
+
+        texts = []
+
+        for i, img_bytes in enumerate(image_bytes_list, start=first_page):
+            logger.info(f"Processing image {i+1} with {self.ENGINE_NAME}")
+            text = await self.extract_text_from_image(img_bytes, lang)
+            texts.append(text)
+
+        return texts
 
     @abstractmethod
     async def process_image_file(self, file: UploadFile, lang: str = "eng") -> str:
@@ -51,15 +198,23 @@ class OCRServiceInterface(ABC):
         pass
 
     @abstractmethod
-    async def extract_text_with_confidence(self, image_bytes: bytes, lang: str = "eng") -> Dict[str, Any]:
+    async def extract_text_with_confidence(self, image_bytes: PageImage, lang: str = "eng") -> Dict[str, Any]:
         """
         Extract text from an image with confidence scores.
 
         Args:
-            image_bytes (bytes): The image as bytes
+            image_bytes (PageImage): The image as an ndarray or encoded bytes
             lang (str): Language code for OCR (default: 'eng')
 
         Returns:
             Dict[str, Any]: Extracted text with confidence data
         """
-        pass
\ No newline at end of file
+        pass
+
+    def close(self) -> None:
+        """
+        Release the resources held by the OCR engine.
+
+        Implementations holding loaded models should override this.
+        """
+        pass
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from fastapi import UploadFile
-from typing import Dict, Any
+from typing import AsyncIterator, Dict, Any
+from app.core.upload_spool import PDFInput
 
 class ParseFileServiceInterface(ABC):
     """Interface for processing file parsing requests."""
@@ -28,3 +29,29 @@ class ParseFileServiceInterface(ABC):
             Dict[str, Any]: The processed file data.
         """
         pass
+
+    @abstractmethod
+    async def process_stream(
+            self,
+            model: str,
+            pdf: PDFInput,
+            processing_type: str,
+            prompt: str = None,
+            ai_service: str = "ollama_local",
+            ocr_technology: str = "paddle"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process file like process, streaming progress and LLM tokens as they happen.
+
+        Args:
+            model (str): The model to use.
+            pdf (PDFInput): The file to process, in memory or spooled to disk.
+            processing_type (str): Type of processing ("parse" or "prompt").
+            prompt (str, optional): Custom prompt for LLM. Required for "prompt" type.
+            ai_service (str): AI service to use ("ollama_local" or "groq_cloud").
+            ocr_technology (str): OCR engine for pages without a text layer.
+
+        Yields:
+            Dict[str, Any]: Events with an "event" name and their "data".
+        """
+        pass
@@ -1,6 +1,15 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+import fitz
 from fastapi import UploadFile
+from app.core.page_image import PageImage
+
+# A PDF is passed either as raw bytes or as an already opened document, so
+# callers that also read the text layer don't parse the file twice
+PDFSource = Union[bytes, fitz.Document]
+
+# Area of a page to render, as (x0, y0, x1, y1) in points
+PageClip = Tuple[float, float, float, float]
 
 class PDFToImageServiceInterface(ABC):
     """
@@ -9,21 +18,67 @@ class PDFToImageServiceInterface(ABC):
     """
 
     @abstractmethod
-    async def convert_pdf_to_images(self, pdf_bytes: bytes, enhance: bool = True) -> List[bytes]:
+    async def convert_pdf_to_images(
+            self,
+            pdf_bytes: PDFSource,
+            enhance: bool = True,
+            page_numbers: Optional[List[int]] = None,
+            clips: Optional[List[Optional[PageClip]]] = None
+    ) -> List[PageImage]:
+        """
+        Convert PDF to a list of page images.
+
+        Args:
+            pdf_bytes (PDFSource): The PDF file as bytes or as an open document
+            enhance (bool): Whether to enhance the image quality
+            page_numbers (Optional[List[int]]): Zero-based pages to convert. Defaults to all pages.
+            clips (Optional[List[Optional[PageClip]]]): Area to render of each page, None for the whole page
+
+        Returns:
+            List[PageImage]: Image of each page, as an in-memory ndarray
+        """
+        pass
+
+    @abstractmethod
+    def iter_pdf_pages(
+            self,
+            pdf_bytes: PDFSource,
+            enhance: bool = True,
+            page_numbers: Optional[List[int]] = None,
+            clips: Optional[List[Optional[PageClip]]] = None
+    ) -> AsyncIterator[PageImage]:
         """
-        Convert PDF to a list of image bytes.
+        Convert PDF to images page by page, yielding each page as soon as it is ready.
 
         Args:
-            pdf_bytes (bytes): The PDF file as bytes
+            pdf_bytes (PDFSource): The PDF file as bytes or as an open document
             enhance (bool): Whether to enhance the image quality
+            page_numbers (Optional[List[int]]): Zero-based pages to convert. Defaults to all pages.
+            clips (Optional[List[Optional[PageClip]]]): Area to render of each page, None for the whole page
+
+        Yields:
+            PageImage: Image of the next page, as an in-memory ndarray
+        """
+        pass
+
+    @abstractmethod
+    async def analyze_pages(self, pdf_bytes: PDFSource, page_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Find blank pages and the content area of the others from low resolution previews.
+
+        Args:
+            pdf_bytes (PDFSource): The PDF file as bytes or as an open document
+            page_numbers (Optional[List[int]]): Zero-based pages to analyze. Defaults to all pages.
 
         Returns:
-            List[bytes]: List of bytes for each page image
+            List[Dict[str, Any]]: Per page, its "page" number (one-based), whether it is "blank",
+                its "ink_ratio" and the "crop" (PageClip) around its content, or None if
+                cropping would save little
         """
         pass
 
     @abstractmethod
-    async def process_pdf_file(self, file: UploadFile, enhance: bool = True) -> List[bytes]:
+    async def process_pdf_file(self, file: UploadFile, enhance: bool = True) -> List[PageImage]:
         """
         Process a PDF file uploaded through FastAPI.
 
@@ -32,6 +87,6 @@ class PDFToImageServiceInterface(ABC):
             enhance (bool): Whether to enhance the image quality
 
         Returns:
-            List[bytes]: List of bytes for each page image
+            List[PageImage]: Image of each page, as an in-memory ndarray
         """
         pass
\ No newline at end of file
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+class RetrieverInterface(ABC):
+    """Interface for document chunk retrievers used by the RAG path (NumPy, Chroma, etc.)"""
+
+    @abstractmethod
+    def similarity_search(self, query: str, k: int = 5) -> List[str]:
+        """
+        Return the chunks most similar to a query.
+
+        Args:
+            query (str): The user prompt
+            k (int): Number of chunks to return
+
+        Returns:
+            List[str]: Chunk texts, most similar first
+        """
+        pass
@@ -0,0 +1,51 @@
+"""
+Standalone job worker process.
+
+Runs JOB_WORKER_CONCURRENCY pipeline workers against the job queue in
+JOB_QUEUE_DIR, outside of the API's HTTP workers:
+
+    python -m app.job_worker
+
+This is how jobs submitted to the API get processed: the API only runs
+workers itself when JOB_WORKERS_IN_API is set. The worker must see the
+same JOB_QUEUE_DIR as the API, e.g. through a shared volume.
+"""
+import asyncio
+import logging
+import signal
+
+from app.core.app_logger import setup_logging
+from app.core.config import config
+from app.core.executors import shutdown_executors
+from app.core.http_clients import close_http_clients
+from app.core.job_queue import job_queue
+from app.core.job_workers import JobWorkerPool
+from app.factories.ocr_service_registry import ocr_service_registry
+
+
+async def main() -> None:
+    setup_logging()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    pool = JobWorkerPool(
+        job_queue,
+        concurrency=config.job_worker_concurrency,
+        retention_seconds=config.job_retention_seconds
+    )
+    pool.start()
+    try:
+        await stop.wait()
+    finally:
+        logging.info("Stopping job workers...")
+        await pool.stop()
+        await close_http_clients()
+        shutdown_executors()
+        ocr_service_registry.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that only embeds texts it hasn't seen before.
+
+    Vectors are keyed by model name and text hash and kept in a bounded
+    in-memory LRU, optionally persisted to a SQLite file shared by every
+    worker process on the host. The file is bounded too: vectors unused for
+    longer than the TTL, or beyond its maximum count (least recently used
+    first), are deleted whenever new vectors are stored.
+    """
+
+    def __init__(
+            self,
+            embeddings: Embeddings,
+            model_name: str,
+            max_entries: int = 50000,
+            sqlite_path: Optional[str] = None,
+            sqlite_max_entries: int = 200000,
+            sqlite_ttl_seconds: Optional[int] = None
+    ):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            embeddings (Embeddings): The embedding model to wrap
+            model_name (str): Name of the model, part of the cache key
+            max_entries (int): Vectors kept in memory before the least recently used one is evicted
+            sqlite_path (Optional[str]): SQLite file persisting the vectors. None keeps them in memory only.
+            sqlite_max_entries (int): Vectors kept in the SQLite file before the least recently used are deleted
+            sqlite_ttl_seconds (Optional[int]): Delete vectors from the SQLite file once unused for this long.
+                None keeps them until evicted.
+        """
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.sqlite_path = sqlite_path
+        self.sqlite_max_entries = sqlite_max_entries
+        self.sqlite_ttl_seconds = sqlite_ttl_seconds
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0}
+
+        if self.sqlite_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.sqlite_path)), exist_ok=True)
+            with closing(self._connect()) as conn, conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS embeddings (
+                        key TEXT PRIMARY KEY,
+                        vector BLOB NOT NULL,
+                        accessed_at REAL NOT NULL DEFAULT 0
+                    )
+                    """
+                )
+                # Files written before vectors were evicted lack the access time
+                columns = [row[1] for row in conn.execute("PRAGMA table_info(embeddings)")]
+                if "accessed_at" not in columns:
+                    conn.execute("ALTER TABLE embeddings ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed_at ON embeddings (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.sqlite_path, timeout=30)
+
+    def _key(self, kind: str, text: str) -> str:
+        # Some models embed queries and documents differently, so they don't share entries
+        return hashlib.sha256(f"{self.model_name}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.sqlite_path:
+            now = time.time()
+            with closing(self._connect()) as conn, conn:
+                for start in range(0, len(missing), 500):
+                    batch = missing[start:start + 500]
+                    placeholders = ','.join('?' * len(batch))
+                    rows = conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                    ).fetchall()
+                    for key, blob in rows:
+                        found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+                    if rows:
+                        conn.execute(
+                            f"UPDATE embeddings SET accessed_at = ? WHERE key IN ({placeholders})", [now, *batch]
+                        )
+            with self._lock:
+                for key in missing:
+                    if key in found:
+                        self._remember(key, found[key])
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]) -> None:
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+
+        if self.sqlite_path:
+            now = time.time()
+            with closing(self._connect()) as conn, conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                    [(key, np.asarray(vector, dtype=np.float32).tobytes(), now) for key, vector in vectors.items()]
+                )
+                if self.sqlite_ttl_seconds:
+                    conn.execute("DELETE FROM embeddings WHERE accessed_at <= ?", (now - self.sqlite_ttl_seconds,))
+                conn.execute(
+                    """
+                    DELETE FROM embeddings WHERE key IN (
+                        SELECT key FROM embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.sqlite_max_entries,)
+                )
+
+    def _remember(self, key: str, vector: List[float]) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self._key("document", text) for text in texts]
+        found = self._lookup(keys)
+
+        # Embed each missing text once, even if it appears several times
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        with self._lock:
+            self._stats["hits"] += len(texts) - len(missing)
+            self._stats["misses"] += len(missing)
+
+        if missing:
+            logger.info(f"Embedding {len(missing)} of {len(texts)} texts, the rest are cached")
+            vectors = self.embeddings.embed_documents(list(missing.values()))
+            computed = dict(zip(missing.keys(), vectors))
+            self._store(computed)
+            found.update(computed)
+
+        return [found[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        key = self._key("query", text)
+        found = self._lookup([key])
+        if key in found:
+            with self._lock:
+                self._stats["hits"] += 1
+            return found[key]
+
+        with self._lock:
+            self._stats["misses"] += 1
+        vector = self.embeddings.embed_query(text)
+        self._store({key: vector})
+        return vector
+
+    def stats(self) -> Dict[str, int]:
+        """Return the hit/miss counters of this worker."""
+        with self._lock:
+            return dict(self._stats, memory_entries=len(self._memory))
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import logging
+from typing import AsyncGenerator, Callable, Dict, Any, List, Optional
+from app.core.executors import run_io
+from app.interfaces.completion_cache_backend_interface import CompletionCacheBackendInterface
+from app.interfaces.llm_interaction_service_interface import LlmInteractionServiceInterface
+
+logger = logging.getLogger(__name__)
+
+class CachedLlmInteractionService(LlmInteractionServiceInterface):
+    """
+    Serves repeated deterministic completions of another LLM service from a cache.
+
+    Only services generating with temperature 0 are cached, since their
+    completion is fully determined by the model, prompt and parameters.
+    Completions the caller can't use (e.g. malformed JSON) are rejected by
+    the validate callback and never cached, so a retry asks the LLM again.
+    """
+
+    def __init__(
+            self,
+            service: LlmInteractionServiceInterface,
+            backend: CompletionCacheBackendInterface,
+            provider: str,
+            ttl_seconds: Optional[int] = None,
+            validate: Optional[Callable[[List[Dict[str, Any]]], bool]] = None
+    ):
+        """
+        Initialize the caching wrapper.
+
+        Args:
+            service (LlmInteractionServiceInterface): The LLM service to wrap
+            backend (CompletionCacheBackendInterface): Where completions are stored
+            provider (str): Name of the AI service, part of the cache key
+            ttl_seconds (Optional[int]): Lifetime of cached completions
+            validate (Optional[Callable[[List[Dict[str, Any]]], bool]]): Called with the chunks of a
+                complete response; only responses it accepts are cached. None caches every response.
+        """
+        self.service = service
+        self.backend = backend
+        self.provider = provider
+        self.ttl_seconds = ttl_seconds
+        self.validate = validate
+
+    def generation_params(self) -> Dict[str, Any]:
+        return self.service.generation_params()
+
+    def is_cacheable(self) -> bool:
+        """Whether completions of the wrapped service are deterministic."""
+        return self.generation_params().get("temperature") == 0
+
+    def make_key(self, model: str, prompt: Dict[str, str], stream: bool) -> str:
+        """
+        Build the cache key of a completion.
+
+        Whitespace in the prompt is normalized, so prompts that differ only in
+        indentation share an entry.
+
+        Args:
+            model (str): The model to use.
+            prompt (Dict[str, str]): The input prompt.
+            stream (bool): Whether the response is streamed.
+
+        Returns:
+            str: Hex digest identifying the completion
+        """
+        normalized_prompt = {role: " ".join(text.split()) for role, text in prompt.items()}
+        prompt_hash = hashlib.sha256(json.dumps(normalized_prompt, sort_keys=True).encode("utf-8")).hexdigest()
+        key = {
+            "provider": self.provider.lower(),
+            "model": model,
+            "prompt": prompt_hash,
+            "params": self.generation_params(),
+            "stream": stream,
+        }
+        return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    async def generate_completion(
+            self,
+            model: str,
+            prompt: Dict[str, str],
+            stream: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Generate text completion, replaying it from the cache when possible.
+
+        Args:
+            model (str): The model to use.
+            prompt (Dict[str, str]): The input prompt.
+            stream (bool): If True, stream responses.
+
+        Yields:
+            dict: Response from the LLM service.
+        """
+        if not self.is_cacheable():
+            async for chunk in self.service.generate_completion(model=model, prompt=prompt, stream=stream):
+                yield chunk
+            return
+
+        key = self.make_key(model, prompt, stream)
+        try:
+            cached = await run_io(self.backend.get, key)
+        except Exception as e:
+            logger.error(f"Failed to read LLM completion cache: {str(e)}")
+            cached = None
+
+        if cached is not None:
+            logger.info(f"LLM completion cache hit for {self.provider}/{model}")
+            for chunk in cached:
+                yield chunk
+            return
+
+        chunks = []
+        async for chunk in self.service.generate_completion(model=model, prompt=prompt, stream=stream):
+            chunks.append(chunk)
+            yield chunk
+
+        # Only reached when the completion was consumed in full
+        if self.validate is not None and not self.validate(chunks):
+            logger.warning(f"Not caching invalid completion from {self.provider}/{model}")
+            return
+
+        try:
+            await run_io(self.backend.set, key, chunks, self.ttl_seconds)
+        except Exception as e:
+            logger.error(f"Failed to write LLM completion cache: {str(e)}")
@@ -0,0 +1,212 @@
+import logging
+from typing import List, Dict, Any, Tuple
+from fastapi import HTTPException, UploadFile
+from app.core.config import config
+from app.core.constants import OCRService
+from app.core.executors import run_native
+from app.core.page_image import PageImage, to_array
+from app.interfaces.ocr_service_interface import OCRServiceInterface
+
+logger = logging.getLogger(__name__)
+
+# Tesseract reports word confidences from 0 to 100
+TESSERACT_CONFIDENCE_SCALE = 100.0
+
+
+class CascadeOCRService(OCRServiceInterface):
+    """
+    Service that OCRs pages with Tesseract first and PaddleOCR only where Tesseract is unsure.
+
+    Each page is read by Tesseract, which reports a confidence per word. Lines
+    whose confidence is below OCR_CASCADE_MIN_CONFIDENCE are cropped out and
+    read again by PaddleOCR in one batch, and their text and confidence replace
+    Tesseract's. When most of a page is unsure, the whole page goes to
+    PaddleOCR instead.
+    Both engines are checked out of the OCR service registry, so the cascade
+    shares their warm models with the rest of the worker.
+    """
+
+    SERVICE_NAME = OCRService.CASCADE
+    ENGINE_NAME = "the OCR cascade"
+
+    def __init__(self, lang: str = "en", use_gpu: bool = False):
+        """
+        Initialize the cascade OCR service.
+
+        Args:
+            lang (str): Language code the PaddleOCR engine is loaded for (default: 'en')
+            use_gpu (bool): Whether PaddleOCR uses the GPU if available (default: False)
+        """
+        self.lang = lang
+        self.engine_options = {"use_gpu": use_gpu}
+
+    @staticmethod
+    def _group_lines(blocks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Group Tesseract's words into lines, in reading order, with their box and lowest confidence."""
+        lines: Dict[Tuple[int, int, int], Dict[str, Any]] = {}
+        for block in blocks:
+            key = (block["block_num"], block["par_num"], block["line_num"])
+            line = lines.get(key)
+            left, top = block["left"], block["top"]
+            right, bottom = left + block["width"], top + block["height"]
+            confidence = float(block["confidence"]) / TESSERACT_CONFIDENCE_SCALE
+            if line is None:
+                lines[key] = {
+                    "block_num": block["block_num"],
+                    "words": [block["text"]],
+                    "box": [left, top, right, bottom],
+                    "confidence": confidence,
+                }
+                continue
+            line["words"].append(block["text"])
+            box = line["box"]
+            line["box"] = [min(box[0], left), min(box[1], top), max(box[2], right), max(box[3], bottom)]
+            line["confidence"] = min(line["confidence"], confidence)
+        return list(lines.values())
+
+    @staticmethod
+    def _join_lines(lines: List[Dict[str, Any]]) -> str:
+        """Rebuild page text from lines, separating Tesseract blocks by a blank line."""
+        parts = []
+        previous_block = None
+        for line in lines:
+            if previous_block is not None and line["block_num"] != previous_block:
+                parts.append("")
+            parts.append(line["text"])
+            previous_block = line["block_num"]
+        return "\n".join(parts).strip()
+
+    def extract_text_with_confidence_sync(self, image_bytes: PageImage, lang: str = "eng") -> Dict[str, Any]:
+        """
+        Blocking variant of extract_text_with_confidence.
+
+        Returns:
+            Dict[str, Any]: The merged "text", its "avg_confidence" (0 to 1) over the lines as finally
+                read, its "blocks" (one per line, with the "engine" that read it and its confidence)
+                and the number of "reocr_lines"
+        """
+        # Imported here, the registry creates this service through the factory
+        from app.factories.ocr_service_registry import ocr_service_registry
+
+        try:
+            page = to_array(image_bytes)
+
+            with ocr_service_registry.checkout(OCRService.TESSERACT) as tesseract:
+                fast = tesseract.extract_text_with_confidence_sync(page, lang)
+
+            lines = self._group_lines(fast["blocks"])
+            for line in lines:
+                line["text"] = " ".join(line["words"])
+                line["engine"] = OCRService.TESSERACT.value
+
+            unsure = [line for line in lines if line["confidence"] < config.ocr_cascade_min_confidence]
+            if not lines or len(unsure) > len(lines) * config.ocr_cascade_max_unsure_ratio:
+                # Too little of the page is trustworthy, read all of it with the accurate engine
+                logger.info(f"Cascade: {len(unsure)} of {len(lines)} lines unsure, reading the page with PaddleOCR")
+                with ocr_service_registry.checkout(OCRService.PADDLE, self.lang, **self.engine_options) as paddle:
+                    accurate = paddle.extract_text_with_confidence_sync(page)
+                return {
+                    "text": accurate["text"],
+                    "avg_confidence": accurate["avg_confidence"],
+                    "blocks": [dict(block, engine=OCRService.PADDLE.value) for block in accurate["blocks"]],
+                    "reocr_lines": len(lines),
+                }
+
+            if unsure:
+                logger.info(f"Cascade: re-reading {len(unsure)} of {len(lines)} lines with PaddleOCR")
+                padding = config.ocr_cascade_region_padding_px
+                height, width = page.shape[:2]
+                crops = []
+                for line in unsure:
+                    x0, y0, x1, y1 = line["box"]
+                    crops.append(page[
+                        max(y0 - padding, 0):min(y1 + padding, height),
+                        max(x0 - padding, 0):min(x1 + padding, width)
+                    ])
+                with ocr_service_registry.checkout(OCRService.PADDLE, self.lang, **self.engine_options) as paddle:
+                    rereads = paddle.extract_text_with_confidence_batched_sync(crops, orient=False)
+                for line, reread in zip(unsure, rereads):
+                    # Keep Tesseract's reading when PaddleOCR finds nothing in the crop
+                    if reread["text"]:
+                        line["text"] = " ".join(reread["text"].split())
+                        line["confidence"] = reread["avg_confidence"]
+                        line["engine"] = OCRService.PADDLE.value
+
+            blocks = [
+                {"text": line["text"], "confidence": line["confidence"], "engine": line["engine"], "box": line["box"]}
+                for line in lines
+            ]
+            return {
+                "text": self._join_lines(lines),
+                "avg_confidence": sum(line["confidence"] for line in lines) / len(lines),
+                "blocks": blocks,
+                "reocr_lines": len(unsure),
+            }
+
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to extract text with the OCR cascade: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error extracting text with the OCR cascade: {str(e)}")
+
+    async def extract_text_with_confidence(self, image_bytes: PageImage, lang: str = "eng") -> Dict[str, Any]:
+        """
+        Extract text from an image and include confidence scores.
+
+        Args:
+            image_bytes (PageImage): The image as an ndarray or encoded bytes
+            lang (str): Language code for Tesseract (default: 'eng')
+
+        Returns:
+            Dict[str, Any]: Extracted text with confidence data
+        """
+        return await run_native(self.extract_text_with_confidence_sync, image_bytes, lang)
+
+    async def extract_text_from_image(self, image_bytes: PageImage, lang: str = "eng") -> str:
+        """
+        Extract text from an image with the OCR cascade.
+
+        Args:
+            image_bytes (PageImage): The image as an ndarray or encoded bytes
+            lang (str): Language code for Tesseract (default: 'eng')
+
+        Returns:
+            str: Extracted text
+        """
+        return await run_native(self.extract_text_from_image_sync, image_bytes, lang)
+
+    def extract_text_from_image_sync(self, image_bytes: PageImage, lang: str = "eng") -> str:
+        """
+        Blocking variant of extract_text_from_image, run on executor threads and OCR worker processes.
+
+        Args:
+            image_bytes (PageImage): The image as an ndarray, encoded bytes or any bytes-like buffer
+            lang (str): Language code for Tesseract (default: 'eng')
+
+        Returns:
+            str: Extracted text
+        """
+        return self.extract_text_with_confidence_sync(image_bytes, lang)["text"]
+
+    async def process_image_file(self, file: UploadFile, lang: str = "eng") -> str:
+        """
+        Process an image file uploaded through FastAPI.
+
+        Args:
+            file (UploadFile): The uploaded image file
+            lang (str): Language code for Tesseract (default: 'eng')
+
+        Returns:
+            str: Extracted text
+        """
+        try:
+            image_bytes = await file.read()
+
+            if not image_bytes:
+                raise HTTPException(status_code=400, detail="Empty image file")
+
+            return await self.extract_text_from_image(image_bytes, lang)
+
+        except Exception as e:
+            logger.error(f"Failed to process image file: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error processing image file: {str(e)}")
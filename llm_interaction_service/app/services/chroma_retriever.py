@@ -0,0 +1,18 @@
+from typing import List
+
+from langchain_chroma import Chroma
+
+from app.interfaces.retriever_interface import RetrieverInterface
+
+class ChromaRetriever(RetrieverInterface):
+    """Similarity search over a document's persistent Chroma index."""
+
+    def __init__(self, vectorstore: Chroma):
+        """
+        Args:
+            vectorstore (Chroma): Vector store over the document's chunks
+        """
+        self.vectorstore = vectorstore
+
+    def similarity_search(self, query: str, k: int = 5) -> List[str]:
+        return [doc.page_content for doc in self.vectorstore.similarity_search(query, k=k)]
@@ -2,6 +2,7 @@ import os
 from typing import AsyncGenerator, Dict, Any
 from langchain_groq import ChatGroq
 from langchain_core.messages import AIMessage
+from app.core.http_clients import get_async_http_client
 from app.interfaces.llm_interaction_service_interface import LlmInteractionServiceInterface
 
 class GroqService(LlmInteractionServiceInterface):
@@ -19,6 +20,10 @@ class GroqService(LlmInteractionServiceInterface):
 
         os.environ["GROQ_API_KEY"] = self.api_key
         self.timeout = timeout
+        self.temperature = 0
+
+    def generation_params(self) -> Dict[str, Any]:
+        return {"temperature": self.temperature, "response_format": "json_mode"}
 
     async def generate_completion(
         self,
@@ -40,15 +45,27 @@ class GroqService(LlmInteractionServiceInterface):
         try:
             llm = ChatGroq(
                 model=model,
-                temperature=0,
-                max_retries=2
-            ).with_structured_output(method="json_mode", include_raw=True)
+                temperature=self.temperature,
+                max_retries=2,
+                request_timeout=self.timeout,
+                http_async_client=get_async_http_client("groq")
+            )
 
             # Split the prompt into system and user messages
-            response = llm.invoke([
+            messages = [
                 ("system", prompt['system']),
                 ("user", prompt['user'])
-            ])
+            ]
+
+            if stream:
+                # JSON mode without the structured output parser, which would hold back every token
+                async for chunk in llm.bind(response_format={"type": "json_object"}).astream(messages):
+                    if chunk.content:
+                        yield {"response": chunk.content}
+                return
+
+            llm = llm.with_structured_output(method="json_mode", include_raw=True)
+            response = await llm.ainvoke(messages)
 
             response_content = response['raw'].content if isinstance(response['raw'], AIMessage) else str(response)
 
@@ -0,0 +1,45 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from app.interfaces.completion_cache_backend_interface import CompletionCacheBackendInterface
+
+class InMemoryCompletionCacheBackend(CompletionCacheBackendInterface):
+    """Per-process LRU completion cache."""
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the in-memory backend.
+
+        Args:
+            max_entries (int): Entries kept before the least recently used one is evicted
+        """
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Optional[float], List[Dict[str, Any]]]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, chunks = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return chunks
+
+    def set(self, key: str, chunks: List[Dict[str, Any]], ttl_seconds: Optional[int] = None) -> None:
+        expires_at = time.time() + ttl_seconds if ttl_seconds else None
+        with self._lock:
+            self._entries[key] = (expires_at, list(chunks))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
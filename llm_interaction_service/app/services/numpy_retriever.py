@@ -0,0 +1,43 @@
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.interfaces.retriever_interface import RetrieverInterface
+
+class NumpyRetriever(RetrieverInterface):
+    """
+    In-process cosine similarity search over a contiguous float32 matrix.
+
+    Meant for small documents, where a vector database costs more than the
+    search itself.
+    """
+
+    def __init__(self, chunks: List[str], embeddings: Embeddings):
+        """
+        Embed the chunks of a document.
+
+        Args:
+            chunks (List[str]): Chunk texts
+            embeddings (Embeddings): The embedding model
+        """
+        self.chunks = chunks
+        self.embeddings = embeddings
+        self.matrix = self._normalize(np.asarray(embeddings.embed_documents(chunks), dtype=np.float32))
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return np.ascontiguousarray(vectors / np.maximum(norms, 1e-12), dtype=np.float32)
+
+    def similarity_search(self, query: str, k: int = 5) -> List[str]:
+        if not self.chunks:
+            return []
+
+        query_vector = self._normalize(np.asarray(self.embeddings.embed_query(query), dtype=np.float32))
+        scores = self.matrix @ query_vector
+
+        k = min(k, len(self.chunks))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self.chunks[i] for i in top]
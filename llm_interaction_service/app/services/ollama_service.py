@@ -1,11 +1,13 @@
-from langchain_ollama import OllamaLLM
+import json
+import httpx
 from typing import AsyncGenerator, Dict, Any
+from app.core.http_clients import get_async_http_client
 from app.interfaces.llm_interaction_service_interface import LlmInteractionServiceInterface
 
 class OllamaService(LlmInteractionServiceInterface):
     def __init__(self, base_url: str, timeout: int = 30):
         """
-        Initialize the OllamaService using Langchain's Ollama wrapper.
+        Initialize the OllamaService on top of Ollama's REST API.
 
         Args:
             base_url (str): The base URL for the Ollama API.
@@ -21,7 +23,7 @@ class OllamaService(LlmInteractionServiceInterface):
             stream: bool = False
     ) -> AsyncGenerator[Dict[str, Any], None]:
         """
-        Uses Langchain's Ollama wrapper to generate text.
+        Generate text with Ollama's /api/generate endpoint over the worker's shared connection pool.
 
         Args:
             model (str): The model to use.
@@ -29,19 +31,33 @@ class OllamaService(LlmInteractionServiceInterface):
             stream (bool): If True, stream responses.
 
         Yields:
-            dict: JSON response from Langchain's Ollama model.
+            dict: JSON response from Ollama's generate endpoint.
         """
         try:
-            client = OllamaLLM(model=model, base_url=self.base_url)
-
-            prompt = prompt['system'] + "\n" + prompt['user']
+            client = get_async_http_client("ollama")
+            payload = {
+                "model": model,
+                "prompt": prompt['system'] + "\n" + prompt['user'],
+                "stream": stream,
+            }
+            url = f"{self.base_url}/api/generate"
+            timeout = httpx.Timeout(self.timeout)
 
             if stream:
-                async for chunk in client.astream(prompt):
-                    yield {"response": chunk}
+                async with client.stream("POST", url, json=payload, timeout=timeout) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        chunk = json.loads(line)
+                        if chunk.get("error"):
+                            raise RuntimeError(chunk["error"])
+                        if chunk.get("response"):
+                            yield {"response": chunk["response"]}
             else:
-                response = client.invoke(prompt)
-                yield {"response": response}
+                response = await client.post(url, json=payload, timeout=timeout)
+                response.raise_for_status()
+                yield {"response": response.json()["response"]}
 
         except Exception as e:
             raise RuntimeError(f"Error in OllamaService: {str(e)}") from e
@@ -1,27 +1,35 @@
+import asyncio
 import json
 import re
 import logging
 import fitz
 from fastapi import UploadFile, HTTPException
-from typing import Dict, Any, List
-from langchain_chroma import Chroma
-from langchain_community.embeddings import SentenceTransformerEmbeddings
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
 from app.core.config import config
 from app.core.constants import ProcessingType
 from app.core.constants import AIService
 from app.core.constants import OCRService
 from app.core.constants import PDFToImageService
 from app.core.constants import ModelName
-from app.factories.ocr_service_factory import OCRServiceFactory
-from app.interfaces.ocr_service_interface import OCRServiceInterface
+from app.core.executors import run_io, run_native, run_pdf
+from app.core.extraction_cache import ExtractionCache, extraction_cache
+from app.core.invoice_merge import estimate_tokens, merge_invoice_parts, split_pages_by_token_budget
+from app.core.upload_spool import PDFInput, SpooledUpload, spool_upload
+from app.factories.embeddings_factory import EmbeddingsFactory
+from app.factories.ocr_service_registry import ocr_service_registry
 from app.factories.llm_interaction_service_factory import LlmInteractionServiceFactory
 from app.factories.pdf_to_image_service_factory import PDFToImageServiceFactory
+from app.factories.retriever_factory import RetrieverFactory
 from app.interfaces.parse_file_service_interface import ParseFileServiceInterface
+from app.interfaces.pdf_to_image_service_interface import PDFSource, PageClip
 
 logger = logging.getLogger(__name__)
 
 class ParseFileService(ParseFileServiceInterface):
+    # Whether rendered pages are enhanced before OCR. The OCR engines run
+    # their own preprocessing profile, so enhancing here would do it twice.
+    ENHANCE_PAGES = False
+
     def __init__(self, ollama_base_url: str = "http://llm_host_service:11434", groq_api_key: str = None):
         """
         Initialize the ParseFileService class
@@ -34,52 +42,281 @@ class ParseFileService(ParseFileServiceInterface):
         self.pdf_to_image_service = PDFToImageServiceFactory.create_pdf_to_image_service(
             service_name=PDFToImageService.PYMUPDF_OPENCV_PILLOW
         )
-        self._ocr_service = None
+        self._ocr_technology = OCRService.PADDLE
+        self._on_progress: Optional[Callable[[str, Dict[str, Any]], None]] = None
+        self._page_texts: Optional[List[str]] = None
+        self._pages: Optional[List[Dict[str, Any]]] = None
         self.ollama_base_url = ollama_base_url
         self.groq_api_key = groq_api_key
 
-    async def extract_text_from_pdf(self, pdf_bytes: bytes) -> str:
-        """Extract text from a PDF using PyMuPDF."""
-        try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            # TODO: DELETE
-            logger.info(f"ParseFileService - opened stream of bytes")
+    def _report_progress(self, stage: str, **data: Any) -> None:
+        """Tell the streaming caller, if any, that a pipeline stage finished."""
+        if self._on_progress is not None:
+            self._on_progress(stage, data)
+
+    @staticmethod
+    def _image_coverage(page: fitz.Page) -> float:
+        """Fraction of the page area covered by images."""
+        page_area = page.rect.get_area()
+        if not page_area:
+            return 0.0
+
+        covered = sum(
+            (fitz.Rect(info["bbox"]) & page.rect).get_area()
+            for info in page.get_image_info()
+        )
+        return min(covered / page_area, 1.0)
 
-            extracted_text = "\n".join([page.get_text("text") for page in doc])
-            extracted_text = extracted_text.strip()
+    def _classify_pages(self, doc: fitz.Document) -> List[Optional[str]]:
+        """
+        Read the text layer of every page and pick the pages that need OCR.
 
-            # TODO: DELETE
-            logger.info(f"ParseFileService - Length of extracted text: {len(extracted_text)}")
+        A page is OCR'd when its text layer is empty (scans, but also text drawn
+        as vector outlines or in fonts without a Unicode mapping), or shorter
+        than PDF_PAGE_MIN_TEXT_CHARS with images covering at least
+        PDF_PAGE_MIN_IMAGE_COVERAGE of it.
 
-            if len(extracted_text) < 50:
-                return "__SCANNED_DOCUMENT__"
+        Args:
+            doc (fitz.Document): The opened PDF
 
-            return extracted_text
-        except Exception as e:
-            logger.error(f"Failed to extract text from PDF")
-            raise HTTPException(status_code=500, detail="Error extracting text from PDF.")
+        Returns:
+            List[Optional[str]]: Per page, its text layer, or None if the page must be OCR'd
+        """
+        page_texts = []
+        for page in doc:
+            text = page.get_text("text").strip()
+            if not text or (
+                len(text) < config.pdf_page_min_text_chars
+                and self._image_coverage(page) >= config.pdf_page_min_image_coverage
+            ):
+                page_texts.append(None)
+            else:
+                page_texts.append(text)
+        return page_texts
+
+    def _extraction_settings(self) -> Dict[str, Any]:
+        """Settings the extracted text depends on, part of the extraction cache key."""
+        settings = {
+            "ocr_technology": self._ocr_technology.lower(),
+            "enhance": self.ENHANCE_PAGES,
+            "preprocessing": {
+                OCRService.TESSERACT.value: config.tesseract_preprocessing_profile,
+                OCRService.PADDLE.value: config.paddle_preprocessing_profile,
+            },
+            "paddle_orientation": {
+                "enabled": config.paddle_page_orientation,
+                "min_confidence": config.paddle_orientation_min_confidence,
+            },
+            "dpi_mode": config.pdf_render_dpi_mode,
+            "dpi": config.pdf_render_dpi,
+            "min_dpi": config.pdf_min_render_dpi,
+            "max_dpi": config.pdf_max_render_dpi,
+            "target_glyph_height_px": config.pdf_target_glyph_height_px,
+            "min_text_chars": config.pdf_page_min_text_chars,
+            "min_image_coverage": config.pdf_page_min_image_coverage,
+            "ocr_empty_pages": True,
+            "cascade": {
+                "min_confidence": config.ocr_cascade_min_confidence,
+                "max_unsure_ratio": config.ocr_cascade_max_unsure_ratio,
+                "region_padding_px": config.ocr_cascade_region_padding_px,
+            },
+            "skip_blank": config.page_skip_blank,
+            "blank_max_ink_ratio": config.page_blank_max_ink_ratio,
+            "blank_min_mark_area": config.page_blank_min_mark_area,
+            "crop_margins": config.page_crop_margins,
+            "crop_padding_pt": config.page_crop_padding_pt,
+        }
+        if settings["ocr_technology"] == OCRService.PADDLE_ONNX:
+            # The model directory and providers pick which models run, and how
+            settings["onnx"] = {
+                "model_dir": config.paddle_onnx_model_dir,
+                "execution_providers": config.onnx_execution_providers,
+            }
+        return settings
+
+    async def extract_text_from_pdf(self, pdf: PDFInput) -> str:
+        """
+        Extract text from a PDF, page by page.
 
-    async def process_with_ocr(self, pdf_bytes: bytes) -> str:
-        """Process a scanned PDF using OCR."""
-        logger.info("Converting PDF to images for OCR processing")
-        images = await self.pdf_to_image_service.convert_pdf_to_images(pdf_bytes, enhance=True)
+        Pages with a text layer are read with PyMuPDF; image-only pages are
+        rendered and OCR'd. Both come from one opened document and are merged
+        back in page order. Page texts and how each page was extracted are
+        cached by document content and extraction settings, so re-uploads
+        skip extraction entirely and still report the page decisions.
+
+        Args:
+            pdf (PDFInput): The PDF as bytes, or spooled to disk
+        """
+        cache_key = None
+        entry = None
+        if config.extraction_cache_enabled:
+            if isinstance(pdf, SpooledUpload):
+                digest = await run_io(lambda: pdf.sha256)
+                cache_key = ExtractionCache.make_key_from_digest(digest, **self._extraction_settings())
+            else:
+                cache_key = await run_native(ExtractionCache.make_key, pdf, **self._extraction_settings())
+            entry = await run_io(extraction_cache.get, cache_key)
+            logger.info(f"Extraction cache {'hit' if entry is not None else 'miss'}: {extraction_cache.stats()}")
+            if entry is not None:
+                self._report_progress("extraction_cache_hit")
+
+        if entry is not None:
+            page_texts, pages = entry["page_texts"], entry["pages"]
+        else:
+            page_texts, pages = await self._extract_page_texts(pdf)
+            if cache_key is not None:
+                await run_io(extraction_cache.put, cache_key, page_texts, pages)
 
-        if not images:
-            raise HTTPException(status_code=500, detail="Failed to convert PDF to images")
+        self._page_texts = page_texts
+        self._pages = pages
+        extracted_text = "\n".join(text for text in page_texts if text).strip()
 
-        logger.info(f"Starting OCR processing on {len(images)} images")
-        extracted_text = await self._ocr_service.extract_text_from_multiple_images(images)
+        # TODO: DELETE
+        logger.info(f"ParseFileService - Length of extracted text: {len(extracted_text)}")
+        self._report_progress(
+            "text_extracted",
+            pages=len(page_texts),
+            characters=len(extracted_text),
+            page_sources=pages
+        )
 
         if not extracted_text:
-            logger.warning("OCR processing completed but no text was extracted")
+            logger.warning("Text extraction completed but no text was extracted")
             raise HTTPException(
                 status_code=400,
                 detail="The document appears to be blank or OCR could not extract text"
             )
 
-        logger.info(f"OCR processing completed. Extracted {len(extracted_text)} characters.")
         return extracted_text
 
+    async def _extract_page_texts(self, pdf: PDFInput) -> Tuple[List[str], List[Dict[str, Any]]]:
+        """
+        Read or OCR every page of a PDF.
+
+        Returns:
+            Tuple[List[str], List[Dict[str, Any]]]: The text of each page in order, and per page
+                its "page" number (one-based) and "source": "text_layer", "ocr" or "skipped".
+                Analyzed pages also carry their "ink_ratio", OCR'd pages the "crop" they were
+                rendered with and skipped pages the "reason".
+        """
+        try:
+            if isinstance(pdf, SpooledUpload):
+                # Opened by path, so MuPDF reads pages from disk instead of a copy in memory
+                doc = await run_pdf(fitz.open, pdf.path, filetype="pdf")
+            else:
+                doc = await run_pdf(fitz.open, stream=pdf, filetype="pdf")
+        except Exception as e:
+            logger.error(f"Failed to open PDF: {str(e)}")
+            raise HTTPException(status_code=500, detail="Error extracting text from PDF.")
+
+        try:
+            try:
+                page_texts = await run_pdf(self._classify_pages, doc)
+            except Exception as e:
+                logger.error(f"Failed to extract text from PDF: {str(e)}")
+                raise HTTPException(status_code=500, detail="Error extracting text from PDF.")
+
+            pages = [
+                {"page": page_num + 1, "source": "text_layer" if text is not None else "ocr"}
+                for page_num, text in enumerate(page_texts)
+            ]
+            ocr_pages = [page_num for page_num, text in enumerate(page_texts) if text is None]
+            clips = None
+            if ocr_pages:
+                ocr_pages, clips = await self._plan_ocr_pages(doc, ocr_pages, page_texts, pages)
+            if ocr_pages:
+                logger.info(f"{len(ocr_pages)} of {len(page_texts)} pages have no usable text layer, running OCR on them")
+                ocr_texts = await self.process_with_ocr(doc, ocr_pages, clips)
+                for page_num, text in zip(ocr_pages, ocr_texts):
+                    page_texts[page_num] = text
+        finally:
+            await run_pdf(doc.close)
+
+        return page_texts, pages
+
+    async def _plan_ocr_pages(
+            self,
+            doc: fitz.Document,
+            ocr_pages: List[int],
+            page_texts: List[Optional[str]],
+            pages: List[Dict[str, Any]]
+    ) -> Tuple[List[int], Optional[List[Optional[PageClip]]]]:
+        """
+        Drop blank pages from the pages to OCR and pick the content area of the others.
+
+        Blank pages get an empty text in page_texts. Both decisions are
+        recorded in pages; skipped pages are also reported as page progress.
+
+        Args:
+            doc (fitz.Document): The open PDF
+            ocr_pages (List[int]): Zero-based pages without a usable text layer
+            page_texts (List[Optional[str]]): Text of each page, None for pages still to OCR
+            pages (List[Dict[str, Any]]): How each page is extracted, updated in place
+
+        Returns:
+            Tuple[List[int], Optional[List[Optional[PageClip]]]]: The pages to OCR, and the area
+                to render of each of them (None when margins are not cropped)
+        """
+        if not (config.page_skip_blank or config.page_crop_margins):
+            return ocr_pages, None
+
+        layouts = await self.pdf_to_image_service.analyze_pages(doc, ocr_pages)
+
+        kept, clips = [], []
+        for page_num, layout in zip(ocr_pages, layouts):
+            pages[page_num]["ink_ratio"] = layout["ink_ratio"]
+            if layout["blank"] and config.page_skip_blank:
+                page_texts[page_num] = ""
+                pages[page_num].update(source="skipped", reason="blank")
+                self._report_progress("page_skipped", page=page_num + 1, reason="blank", ink_ratio=layout["ink_ratio"])
+                continue
+            clip = layout["crop"] if config.page_crop_margins else None
+            pages[page_num]["crop"] = list(clip) if clip else None
+            kept.append(page_num)
+            clips.append(clip)
+
+        if len(kept) < len(ocr_pages):
+            logger.info(f"Skipping OCR of {len(ocr_pages) - len(kept)} blank pages")
+        return kept, clips if config.page_crop_margins else None
+
+    async def process_with_ocr(
+            self,
+            pdf: PDFSource,
+            page_numbers: Optional[List[int]] = None,
+            clips: Optional[List[Optional[PageClip]]] = None
+    ) -> List[str]:
+        """
+        OCR the given pages of a PDF.
+
+        Args:
+            pdf (PDFSource): The PDF file as bytes or as an open document
+            page_numbers (Optional[List[int]]): Zero-based pages to OCR. Defaults to all pages.
+            clips (Optional[List[Optional[PageClip]]]): Area to OCR of each page, None for the whole page
+
+        Returns:
+            List[str]: Extracted text of each page, in page order
+        """
+        logger.info("Streaming PDF pages to OCR processing")
+        images = self.pdf_to_image_service.iter_pdf_pages(
+            pdf, enhance=self.ENHANCE_PAGES, page_numbers=page_numbers, clips=clips
+        )
+
+        def on_page_done(index: int, text: str) -> None:
+            page_num = page_numbers[index] if page_numbers is not None else index
+            self._report_progress(
+                "page_ocr",
+                page=page_num + 1,
+                pages_done=index + 1,
+                pages_total=len(page_numbers) if page_numbers is not None else None,
+                crop=clips[index] if clips is not None else None
+            )
+
+        with ocr_service_registry.checkout(self._ocr_technology) as ocr_service:
+            page_texts = await ocr_service.extract_page_texts_from_image_stream(images, on_page_done=on_page_done)
+
+        logger.info(f"OCR processing completed. Extracted {sum(len(text) for text in page_texts)} characters.")
+        return page_texts
+
     def _create_parse_prompt(self, extracted_text: str) -> Dict[str, str]:
         """Create a prompt for parsing invoice data."""
         context = f"""
@@ -130,18 +367,24 @@ class ParseFileService(ParseFileServiceInterface):
 
         return {"system": system, "user": user}
 
+    async def _retrieve_relevant_text(self, extracted_text: str, prompt: str) -> str:
+        """Return the chunks of the document most relevant to the prompt."""
+        embeddings = await run_native(EmbeddingsFactory.get_shared_embeddings)
+        retriever = await run_native(
+            RetrieverFactory.create_retriever,
+            extracted_text,
+            embeddings,
+            config.embedding_model_name
+        )
+
+        retrieved_chunks = await run_native(retriever.similarity_search, prompt, k=5)
+        self._report_progress("retrieval_done", chunks=len(retrieved_chunks))
+        return "\n".join(retrieved_chunks)
+
     async def _process_with_rag(self, extracted_text: str, prompt: str, model: str) -> str:
         """Process file with RAG approach (for Groq service)."""
         try:
-            embeddings = SentenceTransformerEmbeddings()
-            vectorstore = Chroma(embedding_function=embeddings)
-
-            text_splitter = RecursiveCharacterTextSplitter(chunk_size=1000, chunk_overlap=200)
-            chunks = text_splitter.split_text(extracted_text)
-            vectorstore.add_texts(chunks)
-
-            retrieved_docs = vectorstore.similarity_search(prompt, k=5)
-            relevant_text = "\n".join([doc.page_content for doc in retrieved_docs])
+            relevant_text = await self._retrieve_relevant_text(extracted_text, prompt)
 
             # Combine the relevant text with the original prompt
             # context = f"""
@@ -205,30 +448,57 @@ class ParseFileService(ParseFileServiceInterface):
         Returns:
             Dict[str, Any]: The processed file data.
         """
-        self._ocr_service = OCRServiceFactory.create_ocr_service(
-            service_name=ocr_technology
-        )
+        upload = await spool_upload(file)
+        # TODO: DELETE
+        logger.info(f"ParseFileService - No. of PDF Bytes: {upload.size}")
+
+        try:
+            return await self.process_pdf(model, upload, processing_type, prompt, ai_service, ocr_technology)
+        finally:
+            await run_io(upload.close)
+
+    async def process_pdf(
+            self,
+            model: str,
+            pdf: PDFInput,
+            processing_type: str,
+            prompt: str = None,
+            ai_service: str = AIService.GROQ_CLOUD,
+            ocr_technology: str = OCRService.PADDLE
+    ) -> Any:
+        """
+        Process a file already in memory or spooled to disk. See process.
+
+        Args:
+            model (str): The model to use.
+            pdf (PDFInput): The PDF file to process.
+            processing_type (str): Type of processing ("parse" or "prompt").
+            prompt (str, optional): Custom prompt for LLM. Required for "prompt" type.
+            ai_service (str): AI service to use ("ollama_local" or "groq_cloud").
+            ocr_technology (str): OCR engine for pages without a text layer.
+
+        Returns:
+            Dict[str, Any]: The processed file data.
+        """
+        self._ocr_technology = ocr_technology
 
         self._llm_service = LlmInteractionServiceFactory.create_llm_interaction_service(
             ai_service,
             self.ollama_base_url,
-            self.groq_api_key
+            self.groq_api_key,
+            self._is_json_completion
         )
 
-        # Extract text from PDF
-        pdf_bytes = await file.read()
-        # TODO: DELETE
-        logger.info(f"ParseFileService - No. of PDF Bytes: {len(pdf_bytes)}")
-
-        extracted_text = await self.extract_text_from_pdf(pdf_bytes)
+        extracted_text = await self.extract_text_from_pdf(pdf)
         # TODO: DELETE
         logger.info(f"ParseFileService - extracted text: {extracted_text}")
 
-        if extracted_text == "__SCANNED_DOCUMENT__":
-            extracted_text = await self.process_with_ocr(pdf_bytes)
-
         # Process the invoice based on processing type
         if processing_type == ProcessingType.PARSE:
+            # Documents too large for one prompt are parsed chunk by chunk and merged
+            if self._needs_map_reduce(extracted_text):
+                return await self._parse_with_map_reduce(model, extracted_text)
+
             # Create parse prompt
             parse_prompt = self._create_parse_prompt(extracted_text)
 
@@ -269,3 +539,189 @@ class ParseFileService(ParseFileServiceInterface):
 
         else:
             raise HTTPException(status_code=400, detail="Invalid processing type. Use 'parse' or 'prompt'.")
+
+    def _needs_map_reduce(self, extracted_text: str) -> bool:
+        """Whether the text is too large to parse with a single prompt."""
+        return config.map_reduce_enabled and estimate_tokens(extracted_text) > config.llm_context_max_tokens
+
+    async def _parse_with_map_reduce(self, model: str, extracted_text: str) -> Dict[str, Any]:
+        """
+        Parse a large invoice chunk by chunk and merge the partial results.
+
+        Consecutive pages are grouped into chunks of at most MAP_REDUCE_CHUNK_TOKENS,
+        parsed concurrently (at most MAP_REDUCE_CONCURRENCY LLM calls at a time),
+        and merged deterministically.
+
+        Args:
+            model (str): The model to use.
+            extracted_text (str): The document text
+
+        Returns:
+            Dict[str, Any]: The merged invoice data.
+        """
+        chunks = split_pages_by_token_budget(self._page_texts or [extracted_text], config.map_reduce_chunk_tokens)
+        logger.info(f"Parsing ~{estimate_tokens(extracted_text)} tokens of text in {len(chunks)} chunks")
+
+        semaphore = asyncio.Semaphore(max(config.map_reduce_concurrency, 1))
+        chunks_done = 0
+
+        async def parse_chunk(chunk: str) -> Any:
+            nonlocal chunks_done
+            async with semaphore:
+                result = ""
+                async for response in self._llm_service.generate_completion(
+                        model=model,
+                        prompt=self._create_parse_prompt(chunk),
+                        stream=False
+                ):
+                    result += response["response"]
+
+            part = self._parse_json_response(result)
+            chunks_done += 1
+            self._report_progress("chunk_parsed", chunks_done=chunks_done, chunks_total=len(chunks))
+            return part
+
+        tasks = [asyncio.ensure_future(parse_chunk(chunk)) for chunk in chunks]
+        try:
+            parts = await asyncio.gather(*tasks)
+        except Exception:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        return merge_invoice_parts([part for part in parts if isinstance(part, dict)])
+
+    async def _prepare_prompt(
+            self,
+            extracted_text: str,
+            processing_type: str,
+            prompt: Optional[str],
+            ai_service: str
+    ) -> Dict[str, str]:
+        """Build the LLM prompt for a processing type, retrieving the relevant chunks for Groq."""
+        if processing_type == ProcessingType.PARSE:
+            return self._create_parse_prompt(extracted_text)
+
+        if processing_type == ProcessingType.PROMPT:
+            if not prompt:
+                raise HTTPException(status_code=400, detail="Prompt is required for 'prompt' type.")
+
+            if ai_service == AIService.GROQ_CLOUD:
+                extracted_text = await self._retrieve_relevant_text(extracted_text, prompt)
+            return self._create_custom_prompt(extracted_text, prompt)
+
+        raise HTTPException(status_code=400, detail="Invalid processing type. Use 'parse' or 'prompt'.")
+
+    @staticmethod
+    def _parse_json_response(result: str) -> Any:
+        """Parse the JSON blob returned by the LLM."""
+        cleaned_text = re.sub(r"""^```json\n|\n"'```$""""", "", result).strip()
+
+        try:
+            return json.loads(cleaned_text)
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=500, detail=f"Failed to parse JSON response: {str(e)}")
+
+    @classmethod
+    def _is_json_completion(cls, chunks: List[Dict[str, Any]]) -> bool:
+        """Whether a completion holds the JSON blob every prompt asks for, so it may be cached."""
+        try:
+            cls._parse_json_response("".join(chunk["response"] for chunk in chunks))
+        except (HTTPException, KeyError, TypeError):
+            return False
+        return True
+
+    async def process_stream(
+            self,
+            model: str,
+            pdf: PDFInput,
+            processing_type: str,
+            prompt: str = None,
+            ai_service: str = AIService.GROQ_CLOUD,
+            ocr_technology: str = OCRService.PADDLE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process file like process, streaming progress and LLM tokens as they happen.
+
+        Args:
+            model (str): The model to use.
+            pdf (PDFInput): The PDF file to process.
+            processing_type (str): Type of processing ("parse" or "prompt").
+            prompt (str, optional): Custom prompt for LLM. Required for "prompt" type.
+            ai_service (str): AI service to use ("ollama_local" or "groq_cloud").
+            ocr_technology (str): OCR engine for pages without a text layer.
+
+        Yields:
+            Dict[str, Any]: Events with an "event" name ("stage", "token", "result" or "error") and their "data"
+        """
+        yield {"event": "stage", "data": {"stage": "started"}}
+
+        events: asyncio.Queue = asyncio.Queue()
+        self._on_progress = lambda stage, data: events.put_nowait({"event": "stage", "data": {"stage": stage, **data}})
+        tasks: List[asyncio.Task] = []
+
+        try:
+            self._ocr_technology = ocr_technology
+            self._llm_service = LlmInteractionServiceFactory.create_llm_interaction_service(
+                ai_service,
+                self.ollama_base_url,
+                self.groq_api_key,
+                self._is_json_completion
+            )
+
+            extraction = asyncio.create_task(self.extract_text_from_pdf(pdf))
+            tasks.append(extraction)
+            async for event in self._forward_progress(extraction, events):
+                yield event
+            extracted_text = extraction.result()
+
+            if processing_type == ProcessingType.PARSE and self._needs_map_reduce(extracted_text):
+                # Partial results can't be streamed as tokens; report chunk progress instead
+                parsing = asyncio.create_task(self._parse_with_map_reduce(model, extracted_text))
+                tasks.append(parsing)
+                async for event in self._forward_progress(parsing, events):
+                    yield event
+                yield {"event": "result", "data": parsing.result()}
+                return
+
+            preparation = asyncio.create_task(
+                self._prepare_prompt(extracted_text, processing_type, prompt, ai_service)
+            )
+            tasks.append(preparation)
+            async for event in self._forward_progress(preparation, events):
+                yield event
+            llm_prompt = preparation.result()
+
+            result = ""
+            async for chunk in self._llm_service.generate_completion(model=model, prompt=llm_prompt, stream=True):
+                result += chunk["response"]
+                yield {"event": "token", "data": {"text": chunk["response"]}}
+
+            yield {"event": "result", "data": self._parse_json_response(result)}
+
+        except HTTPException as e:
+            logger.error(f"File processing error: {e.detail}")
+            yield {"event": "error", "data": {"status_code": e.status_code, "detail": e.detail}}
+        except Exception as e:
+            logger.error(f"File processing error: {str(e)}")
+            yield {"event": "error", "data": {"status_code": 500, "detail": f"Error processing file: {str(e)}"}}
+        finally:
+            self._on_progress = None
+            # The client may disconnect mid-stream; don't leave the pipeline running
+            pending = [task for task in tasks if not task.done()]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    @staticmethod
+    async def _forward_progress(task: asyncio.Task, events: asyncio.Queue) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the progress events reported while a task runs, until it finishes."""
+        while not task.done():
+            next_event = asyncio.ensure_future(events.get())
+            await asyncio.wait({task, next_event}, return_when=asyncio.FIRST_COMPLETED)
+            if next_event.done():
+                yield next_event.result()
+            else:
+                next_event.cancel()
+        while not events.empty():
+            yield events.get_nowait()
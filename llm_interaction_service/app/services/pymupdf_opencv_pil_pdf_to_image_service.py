@@ -3,53 +3,287 @@ import fitz
 import cv2
 import numpy as np
 from fastapi import HTTPException, UploadFile
-from PIL import Image
-import io
-import asyncio
-from typing import List, Tuple
-from app.interfaces.pdf_to_image_service_interface import PDFToImageServiceInterface
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from app.core.config import config
+from app.core.constants import RenderDpiMode
+from app.core.executors import run_native, run_pdf
+from app.core.image_preprocessing import preprocess
+from app.core.page_content import find_content
+from app.core.page_image import PageImage, pixmap_to_array
+from app.interfaces.pdf_to_image_service_interface import PDFToImageServiceInterface, PDFSource, PageClip
 
 logger = logging.getLogger(__name__)
 
 class PyMuPDFOpenCvPilPDFToImageService(PDFToImageServiceInterface):
     """Service for converting PDF files to enhanced images."""
 
-    async def convert_pdf_to_images(self, pdf_bytes: bytes, enhance: bool = True) -> List[bytes]:
+    # Resolution of the preview used to estimate glyph height in adaptive DPI mode
+    PREVIEW_DPI = 72
+    # Detected glyph boxes are roughly 0.7 of the font size
+    GLYPH_TO_FONT_SIZE = 0.7
+    # Preprocessing profile of enhanced pages
+    ENHANCE_PROFILE = "binarize"
+    # Pages are only cropped when that leaves out at least this share of their area
+    MIN_CROP_SAVING = 0.1
+
+    async def convert_pdf_to_images(
+            self,
+            pdf_bytes: PDFSource,
+            enhance: bool = True,
+            page_numbers: Optional[List[int]] = None,
+            clips: Optional[List[Optional[PageClip]]] = None
+    ) -> List[PageImage]:
         """
-        Convert PDF to a list of image bytes.
+        Convert PDF to a list of page images.
 
         Args:
-            pdf_bytes (bytes): The PDF file as bytes
+            pdf_bytes (PDFSource): The PDF file as bytes or as an open document
             enhance (bool): Whether to enhance the image quality
+            page_numbers (Optional[List[int]]): Zero-based pages to convert. Defaults to all pages.
+            clips (Optional[List[Optional[PageClip]]]): Area to render of each page, None for the whole page
 
         Returns:
-            List[bytes]: List of bytes for each page image
+            List[PageImage]: Grayscale ndarray for each page
         """
         try:
-            doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-            logger.info(f"Converting PDF with {len(doc)} pages to images")
+            images = await run_pdf(self._convert_pdf_to_images_sync, pdf_bytes, page_numbers, clips)
+            if enhance:
+                images = await run_native(lambda: [self._enhance_image(img) for img in images])
+            return images
+
+        except Exception as e:
+            logger.error(f"Failed to convert PDF to images: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error converting PDF to images: {str(e)}")
+
+    def _convert_pdf_to_images_sync(
+            self,
+            pdf_bytes: PDFSource,
+            page_numbers: Optional[List[int]] = None,
+            clips: Optional[List[Optional[PageClip]]] = None
+    ) -> List[PageImage]:
+        """Blocking variant of convert_pdf_to_images without enhancement, run on the PDF thread."""
+        doc, owned = self._open_pdf(pdf_bytes)
+        try:
+            if page_numbers is None:
+                page_numbers = list(range(len(doc)))
+            logger.info(f"Converting {len(page_numbers)} of {len(doc)} PDF pages to images")
 
             image_bytes_list = []
 
-            for page_num, page in enumerate(doc):
+            for i, page_num in enumerate(page_numbers):
                 logger.info(f"Processing page {page_num + 1}")
-                pix = page.get_pixmap(matrix=fitz.Matrix(300/72, 300/72), alpha=False)
+                clip = clips[i] if clips is not None else None
+                image_bytes_list.append(self._render_page(doc, page_num, clip))
 
-                img_bytes = pix.tobytes("png")
+            logger.info(f"Successfully converted {len(image_bytes_list)} pages to images")
+            return image_bytes_list
+        finally:
+            if owned:
+                doc.close()
 
-                if enhance:
-                    img_bytes = await self._enhance_image(img_bytes)
+    async def iter_pdf_pages(
+            self,
+            pdf_bytes: PDFSource,
+            enhance: bool = True,
+            page_numbers: Optional[List[int]] = None,
+            clips: Optional[List[Optional[PageClip]]] = None
+    ) -> AsyncIterator[PageImage]:
+        """
+        Convert PDF to images page by page, yielding each page as soon as it is ready.
 
-                image_bytes_list.append(img_bytes)
+        Args:
+            pdf_bytes (PDFSource): The PDF file as bytes or as an open document
+            enhance (bool): Whether to enhance the image quality
+            page_numbers (Optional[List[int]]): Zero-based pages to convert. Defaults to all pages.
+            clips (Optional[List[Optional[PageClip]]]): Area to render of each page, None for the whole page
 
-            logger.info(f"Successfully converted {len(image_bytes_list)} pages to images")
-            return image_bytes_list
+        Yields:
+            PageImage: Grayscale ndarray of the next page
+        """
+        try:
+            doc, owned = await run_pdf(self._open_pdf, pdf_bytes)
+        except Exception as e:
+            logger.error(f"Failed to open PDF: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error converting PDF to images: {str(e)}")
+
+        try:
+            page_count = await run_pdf(len, doc)
+            if page_numbers is None:
+                page_numbers = list(range(page_count))
+            logger.info(f"Streaming {len(page_numbers)} of {page_count} PDF pages to images")
+
+            for i, page_num in enumerate(page_numbers):
+                logger.info(f"Processing page {page_num + 1}")
+                clip = clips[i] if clips is not None else None
+                try:
+                    img = await run_pdf(self._render_page, doc, page_num, clip)
+                    if enhance:
+                        img = await run_native(self._enhance_image, img)
+                except Exception as e:
+                    logger.error(f"Failed to convert page {page_num + 1} to image: {str(e)}")
+                    raise HTTPException(status_code=500, detail=f"Error converting PDF to images: {str(e)}")
+                yield img
+        finally:
+            if owned:
+                await run_pdf(doc.close)
+
+    @staticmethod
+    def _open_pdf(pdf_bytes: PDFSource) -> Tuple[fitz.Document, bool]:
+        """Return the document to render and whether this service opened (and must close) it."""
+        if isinstance(pdf_bytes, fitz.Document):
+            return pdf_bytes, False
+        return fitz.open(stream=pdf_bytes, filetype="pdf"), True
+
+    def _render_page(self, doc: fitz.Document, page_num: int, clip: Optional[PageClip] = None) -> np.ndarray:
+        """Render one page (or the clip of it) straight to a grayscale ndarray. Runs on the PDF thread."""
+        page = doc[page_num]
+        dpi = self._choose_render_dpi(page)
+        logger.info(f"Rendering page {page.number + 1} at {dpi} DPI" + (f", clipped to {clip}" if clip else ""))
+        pix = page.get_pixmap(
+            matrix=fitz.Matrix(dpi/72, dpi/72),
+            colorspace=fitz.csGRAY,
+            alpha=False,
+            clip=fitz.Rect(clip) if clip else None
+        )
+
+        return pixmap_to_array(pix)
+
+    def _choose_render_dpi(self, page: fitz.Page) -> int:
+        """
+        Pick the render DPI for a page.
+
+        In fixed mode every page uses PDF_RENDER_DPI. In adaptive mode the DPI
+        is the lowest one that scales the page's glyphs to
+        PDF_TARGET_GLYPH_HEIGHT_PX, falling back to the resolution of the
+        embedded scan, clamped to [PDF_MIN_RENDER_DPI, PDF_MAX_RENDER_DPI].
+
+        Args:
+            page (fitz.Page): The page to render
+
+        Returns:
+            int: Render resolution in DPI
+        """
+        if config.pdf_render_dpi_mode != RenderDpiMode.ADAPTIVE:
+            return config.pdf_render_dpi
+
+        glyph_height_pt = self._estimate_glyph_height(page)
+        if glyph_height_pt:
+            dpi = config.pdf_target_glyph_height_px * 72 / glyph_height_pt
+        else:
+            dpi = self._estimate_scan_dpi(page) or config.pdf_render_dpi
+
+        # Round up to a multiple of 25 so similar pages render at the same size,
+        # then clamp, so bounds that aren't multiples of 25 still hold
+        dpi = int(-(-dpi // 25) * 25)
+        return min(max(dpi, config.pdf_min_render_dpi), config.pdf_max_render_dpi)
+
+    def _estimate_glyph_height(self, page: fitz.Page) -> Optional[float]:
+        """
+        Estimate the typical glyph height of a page, in points.
+
+        Uses the font sizes of the text layer when there is one, otherwise the
+        median height of the connected components of a low resolution preview.
+
+        Args:
+            page (fitz.Page): The page to measure
+
+        Returns:
+            Optional[float]: Glyph height in points, or None if the page has no measurable text
+        """
+        sizes = [
+            span["size"]
+            for block in page.get_text("dict")["blocks"]
+            for line in block.get("lines", [])
+            for span in line["spans"]
+            if span["text"].strip()
+        ]
+        if sizes:
+            return float(np.median(sizes)) * self.GLYPH_TO_FONT_SIZE
+
+        zoom = self.PREVIEW_DPI / 72
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+        preview = pixmap_to_array(pix)
+
+        _, ink = cv2.threshold(preview, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+        count, _, stats, _ = cv2.connectedComponentsWithStats(ink, connectivity=8)
+        heights = stats[1:, cv2.CC_STAT_HEIGHT]
+
+        # Drop specks, rules and pictures
+        heights = heights[(heights >= 2) & (heights <= preview.shape[0] * 0.05)]
+        if len(heights) < 10:
+            return None
+
+        return float(np.median(heights)) * 72 / self.PREVIEW_DPI
+
+    @staticmethod
+    def _estimate_scan_dpi(page: fitz.Page) -> Optional[float]:
+        """Return the resolution of the largest image on the page, if any."""
+        best_area, best_dpi = 0.0, None
+        for info in page.get_image_info():
+            bbox = fitz.Rect(info["bbox"])
+            if bbox.is_empty or not info.get("width"):
+                continue
+            if bbox.get_area() > best_area:
+                best_area = bbox.get_area()
+                best_dpi = info["width"] / (bbox.width / 72)
+        return best_dpi
+
+    async def analyze_pages(self, pdf_bytes: PDFSource, page_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Find blank pages and the content area of the others from low resolution previews.
+
+        Args:
+            pdf_bytes (PDFSource): The PDF file as bytes or as an open document
+            page_numbers (Optional[List[int]]): Zero-based pages to analyze. Defaults to all pages.
+
+        Returns:
+            List[Dict[str, Any]]: Per page, its "page" number (one-based), whether it is "blank",
+                its "ink_ratio" and the "crop" (PageClip) around its content, or None if
+                cropping would save little
+        """
+        try:
+            return await run_pdf(self._analyze_pages_sync, pdf_bytes, page_numbers)
 
         except Exception as e:
-            logger.error(f"Failed to convert PDF to images: {str(e)}")
+            logger.error(f"Failed to analyze PDF pages: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error converting PDF to images: {str(e)}")
 
-    async def process_pdf_file(self, file: UploadFile, enhance: bool = True) -> List[bytes]:
+    def _analyze_pages_sync(self, pdf_bytes: PDFSource, page_numbers: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+        """Blocking variant of analyze_pages, run on the PDF thread."""
+        doc, owned = self._open_pdf(pdf_bytes)
+        try:
+            if page_numbers is None:
+                page_numbers = list(range(len(doc)))
+            return [self._analyze_page(doc[page_num]) for page_num in page_numbers]
+        finally:
+            if owned:
+                doc.close()
+
+    def _analyze_page(self, page: fitz.Page) -> Dict[str, Any]:
+        """
+        Measure the ink of one page on a preview and box its content.
+
+        A page is blank only if it has little ink and no mark as large as a
+        small glyph, so a lone page number, stamp or signature is kept.
+        """
+        zoom = self.PREVIEW_DPI / 72
+        pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=fitz.csGRAY, alpha=False)
+        ink_ratio, largest_mark, box = find_content(pixmap_to_array(pix))
+
+        blank = box is None or (
+            ink_ratio < config.page_blank_max_ink_ratio and largest_mark < config.page_blank_min_mark_area
+        )
+        crop = None
+        if not blank:
+            padding = config.page_crop_padding_pt
+            rect = fitz.Rect(box) / zoom + (-padding, -padding, padding, padding)
+            rect = rect & page.rect
+            if rect.get_area() <= page.rect.get_area() * (1 - self.MIN_CROP_SAVING):
+                crop = tuple(round(value, 1) for value in rect)
+
+        return {"page": page.number + 1, "blank": blank, "ink_ratio": round(ink_ratio, 5), "crop": crop}
+
+    async def process_pdf_file(self, file: UploadFile, enhance: bool = True) -> List[PageImage]:
         """
         Process a PDF file uploaded through FastAPI.
 
@@ -58,7 +292,7 @@ class PyMuPDFOpenCvPilPDFToImageService(PDFToImageServiceInterface):
             enhance (bool): Whether to enhance the image quality
 
         Returns:
-            List[bytes]: List of bytes for each page image
+            List[PageImage]: Grayscale ndarray for each page
         """
         try:
             pdf_bytes = await file.read()
@@ -72,49 +306,23 @@ class PyMuPDFOpenCvPilPDFToImageService(PDFToImageServiceInterface):
             logger.error(f"Failed to process PDF file: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error processing PDF file: {str(e)}")
 
-    async def _enhance_image(self, img_bytes: bytes) -> bytes:
+    def _enhance_image(self, gray: np.ndarray) -> np.ndarray:
         """
         Enhance image quality for better OCR results.
 
         Args:
-            img_bytes (bytes): Image as bytes
+            gray (np.ndarray): Grayscale page
 
         Returns:
-            bytes: Enhanced image as bytes
+            np.ndarray: Enhanced grayscale page
         """
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(img_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-            # Apply image enhancement techniques
-            # 1. Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-
-            # 2. Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
-
-            # 3. Apply adaptive thresholding for better text extraction
-            threshold = cv2.adaptiveThreshold(
-                blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-                cv2.THRESH_BINARY, 11, 2
-            )
-
-            # 4. Apply morphological operations to clean up the image
-            kernel = np.ones((1, 1), np.uint8)
-            opening = cv2.morphologyEx(threshold, cv2.MORPH_OPEN, kernel)
-
-            # 5. Increase contrast
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            enhanced = clahe.apply(opening)
-
-            # Convert back to bytes
-            _, buffer = cv2.imencode('.png', enhanced)
-            enhanced_bytes = buffer.tobytes()
-
-            return enhanced_bytes
+            # The page was rendered straight to grayscale and is only ours, so
+            # blur and threshold it in place. A 1x1 open was a no-op, and CLAHE
+            # on the binary result only turned black text gray.
+            return preprocess(gray, self.ENHANCE_PROFILE, inplace=True)
 
         except Exception as e:
             logger.error(f"Failed to enhance image: {str(e)}")
             # Return original image if enhancement fails
-            return img_bytes
\ No newline at end of file
+            return gray
\ No newline at end of file
@@ -0,0 +1,89 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from contextlib import closing
+from typing import Any, Dict, List, Optional
+from app.interfaces.completion_cache_backend_interface import CompletionCacheBackendInterface
+
+logger = logging.getLogger(__name__)
+
+class SqliteCompletionCacheBackend(CompletionCacheBackendInterface):
+    """Completion cache stored in a SQLite file, shared by every worker process on the host."""
+
+    def __init__(self, path: str, max_entries: int = 1024):
+        """
+        Initialize the SQLite backend.
+
+        Args:
+            path (str): Path of the SQLite database file
+            max_entries (int): Entries kept before the least recently used ones are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    chunks TEXT NOT NULL,
+                    expires_at REAL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS completions_accessed_at ON completions (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the backend safe across threads and processes
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT chunks, expires_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            chunks, expires_at = row
+            if expires_at is not None and expires_at <= now:
+                conn.execute("DELETE FROM completions WHERE key = ?", (key,))
+                return None
+
+            conn.execute("UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key))
+
+        try:
+            return json.loads(chunks)
+        except ValueError as e:
+            logger.error(f"Failed to decode cached completion {key}: {str(e)}")
+            return None
+
+    def set(self, key: str, chunks: List[Dict[str, Any]], ttl_seconds: Optional[int] = None) -> None:
+        now = time.time()
+        expires_at = now + ttl_seconds if ttl_seconds else None
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO completions (key, chunks, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(chunks), expires_at, now)
+            )
+            conn.execute("DELETE FROM completions WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+            conn.execute(
+                """
+                DELETE FROM completions WHERE key IN (
+                    SELECT key FROM completions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM completions")
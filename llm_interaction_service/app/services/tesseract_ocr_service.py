@@ -1,12 +1,17 @@
 import logging
+import os
+import subprocess
+import tempfile
 import pytesseract
 import cv2
 import numpy as np
 from fastapi import HTTPException, UploadFile
-from PIL import Image
-import io
-import asyncio
 from typing import List, Optional, Dict, Any
+from app.core.config import config
+from app.core.constants import OCRService
+from app.core.executors import run_native
+from app.core.image_preprocessing import preprocess
+from app.core.page_image import PageImage, to_array, to_pil_image
 from app.interfaces.ocr_service_interface import OCRServiceInterface
 
 logger = logging.getLogger(__name__)
@@ -14,6 +19,8 @@ logger = logging.getLogger(__name__)
 class TesseractOCRService(OCRServiceInterface):
     """Service for extracting text from images using OCR."""
 
+    SERVICE_NAME = OCRService.TESSERACT
+
     def __init__(self, tesseract_cmd: Optional[str] = None):
         """
         Initialize the OCR service.
@@ -24,6 +31,8 @@ class TesseractOCRService(OCRServiceInterface):
         if tesseract_cmd:
             pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
 
+        self.engine_options = {"tesseract_cmd": tesseract_cmd}
+
         # Test if Tesseract is available
         try:
             pytesseract.get_tesseract_version()
@@ -32,20 +41,43 @@ class TesseractOCRService(OCRServiceInterface):
             logger.error(f"Failed to initialize Tesseract OCR: {str(e)}")
             logger.warning("Make sure Tesseract OCR is installed and available in PATH")
 
-    async def extract_text_from_image(self, image_bytes: bytes, lang: str = "eng") -> str:
+    def _preprocess_image(self, image_bytes: PageImage) -> np.ndarray:
+        """Preprocess image for better OCR results."""
+        try:
+            # Decode only if the page arrived encoded, and run the engine's profile once
+            return preprocess(image_bytes, config.tesseract_preprocessing_profile)
+        except Exception as e:
+            logger.warning(f"Image preprocessing failed: {str(e)}")
+            # Return original image if preprocessing fails
+            return to_array(image_bytes)
+
+    async def extract_text_from_image(self, image_bytes: PageImage, lang: str = "eng") -> str:
         """
         Extract text from an image using OCR.
 
         Args:
-            image_bytes (bytes): The image as bytes
+            image_bytes (PageImage): The image as an ndarray or encoded bytes
+            lang (str): Language code for OCR (default: 'eng')
+
+        Returns:
+            str: Extracted text
+        """
+        return await run_native(self.extract_text_from_image_sync, image_bytes, lang)
+
+    def extract_text_from_image_sync(self, image_bytes: PageImage, lang: str = "eng") -> str:
+        """
+        Blocking variant of extract_text_from_image, run on executor threads and OCR worker processes.
+
+        Args:
+            image_bytes (PageImage): The image as an ndarray, encoded bytes or any bytes-like buffer
             lang (str): Language code for OCR (default: 'eng')
 
         Returns:
             str: Extracted text
         """
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_bytes))
+            # Hand the preprocessed page to pytesseract as a PIL Image
+            image = to_pil_image(self._preprocess_image(image_bytes))
 
             # Extract text with pytesseract
             text = pytesseract.image_to_string(image, lang=lang)
@@ -56,28 +88,75 @@ class TesseractOCRService(OCRServiceInterface):
             logger.error(f"Failed to extract text from image: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error extracting text with OCR: {str(e)}")
 
-    async def extract_text_from_multiple_images(self, image_bytes_list: List[bytes], lang: str = "eng") -> str:
+    def extract_texts_from_images_sync(self, images: List[PageImage], lang: str = "eng") -> List[str]:
         """
-        Extract text from multiple images and combine the results.
+        OCR several pages with a single tesseract invocation.
+
+        The pages are written to a temp directory and handed to tesseract as a
+        list file, so the process starts and loads its model once per batch
+        instead of once per page. Tesseract separates the text of consecutive
+        pages with a form feed, which is used to split the output back per page.
 
         Args:
-            image_bytes_list (List[bytes]): List of images as bytes
+            images (List[PageImage]): The pages as ndarrays or encoded bytes
             lang (str): Language code for OCR (default: 'eng')
 
         Returns:
-            str: Combined extracted text
+            List[str]: Extracted text of each page, in page order
         """
-        if not image_bytes_list:
-            return ""
+        try:
+            with tempfile.TemporaryDirectory(prefix="tesseract-") as tmp_dir:
+                paths = []
+                for i, image in enumerate(images):
+                    # PNM is uncompressed, so writing it costs next to nothing
+                    path = os.path.join(tmp_dir, f"page-{i:05d}.pnm")
+                    if not cv2.imwrite(path, self._preprocess_image(image)):
+                        raise ValueError(f"Could not write page {i + 1}")
+                    paths.append(path)
+
+                list_path = os.path.join(tmp_dir, "pages.txt")
+                with open(list_path, "w") as f:
+                    f.write("\n".join(paths) + "\n")
+
+                completed = subprocess.run(
+                    [pytesseract.pytesseract.tesseract_cmd, list_path, "stdout", "-l", lang],
+                    capture_output=True,
+                    check=True
+                )
+
+            texts = completed.stdout.decode("utf-8", errors="replace").split("\f")
+            if texts and not texts[-1].strip():
+                texts.pop()
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Tesseract batch failed: {e.stderr.decode('utf-8', errors='replace').strip()}")
+            raise HTTPException(status_code=500, detail="Error extracting text with OCR: tesseract failed")
+        except Exception as e:
+            logger.error(f"Failed to extract text from images: {str(e)}")
+            raise HTTPException(status_code=500, detail=f"Error extracting text with OCR: {str(e)}")
 
-        texts = []
+        if len(texts) != len(images):
+            # A page tesseract couldn't read leaves no separator, so the pages can't be matched up
+            logger.warning(f"Tesseract batch returned {len(texts)} pages for {len(images)} images, OCR'ing page by page")
+            return [self.extract_text_from_image_sync(image, lang) for image in images]
+
+        return [text.strip() for text in texts]
 
-        for i, img_bytes in enumerate(image_bytes_list):
-            logger.info(f"Processing image {i+1} of {len(image_bytes_list)}")
-            text = await self.extract_text_from_image(img_bytes, lang)
-            texts.append(text)
+    def _max_batch(self, parallel: bool) -> int:
+        """Streamed pages are OCR'd in tesseract batches of up to TESSERACT_BATCH_PAGES."""
+        return super()._max_batch(parallel) if parallel else max(config.tesseract_batch_pages, 1)
 
-        return "\n\n".join(texts)
+    async def _ocr_pages(self, image_bytes_list: List[PageImage], lang: str, parallel: bool, first_page: int = 0) -> List[str]:
+        """OCR a list of pages on the CPU process pool, in tesseract batches, or one by one."""
+        batch_pages = config.tesseract_batch_pages
+        if parallel or batch_pages <= 1 or len(image_bytes_list) <= 1:
+            return await super()._ocr_pages(image_bytes_list, lang, parallel, first_page)
+
+        logger.info(f"Processing images {first_page + 1}-{first_page + len(image_bytes_list)} in tesseract batches")
+        texts = []
+        for start in range(0, len(image_bytes_list), batch_pages):
+            batch = image_bytes_list[start:start + batch_pages]
+            texts.extend(await run_native(self.extract_texts_from_images_sync, batch, lang))
+        return texts
 
     async def process_image_file(self, file: UploadFile, lang: str = "eng") -> str:
         """
@@ -102,21 +181,24 @@ class TesseractOCRService(OCRServiceInterface):
             logger.error(f"Failed to process image file: {str(e)}")
             raise HTTPException(status_code=500, detail=f"Error processing image file: {str(e)}")
 
-    async def extract_text_with_confidence(self, image_bytes: bytes, lang: str = "eng") -> Dict[str, Any]:
+    async def extract_text_with_confidence(self, image_bytes: PageImage, lang: str = "eng") -> Dict[str, Any]:
         """
         Extract text from an image and include confidence scores.
 
         Args:
-            image_bytes (bytes): The image as bytes
+            image_bytes (PageImage): The image as an ndarray or encoded bytes
             lang (str): Language code for OCR (default: 'eng')
 
         Returns:
             Dict[str, Any]: Extracted text with confidence data
         """
+        return await run_native(self.extract_text_with_confidence_sync, image_bytes, lang)
+
+    def extract_text_with_confidence_sync(self, image_bytes: PageImage, lang: str = "eng") -> Dict[str, Any]:
+        """Blocking variant of extract_text_with_confidence."""
         try:
-            # Convert bytes to numpy array
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            img = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            # Decode the page only if it arrived encoded
+            img = self._preprocess_image(image_bytes)
 
             # Get OCR data including confidence
             data = pytesseract.image_to_data(img, lang=lang, output_type=pytesseract.Output.DICT)
@@ -132,7 +214,12 @@ class TesseractOCRService(OCRServiceInterface):
                         'text': data['text'][i],
                         'confidence': data['conf'][i],
                         'block_num': data['block_num'][i],
-                        'line_num': data['line_num'][i]
+                        'par_num': data['par_num'][i],
+                        'line_num': data['line_num'][i],
+                        'left': data['left'][i],
+                        'top': data['top'][i],
+                        'width': data['width'][i],
+                        'height': data['height'][i]
                     })
 
                     if data['conf'][i] > 0:  # Only count valid confidence scores
@@ -0,0 +1,75 @@
+"""
+Compare PaddleOCRService with OnnxPaddleOCRService on the same pages.
+
+Both services get the same degraded sample pages (see preprocessing_benchmark)
+and read them through their full pipeline: preprocessing, page orientation and
+batched detection, classification and recognition. The script reports the load
+time and ms per page of each engine, the character accuracy against the text
+layer, and on how many pages the ONNX engine's text differs from Paddle's.
+
+The ONNX models have to be exported to PADDLE_ONNX_MODEL_DIR first (see
+OnnxPaddleOCRService). Thread counts come from ONNX_INTRA_OP_THREADS and
+ONNX_INTER_OP_THREADS, so runs with different settings can be compared.
+
+Usage (from llm_interaction_service/, with the service's env loaded):
+    python -m benchmarks.ocr_engine_benchmark [--pdf sample.pdf ...] [--pages 3] [--repeat 3]
+"""
+import argparse
+import time
+from typing import List
+
+import numpy as np
+
+from app.core.config import config
+from app.services.onnx_paddle_ocr_service import OnnxPaddleOCRService
+from app.services.paddle_ocr_service import PaddleOCRService
+from benchmarks.preprocessing_benchmark import accuracy, load_pages
+
+ENGINES = {
+    "paddle": PaddleOCRService,
+    "paddle_onnx": OnnxPaddleOCRService,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", nargs="*", default=[], help="Digital PDFs to sample pages from")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per PDF")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per engine, after one warm-up run")
+    args = parser.parse_args()
+
+    samples = load_pages(args.pdf, args.pages, args.dpi)
+    pages = [img for img, _ in samples]
+    print(f"{len(samples)} pages at {args.dpi} DPI, ONNX threads: "
+          f"{config.onnx_intra_op_threads} intra-op, {config.onnx_inter_op_threads} inter-op\n")
+
+    texts = {}
+    print(f"{'engine':>12} {'load s':>8} {'ms/page':>10} {'accuracy':>10}")
+    for name, service_class in ENGINES.items():
+        try:
+            start = time.perf_counter()
+            service = service_class()
+            load_s = time.perf_counter() - start
+        except Exception as e:
+            print(f"Skipping {name}: {getattr(e, 'detail', e)}")
+            continue
+
+        texts[name] = service.extract_text_from_images_batched_sync(pages)
+        runs: List[float] = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            service.extract_text_from_images_batched_sync(pages)
+            runs.append((time.perf_counter() - start) * 1000 / len(pages))
+        service.close()
+
+        score = np.mean([accuracy(text, truth) for text, (_, truth) in zip(texts[name], samples)])
+        print(f"{name:>12} {load_s:>8.2f} {min(runs):>10.1f} {score:>10.3f}")
+
+    if len(texts) == len(ENGINES):
+        differing = [i + 1 for i, (a, b) in enumerate(zip(texts["paddle"], texts["paddle_onnx"])) if a != b]
+        print(f"\nPages whose text differs between engines: {differing or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Measure the cost of each preprocessing stage and its effect on OCR accuracy.
+
+Sample pages are rendered from digital PDFs, whose text layer serves as the
+ground truth, and degraded with noise and blur to look like scans. For each
+preprocessing profile the script reports the time of every stage per page
+and, for each OCR engine that can be loaded, the character accuracy of the
+OCR'd text against the text layer. The legacy row is the old pipeline
+(render enhancement followed by the engine's own threshold), for reference.
+
+Usage (from llm_interaction_service/, with the service's env loaded):
+    python -m benchmarks.preprocessing_benchmark [--pdf sample.pdf ...] [--pages 3] [--engines tesseract paddle]
+"""
+import argparse
+import difflib
+import time
+from typing import Callable, Dict, List, Tuple
+
+import cv2
+import fitz
+import numpy as np
+
+from app.core.image_preprocessing import PREPROCESSING_PROFILES, apply_step, get_profile
+from app.core.page_image import pixmap_to_array
+
+SAMPLE_LINES = [
+    "INVOICE INV-2024-0117",
+    "Date: 2024-03-14    Due date: 2024-04-13",
+    "Bill to: Northwind Traders, 42 Harbour Road, Portsmouth",
+    "Description                    Qty   Unit price    Amount",
+    "Consulting services            12       85.00    1020.00",
+    "Hosting (March)                 1      240.00     240.00",
+    "Support plan                    1      120.00     120.00",
+    "Subtotal                                         1380.00",
+    "VAT 20%                                           276.00",
+    "Total due                                        1656.00",
+]
+
+
+def make_sample_pdf(pages: int) -> bytes:
+    doc = fitz.open()
+    for page_index in range(pages):
+        page = doc.new_page()
+        for line_index, line in enumerate(SAMPLE_LINES):
+            page.insert_text((60, 80 + line_index * 22), line.replace("0117", f"01{17 + page_index}"), fontsize=11)
+    return doc.tobytes()
+
+
+def load_pages(pdf_paths: List[str], pages: int, dpi: int) -> List[Tuple[np.ndarray, str]]:
+    """Render pages to grayscale, degraded like a scan, with their text layer as ground truth."""
+    sources = [open(path, "rb").read() for path in pdf_paths] or [make_sample_pdf(pages)]
+    rng = np.random.default_rng(0)
+    samples = []
+    for pdf_bytes in sources:
+        with fitz.open(stream=pdf_bytes, filetype="pdf") as doc:
+            for page in list(doc)[:pages]:
+                truth = page.get_text()
+                pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72, dpi / 72), colorspace=fitz.csGRAY, alpha=False)
+                img = cv2.GaussianBlur(pixmap_to_array(pix), (3, 3), 0).astype(np.int16)
+                img += rng.normal(0, 18, img.shape).astype(np.int16)
+                samples.append((np.clip(img, 0, 255).astype(np.uint8), truth))
+    return samples
+
+
+def legacy_preprocess(img: np.ndarray) -> np.ndarray:
+    """The pipeline before profiles: enhancement at render time, then the engine's threshold."""
+    blurred = cv2.GaussianBlur(img, (5, 5), 0)
+    threshold = cv2.adaptiveThreshold(blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+    opening = cv2.morphologyEx(threshold, cv2.MORPH_OPEN, np.ones((1, 1), np.uint8))
+    enhanced = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(opening)
+    return cv2.adaptiveThreshold(enhanced, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+
+
+def time_profile(profile: str, samples: List[Tuple[np.ndarray, str]]) -> Tuple[Dict[str, float], List[np.ndarray]]:
+    """Run a profile over the samples, returning the mean ms per page of each stage and the outputs."""
+    timings: Dict[str, float] = {}
+    outputs = []
+    for img, _ in samples:
+        img = img.copy()
+        for step in get_profile(profile):
+            start = time.perf_counter()
+            apply_step(img, step)
+            timings[step[0]] = timings.get(step[0], 0.0) + (time.perf_counter() - start) * 1000 / len(samples)
+        outputs.append(img)
+    return timings, outputs
+
+
+def load_engines(names: List[str]) -> Dict[str, Callable[[np.ndarray], str]]:
+    """Raw engine calls, bypassing the services' own preprocessing."""
+    engines = {}
+    if "tesseract" in names:
+        try:
+            import pytesseract
+            pytesseract.get_tesseract_version()
+            engines["tesseract"] = lambda img: pytesseract.image_to_string(img)
+        except Exception as e:
+            print(f"Skipping tesseract: {e}")
+    if "paddle" in names:
+        try:
+            from paddleocr import PaddleOCR
+            paddle = PaddleOCR(lang="en", use_angle_cls=False, show_log=False, enable_mkldnn=False)
+
+            def paddle_text(img: np.ndarray) -> str:
+                result = paddle.ocr(cv2.cvtColor(img, cv2.COLOR_GRAY2BGR), cls=False)
+                return "\n".join(line[1][0] for line in (result[0] or []))
+
+            engines["paddle"] = paddle_text
+        except Exception as e:
+            print(f"Skipping paddle: {e}")
+    return engines
+
+
+def accuracy(text: str, truth: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(text.split()), " ".join(truth.split())).ratio()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pdf", nargs="*", default=[], help="Digital PDFs to sample pages from")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per PDF")
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--engines", nargs="*", default=["tesseract", "paddle"])
+    args = parser.parse_args()
+
+    samples = load_pages(args.pdf, args.pages, args.dpi)
+    engines = load_engines(args.engines)
+    print(f"{len(samples)} pages at {args.dpi} DPI\n")
+
+    results: Dict[str, List[np.ndarray]] = {}
+    total_ms: Dict[str, float] = {}
+
+    print(f"{'profile':>10} {'stage':>20} {'ms/page':>10}")
+    for profile in PREPROCESSING_PROFILES:
+        timings, results[profile] = time_profile(profile, samples)
+        total_ms[profile] = sum(timings.values())
+        for stage, ms in timings.items():
+            print(f"{profile:>10} {stage:>20} {ms:>10.2f}")
+
+    start = time.perf_counter()
+    results["legacy"] = [legacy_preprocess(img) for img, _ in samples]
+    total_ms["legacy"] = (time.perf_counter() - start) * 1000 / len(samples)
+    print(f"{'legacy':>10} {'(all stages)':>20} {total_ms['legacy']:>10.2f}\n")
+
+    header = f"{'profile':>10} {'total ms':>10}" + "".join(f" {name + ' acc':>15}" for name in engines)
+    print(header)
+    for profile, outputs in results.items():
+        row = f"{profile:>10} {total_ms[profile]:>10.2f}"
+        for ocr in engines.values():
+            scores = [accuracy(ocr(img), truth) for img, (_, truth) in zip(outputs, samples)]
+            row += f" {np.mean(scores):>15.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Compare the NumPy and Chroma retriever backends of the RAG path.
+
+Chunk embeddings come from a deterministic random model, so the numbers
+measure the retrievers themselves and not the transformer. For each
+document size the script reports index build time and mean query latency.
+
+Usage (from llm_interaction_service/, with the service's env loaded):
+    python -m benchmarks.retriever_benchmark [--sizes 10 50 100 500] [--queries 50]
+"""
+import argparse
+import hashlib
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from app.core.document_index_store import DocumentIndexStore
+from app.services.chroma_retriever import ChromaRetriever
+from app.services.numpy_retriever import NumpyRetriever
+
+
+class RandomEmbeddings(Embeddings):
+    """Deterministic 384-dimensional vectors seeded by the text hash."""
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def embed_query(self, text: str) -> List[float]:
+        seed = int.from_bytes(hashlib.sha256(text.encode("utf-8")).digest()[:4], "little")
+        return np.random.default_rng(seed).standard_normal(self.dimension).astype(np.float32).tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return [self.embed_query(text) for text in texts]
+
+
+def make_document(chunk_count: int, chunk_size: int) -> str:
+    rng = np.random.default_rng(chunk_count)
+    words = ["invoice", "total", "tax", "item", "quantity", "price", "date", "due", "client", "amount"]
+    paragraphs = []
+    for _ in range(chunk_count):
+        paragraph = " ".join(rng.choice(words, size=chunk_size // 8))
+        paragraphs.append(paragraph[:chunk_size - 10])
+    return "\n\n".join(paragraphs)
+
+
+def time_queries(retriever, queries: List[str]) -> float:
+    start = time.perf_counter()
+    for query in queries:
+        retriever.similarity_search(query, k=5)
+    return (time.perf_counter() - start) / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 2000])
+    parser.add_argument("--queries", type=int, default=50)
+    args = parser.parse_args()
+
+    embeddings = RandomEmbeddings()
+    queries = [f"question {i}" for i in range(args.queries)]
+
+    print(f"{'chunks':>8} {'backend':>8} {'build ms':>10} {'query ms':>10}")
+    with tempfile.TemporaryDirectory() as persist_dir:
+        store = DocumentIndexStore(persist_dir)
+        for size in args.sizes:
+            text = make_document(size, store.chunk_size)
+            chunks = store.split_text(text)
+
+            start = time.perf_counter()
+            numpy_retriever = NumpyRetriever(chunks, embeddings)
+            numpy_build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            chroma_retriever = ChromaRetriever(store.get_or_create(text, embeddings, "random"))
+            chroma_build = time.perf_counter() - start
+
+            for name, build, retriever in (
+                ("numpy", numpy_build, numpy_retriever),
+                ("chroma", chroma_build, chroma_retriever),
+            ):
+                query = time_queries(retriever, queries)
+                print(f"{len(chunks):>8} {name:>8} {build * 1000:>10.2f} {query * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
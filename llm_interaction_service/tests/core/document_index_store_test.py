@@ -0,0 +1,91 @@
+import os
+
+from langchain_core.embeddings import Embeddings
+
+from app.core.document_index_store import DocumentIndexStore
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 1.0]
+
+
+def test_index_is_reused_across_requests(tmp_path):
+    embeddings = FakeEmbeddings()
+    store = DocumentIndexStore(str(tmp_path), chunk_size=20, chunk_overlap=0)
+    text = 'first paragraph\n\nsecond paragraph'
+
+    store.get_or_create(text, embeddings, 'fake').similarity_search('first', k=1)
+    embedded_on_build = len(embeddings.embedded)
+    reopened = DocumentIndexStore(str(tmp_path), chunk_size=20, chunk_overlap=0)
+    reopened.get_or_create(text, embeddings, 'fake').similarity_search('second', k=1)
+
+    assert embedded_on_build == 3
+    assert embeddings.embedded[embedded_on_build:] == ['second']
+
+
+def test_least_recently_used_indexes_are_collected(tmp_path):
+    store = DocumentIndexStore(str(tmp_path), max_indexes=1, gc_interval_seconds=0)
+
+    store.get_or_create('old document', FakeEmbeddings(), 'fake')
+    store.get_or_create('new document', FakeEmbeddings(), 'fake')
+
+    names = [getattr(collection, 'name', collection) for collection in store.client.list_collections()]
+    assert names == [store.make_collection_name('new document', 'fake')]
+
+
+def test_garbage_collection_is_throttled(tmp_path, monkeypatch):
+    store = DocumentIndexStore(str(tmp_path), max_indexes=1, gc_interval_seconds=600)
+    collections = []
+    monkeypatch.setattr(store, 'collect_garbage', lambda: collections.append(True))
+
+    store.get_or_create('old document', FakeEmbeddings(), 'fake')
+    store.get_or_create('new document', FakeEmbeddings(), 'fake')
+
+    assert collections == [True]
+
+
+def test_each_process_gets_its_own_directory(tmp_path):
+    store = DocumentIndexStore(str(tmp_path))
+
+    store.get_or_create('some document', FakeEmbeddings(), 'fake')
+
+    assert os.listdir(tmp_path) == [f'worker-{os.getpid()}']
+
+
+def test_directories_of_stopped_processes_are_removed(tmp_path, monkeypatch):
+    (tmp_path / 'worker-111').mkdir()
+    (tmp_path / 'worker-222').mkdir()
+    (tmp_path / 'other').mkdir()
+
+    def fake_kill(pid, signal):
+        if pid == 111:
+            raise ProcessLookupError
+
+    monkeypatch.setattr(os, 'kill', fake_kill)
+    DocumentIndexStore(str(tmp_path)).client
+
+    assert sorted(os.listdir(tmp_path)) == sorted(['other', 'worker-222', f'worker-{os.getpid()}'])
+
+
+def test_server_host_uses_http_client(tmp_path, monkeypatch):
+    from app.core import document_index_store
+
+    opened = []
+    monkeypatch.setattr(
+        document_index_store.chromadb, 'HttpClient', lambda host, port: opened.append((host, port)) or 'client'
+    )
+
+    store = DocumentIndexStore(str(tmp_path), host='chroma', port=8001)
+
+    assert store.client == 'client'
+    assert opened == [('chroma', 8001)]
+    assert os.listdir(tmp_path) == []
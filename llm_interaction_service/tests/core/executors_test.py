@@ -0,0 +1,52 @@
+import asyncio
+import os
+import threading
+
+import pytest
+
+from app.core.executors import (
+    IO_POOL, NATIVE_POOL, get_executor, run_cpu, run_io, run_native, run_pdf, shutdown_executors
+)
+
+
+def thread_name():
+    return threading.current_thread().name
+
+
+def test_work_runs_on_its_executor():
+    async def run_all():
+        return await asyncio.gather(
+            run_io(thread_name), run_native(thread_name), run_pdf(thread_name), run_cpu(os.getpid)
+        )
+
+    io_thread, native_thread, pdf_thread, cpu_pid = asyncio.run(run_all())
+
+    assert io_thread.startswith('io')
+    assert native_thread.startswith('native')
+    assert pdf_thread.startswith('pdf')
+    assert cpu_pid != os.getpid()
+
+
+def test_pdf_executor_has_a_single_thread():
+    async def run_many():
+        return await asyncio.gather(*[run_pdf(thread_name) for _ in range(8)])
+
+    assert len(set(asyncio.run(run_many()))) == 1
+
+
+def test_executors_are_shared_until_shut_down():
+    io_executor = get_executor(IO_POOL)
+    native_executor = get_executor(NATIVE_POOL)
+    assert get_executor(IO_POOL) is io_executor
+
+    shutdown_executors(IO_POOL)
+
+    assert get_executor(NATIVE_POOL) is native_executor
+    with pytest.raises(RuntimeError):
+        io_executor.submit(thread_name)
+    assert get_executor(IO_POOL) is not io_executor
+
+
+def test_unknown_executor_is_rejected():
+    with pytest.raises(ValueError):
+        get_executor('gpu')
@@ -0,0 +1,53 @@
+import os
+
+from app.core.extraction_cache import ExtractionCache
+
+
+def test_key_depends_on_content_and_settings():
+    key = ExtractionCache.make_key(b'%PDF-1', ocr_technology='paddle', dpi=300)
+
+    assert key == ExtractionCache.make_key(b'%PDF-1', dpi=300, ocr_technology='paddle')
+    assert key != ExtractionCache.make_key(b'%PDF-2', ocr_technology='paddle', dpi=300)
+    assert key != ExtractionCache.make_key(b'%PDF-1', ocr_technology='tesseract', dpi=300)
+
+
+def test_memory_lru_evicts_least_recently_used():
+    cache = ExtractionCache(memory_entries=2)
+    cache.put('a', ['page a'], [])
+    cache.put('b', ['page b'], [])
+    cache.get('a')
+    cache.put('c', ['page c'], [])
+
+    assert cache.get('a')['page_texts'] == ['page a']
+    assert cache.get('b') is None
+    assert cache.get('c')['page_texts'] == ['page c']
+    assert cache.stats() == {'memory_hits': 3, 'disk_hits': 0, 'misses': 1, 'memory_entries': 2}
+
+
+def test_disk_tier_is_shared_and_size_bounded(tmp_path):
+    writer = ExtractionCache(memory_entries=0, disk_dir=str(tmp_path), disk_max_bytes=60)
+    writer.put('old', ['x' * 10], [])
+    os.utime(tmp_path / 'old.json', (0, 0))
+    writer.put('new', ['y' * 10], [])
+
+    reader = ExtractionCache(disk_dir=str(tmp_path))
+
+    assert reader.get('new')['page_texts'] == ['y' * 10]
+    assert reader.get('old') is None
+    assert reader.stats()['disk_hits'] == 1
+
+
+def test_page_metadata_is_cached_with_the_texts(tmp_path):
+    pages = [{'page': 1, 'source': 'ocr', 'ink_ratio': 0.02, 'crop': [40.0, 50.0, 560.0, 700.0]},
+             {'page': 2, 'source': 'skipped', 'reason': 'blank', 'ink_ratio': 0.0}]
+    ExtractionCache(disk_dir=str(tmp_path)).put('doc', ['text', ''], pages)
+
+    entry = ExtractionCache(disk_dir=str(tmp_path)).get('doc')
+
+    assert entry == {'page_texts': ['text', ''], 'pages': pages}
+
+
+def test_entries_without_page_metadata_are_misses(tmp_path):
+    (tmp_path / 'doc.json').write_text('["text"]')
+
+    assert ExtractionCache(disk_dir=str(tmp_path)).get('doc') is None
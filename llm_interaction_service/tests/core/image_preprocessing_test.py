@@ -0,0 +1,40 @@
+import cv2
+import numpy as np
+import pytest
+
+from app.core import image_preprocessing
+from app.core.image_preprocessing import get_profile, preprocess
+
+
+def make_page():
+    return np.random.default_rng(0).integers(0, 256, (60, 80), dtype=np.uint8)
+
+
+def test_binarize_matches_blur_then_threshold_and_keeps_input():
+    page = make_page()
+    original = page.copy()
+
+    result = preprocess(page, 'binarize')
+
+    expected = cv2.adaptiveThreshold(
+        cv2.GaussianBlur(original, (5, 5), 0), 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+    assert np.array_equal(result, expected)
+    assert np.array_equal(page, original)
+
+
+def test_inplace_reuses_the_page_buffer():
+    page = make_page()
+
+    assert preprocess(page, 'binarize', inplace=True) is page
+
+
+def test_noop_steps_are_dropped(monkeypatch):
+    monkeypatch.setitem(image_preprocessing.PREPROCESSING_PROFILES, 'legacy', [
+        ('gaussian_blur', {'ksize': 5}),
+        ('open', {'kernel_size': 1}),
+    ])
+
+    assert get_profile('legacy') == [('gaussian_blur', {'ksize': 5})]
+    with pytest.raises(ValueError):
+        get_profile('missing')
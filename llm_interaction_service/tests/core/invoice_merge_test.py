@@ -0,0 +1,28 @@
+from app.core.invoice_merge import merge_invoice_parts, split_pages_by_token_budget
+
+
+def test_pages_are_grouped_within_budget():
+    pages = ['a' * 30, 'b' * 30, 'c' * 30, '', 'd' * 100]
+
+    chunks = split_pages_by_token_budget(pages, max_tokens=20)
+
+    assert chunks == ['a' * 30 + '\n' + 'b' * 30, 'c' * 30, 'd' * 80, 'd' * 20]
+
+
+def test_parts_are_merged_deterministically():
+    tax = {'description': 'TAX', 'quantity': '1', 'unit_price': '19'}
+    parts = [
+        {'number': 'INV-1', 'date': '2024-01-01', 'total': '', 'items': [{'description': 'Desk'}, tax]},
+        {'number': 'INV-1', 'date': '2024-02-01', 'total': '100', 'items': [{'description': 'Chair'}, tax]},
+        {'number': 'ORDER-7', 'total': '119', 'items': [], 'currency': 'EUR'},
+    ]
+
+    merged = merge_invoice_parts(parts)
+
+    assert merged == {
+        'number': 'INV-1',
+        'date': '2024-01-01',
+        'total': '119',
+        'items': [{'description': 'Desk'}, tax, {'description': 'Chair'}],
+        'currency': 'EUR',
+    }
@@ -0,0 +1,98 @@
+import io
+import os
+import time
+
+from app.core.job_queue import JobQueue, QUEUED, RUNNING, SUCCEEDED, FAILED
+from app.core.upload_spool import spool_stream
+
+
+def test_job_lifecycle(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    job_id = queue.submit({'model': 'llama2'}, b'%PDF')
+
+    job = queue.claim()
+    assert job['id'] == job_id
+    assert job['status'] == RUNNING
+    assert queue.read_file(job) == b'%PDF'
+    assert queue.claim() is None
+
+    assert queue.update_progress(job_id, 1, 'page_ocr', {'page': 1}) is True
+    assert queue.complete(job_id, 1, {'number': 'INV-1'}) is True
+
+    job = queue.get(job_id)
+    assert (job['status'], job['stage'], job['progress'], job['result']) == (
+        SUCCEEDED, 'page_ocr', {'page': 1}, {'number': 'INV-1'}
+    )
+    assert job['file_path'] is None
+
+
+def test_failed_jobs_are_retried_until_max_attempts(tmp_path):
+    queue = JobQueue(str(tmp_path), max_attempts=2, retry_backoff_seconds=0)
+    job_id = queue.submit({}, b'%PDF')
+
+    assert queue.fail(job_id, queue.claim()['attempts'], 'LLM timed out') is True
+    assert queue.get(job_id)['status'] == QUEUED
+    assert queue.fail(job_id, queue.claim()['attempts'], 'LLM timed out') is False
+
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts'], job['error']) == (FAILED, 2, 'LLM timed out')
+
+
+def test_client_errors_are_not_retried(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    job_id = queue.submit({}, b'%PDF')
+
+    assert queue.fail(job_id, queue.claim()['attempts'], 'Prompt is required', retryable=False) is False
+    assert queue.get(job_id)['status'] == FAILED
+
+
+def test_expired_lease_is_claimed_again(tmp_path):
+    queue = JobQueue(str(tmp_path), lease_seconds=0)
+    job_id = queue.submit({}, b'%PDF')
+    queue.claim()
+    time.sleep(0.01)
+
+    job = queue.claim()
+    assert job['id'] == job_id
+    assert job['attempts'] == 2
+
+
+def test_worker_that_lost_its_lease_cannot_finish_the_job(tmp_path):
+    queue = JobQueue(str(tmp_path), lease_seconds=0, retry_backoff_seconds=0)
+    job_id = queue.submit({}, b'%PDF')
+    stale = queue.claim()
+    time.sleep(0.01)
+    current = queue.claim()
+
+    assert queue.update_progress(job_id, stale['attempts'], 'page_ocr') is False
+    assert queue.complete(job_id, stale['attempts'], {'number': 'stale'}) is False
+    assert queue.fail(job_id, stale['attempts'], 'LLM timed out') is False
+    assert queue.fail(job_id, stale['attempts'], 'Prompt is required', retryable=False) is False
+    job = queue.get(job_id)
+    assert (job['status'], job['error'], job['result']) == (RUNNING, None, None)
+    assert os.path.exists(job['file_path'])
+
+    assert queue.complete(job_id, current['attempts'], {'number': 'INV-1'}) is True
+    assert queue.get(job_id)['result'] == {'number': 'INV-1'}
+
+
+def test_purge_deletes_only_old_finished_jobs(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    finished = queue.submit({}, b'%PDF')
+    queue.complete(finished, queue.claim()['attempts'], {})
+    queued = queue.submit({}, b'%PDF')
+
+    assert queue.purge(older_than_seconds=3600) == 0
+    assert queue.purge(older_than_seconds=-1) == 1
+    assert queue.get(finished) is None
+    assert queue.get(queued)['status'] == QUEUED
+
+
+def test_submit_moves_spooled_upload(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    upload = spool_stream(io.BytesIO(b'%PDF'))
+
+    job = queue.get(queue.submit({}, upload))
+
+    assert not os.path.exists(upload.path)
+    assert queue.open_file(job).read_bytes() == b'%PDF'
@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from app.core.job_queue import JobQueue, SUCCEEDED
+from app.core.job_workers import JobWorkerPool
+
+
+def test_workers_purge_finished_jobs_past_retention(tmp_path):
+    queue = JobQueue(str(tmp_path))
+    job_id = queue.submit({}, b'%PDF')
+    queue.complete(job_id, queue.claim()['attempts'], {})
+    pool = JobWorkerPool(queue, poll_interval=0.01, retention_seconds=-1)
+
+    async def run_briefly():
+        pool.start()
+        await asyncio.sleep(0.05)
+        await pool.stop()
+
+    asyncio.run(run_briefly())
+
+    assert queue.get(job_id) is None
+
+
+def test_purge_runs_once_per_interval(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path))
+    purges = []
+    monkeypatch.setattr(queue, 'purge', lambda older_than_seconds: purges.append(older_than_seconds) or 0)
+    pool = JobWorkerPool(queue, retention_seconds=60)
+
+    async def purge_twice():
+        await pool.purge_if_due()
+        await pool.purge_if_due()
+
+    asyncio.run(purge_twice())
+
+    assert purges == [60]
+
+
+def test_result_of_a_reclaimed_job_is_discarded(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path), lease_seconds=0)
+    job_id = queue.submit({}, b'%PDF')
+    stale = queue.claim()
+    time.sleep(0.01)
+    current = queue.claim()
+
+    class FakeParseFileService:
+        def __init__(self, **kwargs):
+            pass
+
+        async def process_stream(self, pdf, **params):
+            yield {'event': 'result', 'data': {'number': 'stale'}}
+
+    monkeypatch.setattr('app.core.job_workers.ParseFileService', FakeParseFileService)
+    asyncio.run(JobWorkerPool(queue).process_job(stale))
+
+    assert queue.get(job_id)['result'] is None
+    queue.complete(job_id, current['attempts'], {'number': 'INV-1'})
+    assert queue.get(job_id)['status'] == SUCCEEDED
+
+
+def test_stream_is_closed_before_the_job_is_completed(tmp_path, monkeypatch):
+    queue = JobQueue(str(tmp_path))
+    job_id = queue.submit({}, b'%PDF')
+    job = queue.claim()
+    calls = []
+
+    class FakeParseFileService:
+        def __init__(self, **kwargs):
+            pass
+
+        async def process_stream(self, pdf, **params):
+            try:
+                yield {'event': 'result', 'data': {'number': 'INV-1'}}
+                yield {'event': 'stage', 'data': {'stage': 'never_reached'}}
+            finally:
+                calls.append('stream_closed')
+
+    complete = queue.complete
+    monkeypatch.setattr(queue, 'complete', lambda *args: calls.append('completed') or complete(*args))
+    monkeypatch.setattr('app.core.job_workers.ParseFileService', FakeParseFileService)
+
+    asyncio.run(JobWorkerPool(queue).process_job(job))
+
+    assert calls == ['stream_closed', 'completed']
+    assert queue.get(job_id)['status'] == SUCCEEDED
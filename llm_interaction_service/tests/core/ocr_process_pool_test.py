@@ -0,0 +1,88 @@
+import asyncio
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from app.core import ocr_process_pool
+from app.core.ocr_process_pool import SharedPageBuffer, _ocr_shared_page, ocr_pages_in_process_pool
+from app.factories.ocr_service_registry import ocr_service_registry
+
+
+class FakeOCRService:
+    def extract_text_from_image_sync(self, image, lang):
+        if isinstance(image, np.ndarray):
+            if image.dtype != np.uint8:
+                return f'{lang} {image.dtype} {image.shape} {image.sum():g}'
+            return f'{lang} {image.shape} {int(image.sum())}'
+        if bytes(image) == b'broken':
+            raise ValueError('Could not decode page image')
+        return f'{lang} encoded {bytes(image).decode()}'
+
+
+def use_fake_service(monkeypatch, checkouts):
+    @contextmanager
+    def checkout(service_name, lang='en', **options):
+        checkouts.append((service_name, lang, options))
+        yield FakeOCRService()
+
+    monkeypatch.setattr(ocr_service_registry, 'checkout', checkout)
+
+
+async def run_in_process(func, *args):
+    return func(*args)
+
+
+def test_pages_round_trip_through_shared_memory(monkeypatch):
+    checkouts = []
+    use_fake_service(monkeypatch, checkouts)
+    pages = [np.ones((2, 3), np.uint8), b'png', np.full((2, 2, 3), 2, np.uint8)]
+
+    with SharedPageBuffer(pages) as buffer:
+        texts = [
+            _ocr_shared_page('paddle', 'en', (('use_gpu', False),), buffer.name, offset, length, shape, dtype, 'eng')
+            for offset, length, shape, dtype in buffer.spans
+        ]
+
+    assert texts == ['eng (2, 3) 6', 'eng encoded png', 'eng (2, 2, 3) 24']
+    assert checkouts[0] == ('paddle', 'en', {'use_gpu': False})
+
+
+def test_pages_keep_their_dtype_through_shared_memory(monkeypatch):
+    use_fake_service(monkeypatch, [])
+    pages = [np.full((2, 3), 0.5, np.float32), np.full((2, 2), 1000, np.uint16), np.ones((1, 2), np.uint8)]
+
+    with SharedPageBuffer(pages) as buffer:
+        texts = [
+            _ocr_shared_page('paddle', 'en', (), buffer.name, offset, length, shape, dtype, 'eng')
+            for offset, length, shape, dtype in buffer.spans
+        ]
+
+    assert texts == ['eng float32 (2, 3) 3', 'eng uint16 (2, 2) 4000', 'eng (1, 2) 2']
+
+
+def test_buffer_is_unlinked_after_the_pages_are_read(monkeypatch):
+    use_fake_service(monkeypatch, [])
+    buffer_names = set()
+
+    async def run_and_record(func, *args):
+        buffer_names.add(args[3])
+        return func(*args)
+
+    monkeypatch.setattr(ocr_process_pool, 'run_cpu', run_and_record)
+
+    texts = asyncio.run(ocr_pages_in_process_pool('tesseract', 'en', {}, [np.ones((1, 1), np.uint8), b'x'], 'eng'))
+
+    assert texts == ['eng (1, 1) 1', 'eng encoded x']
+    name, = buffer_names
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=name)
+
+
+def test_worker_errors_are_raised_as_picklable_errors(monkeypatch):
+    use_fake_service(monkeypatch, [])
+    monkeypatch.setattr(ocr_process_pool, 'run_cpu', run_in_process)
+
+    with pytest.raises(RuntimeError, match='Could not decode page image'):
+        asyncio.run(ocr_pages_in_process_pool('tesseract', 'en', {}, [b'ok', b'broken'], 'eng'))
@@ -0,0 +1,23 @@
+import numpy as np
+
+from app.core.page_content import find_content
+
+
+def test_finds_box_around_ink_and_ignores_dust():
+    preview = np.full((100, 80), 255, np.uint8)
+    preview[20:30, 10:50] = 0
+    preview[70:74, 15:60] = 40
+    preview[90, 5] = 0
+
+    ink_ratio, largest_mark, box = find_content(preview)
+
+    assert box == (10, 20, 60, 74)
+    assert largest_mark == 10 * 40
+    assert ink_ratio == (10 * 40 + 4 * 45) / preview.size
+
+
+def test_blank_page_has_no_content():
+    preview = np.full((100, 80), 250, np.uint8)
+    preview[50, 50] = 0
+
+    assert find_content(preview) == (0.0, 0, None)
@@ -0,0 +1,53 @@
+import gc
+
+import cv2
+import fitz
+import numpy as np
+import pytest
+
+from app.core.page_image import pixmap_to_array, to_array, to_pil_image, to_png_bytes
+
+
+def test_pixmap_is_wrapped_without_copying():
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 3, 2), False)
+    pix.set_pixel(2, 1, (10, 20, 30))
+
+    array = pixmap_to_array(pix)
+    del pix
+    gc.collect()
+
+    assert array.shape == (2, 3, 3)
+    assert array[1, 2].tolist() == [10, 20, 30]
+    assert np.shares_memory(array, np.asarray(array.pixmap.samples_mv))
+
+
+def test_gray_pixmap_becomes_a_2d_array():
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, 4, 3), False)
+    pix.clear_with(200)
+
+    array = pixmap_to_array(pix)
+
+    assert array.shape == (3, 4)
+    assert (array == 200).all()
+
+
+def test_encoded_pages_are_decoded_and_arrays_passed_through():
+    page = np.zeros((5, 6, 3), np.uint8)
+    page[..., 2] = 255
+
+    assert to_array(page) is page
+    assert to_array(page, gray=True).shape == (5, 6)
+    decoded = to_array(to_png_bytes(page))
+    assert np.array_equal(decoded, page)
+    assert to_array(memoryview(to_png_bytes(page)), gray=True).shape == (5, 6)
+    with pytest.raises(ValueError):
+        to_array(b'not an image')
+
+
+def test_pil_images_are_rgb():
+    page = np.zeros((2, 2, 3), np.uint8)
+    page[..., 0] = 255
+
+    assert to_pil_image(page).getpixel((0, 0)) == (0, 0, 255)
+    assert to_pil_image(cv2.imencode('.png', page)[1].tobytes()).getpixel((0, 0)) == (0, 0, 255)
+    assert to_png_bytes(b'png') == b'png'
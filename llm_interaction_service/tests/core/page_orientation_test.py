@@ -0,0 +1,50 @@
+import cv2
+import fitz
+import numpy as np
+import pytest
+
+from app.core.page_image import pixmap_to_array
+from app.core.page_orientation import apply_orientation, detect_orientation
+
+
+def render_page():
+    doc = fitz.open()
+    page = doc.new_page()
+    for i in range(12):
+        page.insert_text((60, 80 + i * 22), f'Invoice line {i}: Consulting hours billed to Northwind {i * 17}.00', fontsize=11)
+    pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), colorspace=fitz.csGRAY, alpha=False)
+    return pixmap_to_array(pix).copy()
+
+
+def turn(img, rotation, skew):
+    codes = {90: cv2.ROTATE_90_COUNTERCLOCKWISE, 180: cv2.ROTATE_180, 270: cv2.ROTATE_90_CLOCKWISE}
+    if rotation:
+        img = cv2.rotate(img, codes[rotation])
+    h, w = img.shape
+    matrix = cv2.getRotationMatrix2D((w / 2, h / 2), -skew, 1.0)
+    return cv2.warpAffine(img, matrix, (w, h), borderValue=255)
+
+
+@pytest.mark.parametrize('rotation', [0, 90, 180, 270])
+def test_detects_rotation_and_skew(rotation):
+    orientation = detect_orientation(turn(render_page(), rotation, 2))
+
+    assert orientation.rotation == rotation
+    assert orientation.skew == pytest.approx(2, abs=0.5)
+    assert orientation.confidence > 0.5
+
+
+def test_applied_orientation_makes_page_upright():
+    page = turn(render_page(), 180, -3)
+
+    upright = apply_orientation(page, detect_orientation(page))
+
+    orientation = detect_orientation(upright)
+    assert orientation.rotation == 0
+    assert orientation.skew == pytest.approx(0, abs=0.5)
+
+
+def test_blank_page_is_upright():
+    orientation = detect_orientation(np.full((100, 80), 255, np.uint8))
+
+    assert (orientation.rotation, orientation.skew) == (0, 0)
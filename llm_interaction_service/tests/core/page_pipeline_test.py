@@ -0,0 +1,78 @@
+import asyncio
+from contextlib import aclosing
+
+import pytest
+
+from app.core.page_pipeline import prefetch_batches
+
+
+class PageSource:
+    def __init__(self, pages, fail_after=None):
+        self.pages = pages
+        self.fail_after = fail_after
+        self.produced = 0
+        self.closed = False
+
+    async def __aiter__(self):
+        try:
+            for page in range(self.pages):
+                if page == self.fail_after:
+                    raise ValueError('page could not be rendered')
+                self.produced += 1
+                yield page
+                await asyncio.sleep(0)
+        finally:
+            self.closed = True
+
+
+def collect(source, maxsize, max_batch):
+    async def run():
+        return [batch async for batch in prefetch_batches(source.__aiter__(), maxsize, max_batch)]
+    return asyncio.run(run())
+
+
+def test_batches_keep_source_order():
+    batches = collect(PageSource(10), maxsize=4, max_batch=3)
+
+    assert [page for batch in batches for page in batch] == list(range(10))
+    assert all(1 <= len(batch) <= 3 for batch in batches)
+
+
+def test_producer_stops_when_the_queue_is_full():
+    source = PageSource(100)
+
+    async def consume_slowly():
+        async with aclosing(prefetch_batches(source.__aiter__(), maxsize=2, max_batch=1)) as batches:
+            async for _ in batches:
+                await asyncio.sleep(0.05)
+                # One page handed out, two queued and one waiting to be queued
+                return source.produced
+
+    assert asyncio.run(consume_slowly()) <= 4
+
+
+def test_source_failure_is_raised_after_earlier_pages():
+    source = PageSource(5, fail_after=2)
+    pages = []
+
+    async def run():
+        async for batch in prefetch_batches(source.__aiter__(), maxsize=1, max_batch=1):
+            pages.extend(batch)
+
+    with pytest.raises(ValueError, match='page could not be rendered'):
+        asyncio.run(run())
+    assert pages == [0, 1]
+    assert source.closed
+
+
+def test_stopping_early_cancels_the_producer_and_closes_the_source():
+    source = PageSource(100)
+
+    async def take_first():
+        async with aclosing(prefetch_batches(source.__aiter__(), maxsize=2, max_batch=2)) as batches:
+            async for batch in batches:
+                return batch
+
+    assert asyncio.run(take_first())[0] == 0
+    assert source.closed
+    assert source.produced < 100
@@ -0,0 +1,40 @@
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app.core.upload_spool import move_upload, spool_stream
+
+
+def test_spool_stream_hashes_and_closes():
+    content = b'%PDF' * 1000
+
+    upload = spool_stream(io.BytesIO(content))
+
+    assert upload.size == len(content)
+    assert upload.sha256 == hashlib.sha256(content).hexdigest()
+    assert upload.read_bytes() == content
+    upload.close()
+    assert not os.path.exists(upload.path)
+
+
+def test_spool_stream_enforces_size_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr('app.core.upload_spool.config.upload_spool_dir', str(tmp_path))
+
+    with pytest.raises(HTTPException) as error:
+        spool_stream(io.BytesIO(b'x' * 100), max_bytes=10)
+
+    assert error.value.status_code == 413
+    assert os.listdir(tmp_path) == []
+
+
+def test_moved_upload_is_not_deleted_on_close(tmp_path):
+    upload = spool_stream(io.BytesIO(b'%PDF'))
+
+    moved = move_upload(upload, str(tmp_path / 'job.bin'))
+    moved.close()
+
+    assert moved.read_bytes() == b'%PDF'
+    assert not os.path.exists(upload.path)
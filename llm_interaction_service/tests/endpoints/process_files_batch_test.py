@@ -0,0 +1,50 @@
+import io
+import json
+import zipfile
+
+import fitz
+
+from app.core.config import config
+from app.factories.llm_interaction_service_factory import LlmInteractionServiceFactory
+
+
+class FakeLlmService:
+    async def generate_completion(self, model, prompt, stream=False):
+        number = 'INV' + prompt['system'].split('Invoice INV')[1].split()[0]
+        yield {'response': json.dumps({'number': number})}
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    return doc.tobytes()
+
+
+def test_batch_streams_one_line_per_file(client, monkeypatch):
+    monkeypatch.setattr(
+        LlmInteractionServiceFactory, 'create_llm_interaction_service',
+        staticmethod(lambda *args: FakeLlmService())
+    )
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.writestr('march/INV-2.pdf', make_pdf('Invoice INV-2 for March'))
+        zf.writestr('notes.txt', 'not an invoice')
+
+    response = client.post(
+        f'/llm-interaction-api/v1/process-files/batch?client_id={config.client_ids[0]}',
+        headers={'Authorization': config.api_access_tokens[0]},
+        data={'model': 'model', 'processing_type': 'parse'},
+        files=[
+            ('files', ('INV-1.pdf', make_pdf('Invoice INV-1 for February'), 'application/pdf')),
+            ('files', ('batch.zip', archive.getvalue(), 'application/zip')),
+            ('files', ('broken.pdf', b'not a pdf', 'application/pdf')),
+        ]
+    )
+
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    results = {line['filename']: line for line in lines[:-1]}
+    assert response.status_code == 200
+    assert results['INV-1.pdf']['result'] == {'number': 'INV-1'}
+    assert results['batch.zip/march/INV-2.pdf']['result'] == {'number': 'INV-2'}
+    assert results['broken.pdf']['status'] == 'failed'
+    assert lines[-1] == {'done': True, 'succeeded': 2, 'failed': 1}
@@ -0,0 +1,70 @@
+from app.factories.ocr_service_registry import OCRServiceRegistry
+from app.factories.ocr_service_factory import OCRServiceFactory
+from app.services.cascade_ocr_service import CascadeOCRService
+
+
+class FakeOCRService:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_checkout_creates_service_once(monkeypatch):
+    created = []
+
+    def fake_create(service_name, lang="en", **options):
+        created.append((service_name, lang, options))
+        return FakeOCRService()
+
+    monkeypatch.setattr(OCRServiceFactory, 'create_ocr_service', staticmethod(fake_create))
+    registry = OCRServiceRegistry()
+
+    with registry.checkout('paddle') as first:
+        pass
+    with registry.checkout('PADDLE') as second:
+        pass
+    with registry.checkout('paddle', lang='fr') as other:
+        pass
+
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+
+
+def test_evict_defers_close_until_checkout_returned(monkeypatch):
+    monkeypatch.setattr(OCRServiceFactory, 'create_ocr_service', staticmethod(lambda **_: FakeOCRService()))
+    registry = OCRServiceRegistry()
+
+    with registry.checkout('tesseract') as service:
+        assert registry.evict('tesseract') is True
+        assert service.closed is False
+
+    assert service.closed is True
+    assert registry.keys() == []
+    assert registry.evict('tesseract') is False
+
+
+def test_options_at_factory_defaults_share_the_default_key():
+    assert OCRServiceRegistry.make_key('paddle', 'en', use_gpu=False) == OCRServiceRegistry.make_key('paddle', 'en')
+    assert OCRServiceRegistry.make_key('paddle', 'en') == ('paddle', 'en', ())
+    assert OCRServiceRegistry.make_key('paddle', 'en', use_gpu=True) == ('paddle', 'en', (('use_gpu', True),))
+
+
+def test_cascade_reuses_the_warm_paddle_service(monkeypatch):
+    created = []
+
+    def fake_create(service_name, lang="en", **options):
+        created.append(service_name)
+        return FakeOCRService()
+
+    monkeypatch.setattr(OCRServiceFactory, 'create_ocr_service', staticmethod(fake_create))
+    registry = OCRServiceRegistry()
+    registry.warm_up('paddle')
+
+    with registry.checkout('paddle', 'en', **CascadeOCRService().engine_options):
+        pass
+
+    assert created == ['paddle']
+    assert registry.keys() == [('paddle', 'en', ())]
@@ -0,0 +1,74 @@
+import sqlite3
+import time
+from contextlib import closing
+
+from langchain_core.embeddings import Embeddings
+
+from app.services import cached_embeddings
+from app.services.cached_embeddings import CachedEmbeddings
+
+
+class FakeEmbeddings(Embeddings):
+    def __init__(self):
+        self.embedded = []
+
+    def embed_documents(self, texts):
+        self.embedded.extend(texts)
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text):
+        self.embedded.append(text)
+        return [float(len(text)), 0.0]
+
+
+def test_only_new_texts_are_embedded():
+    model = FakeEmbeddings()
+    embeddings = CachedEmbeddings(model, model_name='fake')
+
+    first = embeddings.embed_documents(['a', 'bb', 'a'])
+    second = embeddings.embed_documents(['bb', 'ccc'])
+
+    assert first == [[1.0, 1.0], [2.0, 1.0], [1.0, 1.0]]
+    assert second == [[2.0, 1.0], [3.0, 1.0]]
+    assert model.embedded == ['a', 'bb', 'ccc']
+
+
+def test_vectors_persist_across_instances(tmp_path):
+    path = str(tmp_path / 'embeddings.sqlite3')
+    CachedEmbeddings(FakeEmbeddings(), model_name='fake', sqlite_path=path).embed_documents(['page'])
+
+    model = FakeEmbeddings()
+    embeddings = CachedEmbeddings(model, model_name='fake', sqlite_path=path)
+
+    assert embeddings.embed_documents(['page']) == [[4.0, 1.0]]
+    assert embeddings.embed_query('page') == [4.0, 0.0]
+    assert model.embedded == ['page']
+
+
+def test_sqlite_file_evicts_least_recently_used_vectors(tmp_path):
+    path = str(tmp_path / 'embeddings.sqlite3')
+    CachedEmbeddings(FakeEmbeddings(), model_name='fake', sqlite_path=path, sqlite_max_entries=2).embed_documents(['a', 'bb'])
+    embeddings = CachedEmbeddings(FakeEmbeddings(), model_name='fake', sqlite_path=path, sqlite_max_entries=2)
+    embeddings.embed_documents(['a'])
+    embeddings.embed_documents(['ccc'])
+
+    model = FakeEmbeddings()
+    CachedEmbeddings(model, model_name='fake', sqlite_path=path, sqlite_max_entries=2).embed_documents(['a', 'bb', 'ccc'])
+
+    assert model.embedded == ['bb']
+
+
+def test_sqlite_file_expires_unused_vectors(tmp_path, monkeypatch):
+    path = str(tmp_path / 'embeddings.sqlite3')
+    with closing(sqlite3.connect(path)) as conn, conn:
+        # A file written before vectors were evicted
+        conn.execute("CREATE TABLE embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+    CachedEmbeddings(FakeEmbeddings(), model_name='fake', sqlite_path=path, sqlite_ttl_seconds=3600).embed_documents(['old'])
+    now = time.time()
+    monkeypatch.setattr(cached_embeddings.time, 'time', lambda: now + 7200)
+    CachedEmbeddings(FakeEmbeddings(), model_name='fake', sqlite_path=path, sqlite_ttl_seconds=3600).embed_documents(['new'])
+
+    model = FakeEmbeddings()
+    CachedEmbeddings(model, model_name='fake', sqlite_path=path).embed_documents(['old', 'new'])
+
+    assert model.embedded == ['old']
@@ -0,0 +1,84 @@
+import asyncio
+
+from app.interfaces.llm_interaction_service_interface import LlmInteractionServiceInterface
+from app.services.cached_llm_interaction_service import CachedLlmInteractionService
+from app.services.in_memory_completion_cache_backend import InMemoryCompletionCacheBackend
+from app.services.parse_file_service import ParseFileService
+from app.services.sqlite_completion_cache_backend import SqliteCompletionCacheBackend
+
+
+class FakeLlmService(LlmInteractionServiceInterface):
+    def __init__(self, temperature):
+        self.temperature = temperature
+        self.calls = 0
+
+    def generation_params(self):
+        return {'temperature': self.temperature}
+
+    async def generate_completion(self, model, prompt, stream=False):
+        self.calls += 1
+        yield {'response': f"completion {self.calls}"}
+
+
+def complete(service, prompt):
+    async def collect():
+        return [chunk async for chunk in service.generate_completion(model='model', prompt=prompt)]
+    return asyncio.run(collect())
+
+
+def test_deterministic_completions_are_cached():
+    llm = FakeLlmService(temperature=0)
+    service = CachedLlmInteractionService(llm, InMemoryCompletionCacheBackend(), provider='groq_cloud')
+
+    first = complete(service, {'system': 'ctx', 'user': 'question'})
+    second = complete(service, {'system': '  ctx\n', 'user': 'question'})
+    other = complete(service, {'system': 'ctx', 'user': 'another question'})
+
+    assert first == second == [{'response': 'completion 1'}]
+    assert other == [{'response': 'completion 2'}]
+    assert llm.calls == 2
+
+
+def test_sampled_completions_are_not_cached():
+    llm = FakeLlmService(temperature=None)
+    service = CachedLlmInteractionService(llm, InMemoryCompletionCacheBackend(), provider='ollama_local')
+
+    complete(service, {'system': 'ctx', 'user': 'question'})
+    complete(service, {'system': 'ctx', 'user': 'question'})
+
+    assert llm.calls == 2
+
+
+def test_rejected_completions_are_not_cached():
+    llm = FakeLlmService(temperature=0)
+    service = CachedLlmInteractionService(
+        llm, InMemoryCompletionCacheBackend(), provider='groq_cloud',
+        validate=ParseFileService._is_json_completion
+    )
+
+    first = complete(service, {'system': 'ctx', 'user': 'question'})
+    second = complete(service, {'system': 'ctx', 'user': 'question'})
+
+    assert first == [{'response': 'completion 1'}]
+    assert second == [{'response': 'completion 2'}]
+    assert llm.calls == 2
+
+
+def test_valid_json_completions_are_accepted():
+    assert ParseFileService._is_json_completion([{'response': '{"number": '}, {'response': '"INV-1"}'}])
+    assert not ParseFileService._is_json_completion([{'response': '{"number": "INV-1"'}])
+
+
+def test_backends_expire_and_evict(tmp_path):
+    for backend in (InMemoryCompletionCacheBackend(max_entries=2),
+                    SqliteCompletionCacheBackend(str(tmp_path / 'cache.sqlite3'), max_entries=2)):
+        backend.set('expired', [{'response': 'x'}], ttl_seconds=-1)
+        backend.set('a', [{'response': 'a'}])
+        backend.set('b', [{'response': 'b'}])
+        backend.get('a')
+        backend.set('c', [{'response': 'c'}])
+
+        assert backend.get('expired') is None
+        assert backend.get('a') == [{'response': 'a'}]
+        assert backend.get('b') is None
+        assert backend.get('c') == [{'response': 'c'}]
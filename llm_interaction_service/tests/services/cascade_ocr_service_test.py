@@ -0,0 +1,72 @@
+from contextlib import contextmanager
+
+import numpy as np
+
+from app.core.constants import OCRService
+from app.factories.ocr_service_registry import ocr_service_registry
+from app.services.cascade_ocr_service import CascadeOCRService
+
+
+def word(text, confidence, line_num, left):
+    return {
+        'text': text, 'confidence': confidence, 'block_num': 1, 'par_num': 1, 'line_num': line_num,
+        'left': left, 'top': line_num * 20, 'width': 30, 'height': 12
+    }
+
+
+class FakeTesseract:
+    def extract_text_with_confidence_sync(self, image, lang):
+        blocks = [
+            word('Invoice', 96, 1, 10), word('INV-1', 91, 1, 50),
+            word('Tota1', 40, 2, 10), word('1OO', 55, 2, 50),
+            word('Thank', 93, 3, 10), word('you', 95, 3, 50),
+        ]
+        return {'text': '', 'avg_confidence': 78.3, 'blocks': blocks}
+
+
+class FakePaddle:
+    def __init__(self):
+        self.crops = []
+        self.pages = 0
+
+    def extract_text_with_confidence_batched_sync(self, crops, orient=True):
+        self.crops.extend(crops)
+        return [{'text': 'Total 100', 'avg_confidence': 0.98}] * len(crops)
+
+    def extract_text_with_confidence_sync(self, image, lang='en'):
+        self.pages += 1
+        return {'text': 'paddle page', 'avg_confidence': 0.95, 'blocks': [{'text': 'paddle page', 'confidence': 0.95}]}
+
+
+def use_engines(monkeypatch, tesseract, paddle):
+    @contextmanager
+    def checkout(service_name, lang='en', **options):
+        yield tesseract if service_name == OCRService.TESSERACT else paddle
+
+    monkeypatch.setattr(ocr_service_registry, 'checkout', checkout)
+
+
+def test_only_unsure_lines_are_read_again(monkeypatch):
+    paddle = FakePaddle()
+    use_engines(monkeypatch, FakeTesseract(), paddle)
+
+    result = CascadeOCRService().extract_text_with_confidence_sync(np.full((100, 120), 255, np.uint8))
+
+    assert result['text'] == 'Invoice INV-1\nTotal 100\nThank you'
+    assert result['reocr_lines'] == 1
+    assert [block['engine'] for block in result['blocks']] == ['tesseract', 'paddle', 'tesseract']
+    assert [block['confidence'] for block in result['blocks']] == [0.91, 0.98, 0.93]
+    assert abs(result['avg_confidence'] - (0.91 + 0.98 + 0.93) / 3) < 1e-9
+    assert len(paddle.crops) == 1 and paddle.crops[0].shape == (24, 82)
+    assert paddle.pages == 0
+
+
+def test_mostly_unsure_page_is_read_by_paddle(monkeypatch):
+    paddle = FakePaddle()
+    use_engines(monkeypatch, FakeTesseract(), paddle)
+    monkeypatch.setattr('app.services.cascade_ocr_service.config.ocr_cascade_min_confidence', 0.95)
+
+    text = CascadeOCRService().extract_text_from_image_sync(np.full((100, 120), 255, np.uint8))
+
+    assert text == 'paddle page'
+    assert paddle.pages == 1
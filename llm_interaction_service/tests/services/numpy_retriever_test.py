@@ -0,0 +1,26 @@
+from langchain_core.embeddings import Embeddings
+
+from app.services.numpy_retriever import NumpyRetriever
+
+
+class KeywordEmbeddings(Embeddings):
+    KEYWORDS = ['total', 'date', 'tax']
+
+    def embed_documents(self, texts):
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text):
+        return [float(text.count(keyword)) + 0.01 for keyword in self.KEYWORDS]
+
+
+def test_returns_most_similar_chunks_first():
+    chunks = ['date: 2024-01-01', 'tax 19%', 'total 100, total due', 'date and tax']
+    retriever = NumpyRetriever(chunks, KeywordEmbeddings())
+
+    assert retriever.similarity_search('what is the total?', k=1) == ['total 100, total due']
+    assert retriever.similarity_search('tax', k=2) == ['tax 19%', 'date and tax']
+    assert len(retriever.similarity_search('date', k=10)) == 4
+
+
+def test_empty_document():
+    assert NumpyRetriever([], KeywordEmbeddings()).similarity_search('total') == []
@@ -0,0 +1,36 @@
+import asyncio
+import json
+
+import httpx
+
+from app.services import ollama_service
+from app.services.ollama_service import OllamaService
+
+
+def make_client(requests):
+    def handler(request):
+        body = json.loads(request.content)
+        requests.append((str(request.url), body))
+        if body['stream']:
+            lines = [{'response': 'Hel', 'done': False}, {'response': 'lo', 'done': False}, {'response': '', 'done': True}]
+            return httpx.Response(200, content='\n'.join(json.dumps(line) for line in lines))
+        return httpx.Response(200, json={'response': 'Hello', 'done': True})
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def test_generate_completion_uses_rest_api(monkeypatch):
+    requests = []
+    client = make_client(requests)
+    monkeypatch.setattr(ollama_service, 'get_async_http_client', lambda name: client)
+    service = OllamaService(base_url='http://ollama:11434/')
+    prompt = {'system': 'be brief', 'user': 'greet'}
+
+    async def collect(stream):
+        return [chunk async for chunk in service.generate_completion('llama2', prompt, stream=stream)]
+
+    assert asyncio.run(collect(False)) == [{'response': 'Hello'}]
+    assert asyncio.run(collect(True)) == [{'response': 'Hel'}, {'response': 'lo'}]
+    assert requests[0] == (
+        'http://ollama:11434/api/generate',
+        {'model': 'llama2', 'prompt': 'be brief\ngreet', 'stream': False}
+    )
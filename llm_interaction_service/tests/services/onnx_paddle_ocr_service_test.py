@@ -0,0 +1,55 @@
+import onnxruntime as ort
+import pytest
+
+from app.services.onnx_paddle_ocr_service import OnnxPaddleOCRService, create_session_options, model_paths
+
+
+def test_model_paths_names_the_models_that_are_not_exported(tmp_path):
+    (tmp_path / 'det.onnx').write_bytes(b'')
+
+    with pytest.raises(FileNotFoundError) as error:
+        model_paths(str(tmp_path))
+
+    assert 'cls.onnx' in str(error.value) and 'rec.onnx' in str(error.value)
+    assert 'det.onnx' not in str(error.value)
+
+    (tmp_path / 'cls.onnx').write_bytes(b'')
+    (tmp_path / 'rec.onnx').write_bytes(b'')
+    assert model_paths(str(tmp_path))['text_recognizer'] == str(tmp_path / 'rec.onnx')
+
+
+def test_session_options_use_the_configured_threads(monkeypatch):
+    monkeypatch.setattr('app.services.onnx_paddle_ocr_service.config.onnx_intra_op_threads', 3)
+    monkeypatch.setattr('app.services.onnx_paddle_ocr_service.config.onnx_inter_op_threads', 1)
+
+    options = create_session_options()
+
+    assert options.intra_op_num_threads == 3
+    assert options.inter_op_num_threads == 1
+    assert options.graph_optimization_level == ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+
+def test_engine_opens_one_session_per_model_with_the_configured_options(monkeypatch, tmp_path):
+    for name in ('det.onnx', 'cls.onnx', 'rec.onnx'):
+        (tmp_path / name).write_bytes(b'')
+    monkeypatch.setattr('app.services.onnx_paddle_ocr_service.config.paddle_onnx_model_dir', str(tmp_path))
+    monkeypatch.setattr('app.services.onnx_paddle_ocr_service.config.onnx_intra_op_threads', 3)
+    sessions = []
+    engines = []
+
+    class FakePaddleOCR:
+        def __init__(self, **kwargs):
+            engines.append(kwargs)
+            # What PaddleOCR's create_predictor does for each model
+            for model in ('det', 'cls', 'rec'):
+                sessions.append((kwargs[f'{model}_model_dir'], kwargs['onnx_sess_options'], kwargs['onnx_providers']))
+
+    monkeypatch.setattr('app.services.onnx_paddle_ocr_service.PaddleOCR', FakePaddleOCR)
+    monkeypatch.setattr(ort, 'InferenceSession', lambda *args, **kwargs: sessions.append(args))
+
+    OnnxPaddleOCRService.__new__(OnnxPaddleOCRService)._create_engine('en', False)
+
+    assert [path for path, _, _ in sessions] == [str(tmp_path / name) for name in ('det.onnx', 'cls.onnx', 'rec.onnx')]
+    assert all(options.intra_op_num_threads == 3 for _, options, _ in sessions)
+    assert engines[0]['use_onnx'] is True
+    assert engines[0]['onnx_providers'] == ['CPUExecutionProvider']
@@ -0,0 +1,90 @@
+import numpy as np
+
+from app.services.paddle_ocr_service import PaddleOCRService
+
+
+class FakeArgs:
+    det_box_type = 'quad'
+
+
+class FakeEngine:
+    args = FakeArgs()
+    use_angle_cls = True
+    drop_score = 0.5
+
+    def __init__(self):
+        self.classified = 0
+
+    def text_detector(self, img):
+        box = np.array([[0, 0], [8, 0], [8, 4], [0, 4]], dtype=np.float32)
+        return np.array([box, box + [0, 6]], dtype=np.float32), 0
+
+    def text_classifier(self, crops):
+        self.classified += len(crops)
+        return crops, None, 0
+
+    def text_recognizer(self, crops):
+        return [(f'line {i}', 0.9) for i in range(len(crops))], 0
+
+
+def test_batched_ocr_classifies_only_pages_that_need_it():
+    engine = FakeEngine()
+    pages = [np.zeros((20, 20), np.uint8)] * 3
+
+    results = PaddleOCRService._ocr_pages_batched(engine, pages, cls=[False, True, False])
+
+    assert engine.classified == 2
+    assert [[line[1][0] for line in lines] for lines in results] == [
+        ['line 0', 'line 1'], ['line 2', 'line 3'], ['line 4', 'line 5']
+    ]
+
+
+class SparseEngine(FakeEngine):
+    """Finds text only on pages whose first pixel is set, and is unsure about every other line."""
+
+    def __init__(self):
+        super().__init__()
+        self.detected_shapes = []
+        self.recognized = []
+
+    def text_detector(self, img):
+        self.detected_shapes.append(img.shape)
+        if not img[0, 0].any():
+            return None, 0
+        return super().text_detector(img)
+
+    def text_recognizer(self, crops):
+        self.recognized.append(len(crops))
+        return [(f'line {i}', 0.9 if i % 2 == 0 else 0.1) for i in range(len(crops))], 0
+
+
+def test_batched_ocr_recognizes_all_pages_at_once_and_maps_lines_back():
+    engine = SparseEngine()
+    text_page = np.zeros((20, 20), np.uint8)
+    text_page[0, 0] = 255
+    pages = [text_page, np.zeros((20, 20), np.uint8), text_page]
+
+    results = PaddleOCRService._ocr_pages_batched(engine, pages, cls=True)
+
+    assert engine.detected_shapes == [(20, 20, 3)] * 3
+    assert engine.recognized == [4]
+    assert engine.classified == 4
+    assert results[1] is None
+    assert [line[1] for line in results[0]] == [('line 0', 0.9)]
+    assert [line[1] for line in results[2]] == [('line 2', 0.9)]
+    assert results[0][0][0] == [[0.0, 0.0], [8.0, 0.0], [8.0, 4.0], [0.0, 4.0]]
+
+
+def test_batched_confidence_averages_the_lines_of_each_image(monkeypatch):
+    service = PaddleOCRService.__new__(PaddleOCRService)
+    monkeypatch.setattr(service, '_preprocess_image', lambda img: img, raising=False)
+    monkeypatch.setattr(service, 'ocr_pages_batched', lambda images, cls: [
+        [[[], ('Total', 0.9)], [[], ('100', 0.7)]],
+        None,
+    ], raising=False)
+
+    results = service.extract_text_with_confidence_batched_sync([np.zeros((4, 4), np.uint8)] * 2, orient=False)
+
+    assert results[0]['text'] == 'Total\n100'
+    assert abs(results[0]['avg_confidence'] - 0.8) < 1e-9
+    assert results[1] == {'text': '', 'avg_confidence': 0}
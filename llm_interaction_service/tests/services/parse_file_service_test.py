@@ -0,0 +1,264 @@
+import asyncio
+
+import fitz
+
+from app.core.config import config
+from app.factories.llm_interaction_service_factory import LlmInteractionServiceFactory
+from app.services.parse_file_service import ParseFileService
+
+
+class FakeLlmService:
+    async def generate_completion(self, model, prompt, stream=False):
+        for token in ['{"number": ', '"INV-1"}']:
+            yield {'response': token}
+
+
+def make_pdf(text):
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    return doc.tobytes()
+
+
+def test_process_stream_emits_stages_tokens_and_result(monkeypatch):
+    monkeypatch.setattr(
+        LlmInteractionServiceFactory, 'create_llm_interaction_service',
+        staticmethod(lambda *args: FakeLlmService())
+    )
+    service = ParseFileService()
+
+    async def collect():
+        pdf_bytes = make_pdf('Invoice INV-1, total 100 EUR, due 2024-02-01, VAT 19 EUR')
+        return [event async for event in service.process_stream('model', pdf_bytes, 'parse')]
+
+    events = asyncio.run(collect())
+
+    assert events[0] == {'event': 'stage', 'data': {'stage': 'started'}}
+    assert {'event': 'stage', 'data': {
+        'stage': 'text_extracted',
+        'pages': 1,
+        'characters': 56,
+        'page_sources': [{'page': 1, 'source': 'text_layer'}],
+    }} in events
+    assert [event['data']['text'] for event in events if event['event'] == 'token'] == ['{"number": ', '"INV-1"}']
+    assert events[-1] == {'event': 'result', 'data': {'number': 'INV-1'}}
+
+
+def test_process_stream_reports_errors_as_events(monkeypatch):
+    monkeypatch.setattr(
+        LlmInteractionServiceFactory, 'create_llm_interaction_service',
+        staticmethod(lambda *args: FakeLlmService())
+    )
+    service = ParseFileService()
+
+    async def collect():
+        return [event async for event in service.process_stream('model', make_pdf('text'), 'summarize')]
+
+    events = asyncio.run(collect())
+
+    assert events[-1]['event'] == 'error'
+    assert events[-1]['data']['status_code'] == 400
+
+
+class PageEchoLlmService:
+    async def generate_completion(self, model, prompt, stream=False):
+        page = prompt['system'].split('Page ')[1].split()[0]
+        yield {'response': f'{{"number": "INV-1", "items": [{{"description": "item {page}"}}]}}'}
+
+
+def test_large_documents_are_parsed_with_map_reduce(monkeypatch):
+    monkeypatch.setattr(
+        LlmInteractionServiceFactory, 'create_llm_interaction_service',
+        staticmethod(lambda *args: PageEchoLlmService())
+    )
+    monkeypatch.setattr(config, 'llm_context_max_tokens', 30)
+    monkeypatch.setattr(config, 'map_reduce_chunk_tokens', 15)
+    doc = fitz.open()
+    for page in range(3):
+        doc.new_page().insert_text((72, 72), f'Page {page} of invoice INV-1 with more than fifty characters')
+    service = ParseFileService()
+
+    async def collect():
+        return [event async for event in service.process_stream('model', doc.tobytes(), 'parse')]
+
+    events = asyncio.run(collect())
+
+    assert [event['data']['chunks_done'] for event in events if event['data'].get('stage') == 'chunk_parsed'] == [1, 2, 3]
+    assert events[-1] == {'event': 'result', 'data': {
+        'number': 'INV-1',
+        'items': [{'description': 'item 0'}, {'description': 'item 1'}, {'description': 'item 2'}],
+    }}
+
+
+def scanned_page(doc, text=None):
+    scan = fitz.open()
+    scan_page = scan.new_page()
+    if text:
+        scan_page.insert_text((72, 300), text, fontsize=14)
+    pix = scan_page.get_pixmap(colorspace=fitz.csGRAY)
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=pix)
+
+
+def test_blank_scans_are_skipped_and_others_cropped(monkeypatch):
+    doc = fitz.open()
+    scanned_page(doc, 'Invoice INV-1 total 100 EUR')
+    scanned_page(doc)
+    service = ParseFileService()
+    service._ocr_technology = 'tesseract'
+    events = []
+    service._on_progress = lambda stage, data: events.append(dict(data, stage=stage))
+    rendered = []
+
+    async def fake_ocr(pdf, page_numbers=None, clips=None):
+        rendered.append((page_numbers, clips))
+        return ['Invoice INV-1 total 100 EUR']
+
+    monkeypatch.setattr(service, 'process_with_ocr', fake_ocr)
+
+    page_texts, pages = asyncio.run(service._extract_page_texts(doc.tobytes()))
+
+    assert page_texts == ['Invoice INV-1 total 100 EUR', '']
+    (page_numbers, clips), = rendered
+    assert page_numbers == [0]
+    x0, y0, x1, y1 = clips[0]
+    assert 50 < x0 < 72 and 260 < y0 < 300 and y1 < 320
+    assert {'stage': 'page_skipped', 'page': 2, 'reason': 'blank', 'ink_ratio': 0.0} in events
+    assert pages[0]['source'] == 'ocr' and pages[0]['crop'] == list(clips[0])
+    assert pages[1] == {'page': 2, 'source': 'skipped', 'reason': 'blank', 'ink_ratio': 0.0}
+
+
+def test_page_decisions_are_reported_from_the_extraction_cache(monkeypatch, tmp_path):
+    from app.core import extraction_cache as extraction_cache_module
+    from app.core.extraction_cache import ExtractionCache
+
+    monkeypatch.setattr(config, 'extraction_cache_enabled', True)
+    monkeypatch.setattr(extraction_cache_module, 'extraction_cache', ExtractionCache())
+    monkeypatch.setattr('app.services.parse_file_service.extraction_cache', extraction_cache_module.extraction_cache)
+    doc = fitz.open()
+    scanned_page(doc, 'Invoice INV-1 total 100 EUR')
+    scanned_page(doc)
+    pdf_bytes = doc.tobytes()
+
+    async def fake_ocr(pdf, page_numbers=None, clips=None):
+        return ['Invoice INV-1 total 100 EUR']
+
+    def extract():
+        service = ParseFileService()
+        monkeypatch.setattr(service, 'process_with_ocr', fake_ocr)
+        events = []
+        service._on_progress = lambda stage, data: events.append(dict(data, stage=stage))
+        asyncio.run(service.extract_text_from_pdf(pdf_bytes))
+        return next(event for event in events if event['stage'] == 'text_extracted')['page_sources'], events
+
+    extracted, _ = extract()
+    cached, events = extract()
+
+    assert [page['source'] for page in extracted] == ['ocr', 'skipped']
+    assert cached == extracted
+    assert any(event['stage'] == 'extraction_cache_hit' for event in events)
+
+
+def test_scan_with_only_a_page_number_is_not_skipped(monkeypatch):
+    doc = fitz.open()
+    scan = fitz.open()
+    scan.new_page().insert_text((300, 780), '3', fontsize=9)
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=scan[0].get_pixmap(colorspace=fitz.csGRAY))
+    service = ParseFileService()
+
+    async def fake_ocr(pdf, page_numbers=None, clips=None):
+        return ['3']
+
+    monkeypatch.setattr(service, 'process_with_ocr', fake_ocr)
+
+    page_texts, pages = asyncio.run(service._extract_page_texts(doc.tobytes()))
+
+    assert page_texts == ['3']
+    assert pages[0]['source'] == 'ocr'
+
+
+def outlined_text_page(doc):
+    # Glyphs drawn as vector shapes leave the page without a text layer or images
+    page = doc.new_page()
+    for x in range(72, 300, 20):
+        page.draw_rect(fitz.Rect(x, 72, x + 12, 90), color=(0, 0, 0), fill=(0, 0, 0))
+
+
+def test_pages_are_routed_to_their_text_layer_or_ocr():
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), 'Invoice INV-1, total 100 EUR, due 2024-02-01, VAT 19 EUR')
+    scanned_page(doc, 'Invoice INV-1')
+    doc.new_page().insert_text((72, 72), 'Page 3')
+    outlined_text_page(doc)
+
+    page_texts = ParseFileService()._classify_pages(doc)
+
+    assert page_texts == ['Invoice INV-1, total 100 EUR, due 2024-02-01, VAT 19 EUR', None, 'Page 3', None]
+
+
+def test_pages_without_text_layer_or_images_are_ocrd(monkeypatch):
+    monkeypatch.setattr(config, 'extraction_cache_enabled', False)
+    doc = fitz.open()
+    outlined_text_page(doc)
+    service = ParseFileService()
+    ocr_pages = []
+
+    async def fake_ocr(pdf, page_numbers=None, clips=None):
+        ocr_pages.extend(page_numbers)
+        return ['Invoice INV-1 drawn as outlines']
+
+    monkeypatch.setattr(service, 'process_with_ocr', fake_ocr)
+
+    text = asyncio.run(service.extract_text_from_pdf(doc.tobytes()))
+
+    assert text == 'Invoice INV-1 drawn as outlines'
+    assert ocr_pages == [0]
+
+
+def test_page_orientation_settings_are_part_of_the_extraction_settings(monkeypatch):
+    service = ParseFileService()
+    settings = service._extraction_settings()
+
+    monkeypatch.setattr(config, 'paddle_page_orientation', not config.paddle_page_orientation)
+    toggled = service._extraction_settings()
+    monkeypatch.setattr(config, 'paddle_orientation_min_confidence', 0.9)
+
+    assert toggled != settings
+    assert service._extraction_settings() != toggled
+
+
+def test_onnx_models_are_part_of_the_extraction_settings_of_the_onnx_engine(monkeypatch):
+    service = ParseFileService()
+    service._ocr_technology = 'paddle_onnx'
+    settings = service._extraction_settings()
+
+    monkeypatch.setattr(config, 'paddle_onnx_model_dir', 'other_models')
+
+    assert service._extraction_settings() != settings
+    service._ocr_technology = 'paddle'
+    assert 'onnx' not in service._extraction_settings()
+
+
+def test_embeddings_are_loaded_off_the_event_loop(monkeypatch):
+    import threading
+
+    from app.factories.embeddings_factory import EmbeddingsFactory
+    from app.factories.retriever_factory import RetrieverFactory
+
+    loaded_on = []
+
+    class FakeRetriever:
+        def similarity_search(self, prompt, k):
+            return ['Total 100 EUR']
+
+    def fake_embeddings():
+        loaded_on.append(threading.current_thread())
+        return object()
+
+    monkeypatch.setattr(EmbeddingsFactory, 'get_shared_embeddings', staticmethod(fake_embeddings))
+    monkeypatch.setattr(RetrieverFactory, 'create_retriever', staticmethod(lambda *args: FakeRetriever()))
+
+    text = asyncio.run(ParseFileService()._retrieve_relevant_text('Total 100 EUR', 'total?'))
+
+    assert text == 'Total 100 EUR'
+    assert len(loaded_on) == 1 and loaded_on[0].name.startswith('native')
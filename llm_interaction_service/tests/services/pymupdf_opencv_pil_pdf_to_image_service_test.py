@@ -0,0 +1,108 @@
+import asyncio
+import threading
+
+import fitz
+import numpy as np
+import pytest
+
+from app.core.config import config
+from app.services.pymupdf_opencv_pil_pdf_to_image_service import PyMuPDFOpenCvPilPDFToImageService
+
+
+def make_pdf(*texts):
+    doc = fitz.open()
+    for text in texts:
+        doc.new_page().insert_text((72, 72), text, fontsize=14)
+    return doc.tobytes()
+
+
+def test_concurrent_documents_are_rendered_on_one_thread(monkeypatch):
+    monkeypatch.setattr(config, 'pdf_render_dpi_mode', 'fixed')
+    monkeypatch.setattr(config, 'pdf_render_dpi', 72)
+    service = PyMuPDFOpenCvPilPDFToImageService()
+    render_threads = set()
+    render_page = service._render_page
+
+    def recording_render_page(*args):
+        render_threads.add(threading.current_thread().name)
+        return render_page(*args)
+
+    monkeypatch.setattr(service, '_render_page', recording_render_page)
+    first, second = make_pdf('first', 'page two'), make_pdf('second document')
+
+    async def render(pdf_bytes):
+        return [np.array(page) async for page in service.iter_pdf_pages(pdf_bytes, enhance=False)]
+
+    async def render_both():
+        return await asyncio.gather(render(first), render(second), service.convert_pdf_to_images(first, enhance=False))
+
+    streamed_first, streamed_second, converted_first = asyncio.run(render_both())
+
+    assert len(streamed_first) == 2 and len(streamed_second) == 1
+    assert all(np.array_equal(a, b) for a, b in zip(streamed_first, converted_first))
+    assert not np.array_equal(streamed_first[0], streamed_second[0])
+    assert len(render_threads) == 1 and render_threads.pop().startswith('pdf')
+
+
+def scanned_page(doc, text=None, scan_dpi=150):
+    scan = fitz.open()
+    scan_page = scan.new_page()
+    if text:
+        scan_page.insert_text((72, 300), text, fontsize=14)
+    pix = scan_page.get_pixmap(dpi=scan_dpi, colorspace=fitz.csGRAY)
+    page = doc.new_page()
+    page.insert_image(page.rect, pixmap=pix)
+
+
+def test_fixed_mode_renders_every_page_at_the_configured_dpi(monkeypatch):
+    monkeypatch.setattr(config, 'pdf_render_dpi_mode', 'fixed')
+    monkeypatch.setattr(config, 'pdf_render_dpi', 200)
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), 'tiny', fontsize=4)
+
+    assert PyMuPDFOpenCvPilPDFToImageService()._choose_render_dpi(doc[0]) == 200
+
+
+def test_adaptive_dpi_scales_glyphs_to_the_target_height(monkeypatch):
+    monkeypatch.setattr(config, 'pdf_render_dpi_mode', 'adaptive')
+    monkeypatch.setattr(config, 'pdf_target_glyph_height_px', 28)
+    monkeypatch.setattr(config, 'pdf_min_render_dpi', 150)
+    monkeypatch.setattr(config, 'pdf_max_render_dpi', 400)
+    service = PyMuPDFOpenCvPilPDFToImageService()
+    doc = fitz.open()
+    for fontsize in (10, 40, 3):
+        doc.new_page().insert_text((72, 72), 'Invoice total', fontsize=fontsize)
+
+    # 10pt text has 7pt glyphs, 28px / 7pt = 288 DPI, rounded up to a multiple of 25
+    assert service._estimate_glyph_height(doc[0]) == pytest.approx(7)
+    assert [service._choose_render_dpi(page) for page in doc] == [300, 150, 400]
+
+
+def test_adaptive_dpi_never_exceeds_bounds_that_are_not_multiples_of_25(monkeypatch):
+    monkeypatch.setattr(config, 'pdf_render_dpi_mode', 'adaptive')
+    monkeypatch.setattr(config, 'pdf_target_glyph_height_px', 28)
+    monkeypatch.setattr(config, 'pdf_min_render_dpi', 160)
+    monkeypatch.setattr(config, 'pdf_max_render_dpi', 310)
+    service = PyMuPDFOpenCvPilPDFToImageService()
+    doc = fitz.open()
+    for fontsize in (3, 10, 40):
+        doc.new_page().insert_text((72, 72), 'Invoice total', fontsize=fontsize)
+
+    assert [service._choose_render_dpi(page) for page in doc] == [310, 300, 160]
+
+
+def test_scans_are_measured_from_their_pixels(monkeypatch):
+    monkeypatch.setattr(config, 'pdf_render_dpi_mode', 'adaptive')
+    service = PyMuPDFOpenCvPilPDFToImageService()
+    doc = fitz.open()
+    scanned_page(doc, 'Invoice number 12345 total amount due 100 EUR')
+    scanned_page(doc, scan_dpi=190)
+    doc.new_page()
+    text_scan, blank_scan, empty_page = doc
+
+    assert 5 < service._estimate_glyph_height(text_scan) < 14
+    assert service._estimate_glyph_height(blank_scan) is None
+    assert service._estimate_scan_dpi(blank_scan) == pytest.approx(190, rel=0.01)
+    assert service._estimate_scan_dpi(empty_page) is None
+    # Rounded up to a multiple of 25
+    assert service._choose_render_dpi(blank_scan) == 200
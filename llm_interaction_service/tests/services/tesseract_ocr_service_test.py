@@ -0,0 +1,70 @@
+import asyncio
+import subprocess
+
+import cv2
+import numpy as np
+
+from app.services import tesseract_ocr_service
+from app.services.tesseract_ocr_service import TesseractOCRService
+
+
+def fake_tesseract(pages_per_run):
+    def run(args, capture_output, check):
+        with open(args[1]) as f:
+            paths = f.read().split()
+        pages_per_run.append(len(paths))
+        stdout = ''.join(f'text of {path.rsplit("-", 1)[1].split(".")[0]}\n\f' for path in paths)
+        return subprocess.CompletedProcess(args, 0, stdout.encode('utf-8'), b'')
+    return run
+
+
+def test_batch_runs_tesseract_once_and_splits_pages(monkeypatch):
+    service = TesseractOCRService()
+    pages_per_run = []
+    monkeypatch.setattr(tesseract_ocr_service.subprocess, 'run', fake_tesseract(pages_per_run))
+    encoded = cv2.imencode('.png', np.zeros((10, 10), np.uint8))[1].tobytes()
+    images = [np.zeros((10, 10), np.uint8), np.zeros((10, 10, 3), np.uint8), encoded]
+
+    texts = service.extract_texts_from_images_sync(images)
+
+    assert texts == ['text of 00000', 'text of 00001', 'text of 00002']
+    assert pages_per_run == [3]
+
+
+def test_batch_falls_back_to_single_pages_on_mismatch(monkeypatch):
+    service = TesseractOCRService()
+    monkeypatch.setattr(
+        tesseract_ocr_service.subprocess, 'run',
+        lambda args, **kwargs: subprocess.CompletedProcess(args, 0, b'only one page\n\f', b'')
+    )
+    monkeypatch.setattr(service, 'extract_text_from_image_sync', lambda image, lang: 'single')
+
+    texts = service.extract_texts_from_images_sync([np.zeros((10, 10), np.uint8)] * 2)
+
+    assert texts == ['single', 'single']
+
+
+def test_streamed_pages_are_read_in_batches_in_page_order(monkeypatch):
+    service = TesseractOCRService()
+    batches = []
+
+    def read_batch(images, lang):
+        batches.append(len(images))
+        return [f'page {int(image[0, 0])}' for image in images]
+
+    monkeypatch.setattr(service, 'extract_texts_from_images_sync', read_batch)
+    monkeypatch.setattr(service, 'extract_text_from_image_sync', lambda image, lang: read_batch([image], lang)[0])
+    monkeypatch.setattr(tesseract_ocr_service.config, 'tesseract_batch_pages', 2)
+    done = []
+
+    async def pages():
+        for i in range(5):
+            yield np.full((4, 4), i, np.uint8)
+
+    texts = asyncio.run(service.extract_page_texts_from_image_stream(
+        pages(), parallel=False, on_page_done=lambda i, text: done.append((i, text))
+    ))
+
+    assert texts == [f'page {i}' for i in range(5)]
+    assert done == list(enumerate(texts))
+    assert all(size <= 2 for size in batches) and sum(batches) == 5